@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+This module provides an asynchronous Bolt client, built on
+:mod:`asyncio`, for use within applications that are already driven
+by an event loop. Rather than tying up a thread for each query in
+flight, any number of queries can be carried out concurrently from a
+single thread, each waiting on the network without blocking the
+others::
+
+    >>> import asyncio
+    >>> from py2neo.aio import AsyncGraph
+    >>> async def main():
+    ...     graph = AsyncGraph("bolt://localhost:7687", auth=("neo4j", "password"))
+    ...     cursor = await graph.run("UNWIND range(1, 3) AS n RETURN n")
+    ...     async for record in cursor:
+    ...         print(record["n"])
+    ...     await graph.close()
+    >>> asyncio.get_event_loop().run_until_complete(main())
+    1
+    2
+    3
+
+The asynchronous client supports Bolt 4.x only (Neo4j 4.0 and above),
+and connects directly to a single server. Routing is not supported.
+
+This module requires Python 3.5 or above, and raises
+:exc:`ImportError` if imported under an earlier version. As py2neo
+itself still supports Python 2.7, the asynchronous client is kept in
+a separate submodule that is only loaded once the version has been
+checked.
+
+*New in version 2021.2.*
+"""
+
+
+from sys import version_info
+
+
+if version_info < (3, 5):
+    raise ImportError("The py2neo.aio module requires Python 3.5 or above")
+
+
+from py2neo.aio.core import *
+
+
+__all__ = core.__all__
@@ -0,0 +1,1214 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Implementation of the asynchronous client. This is kept separate from
+the package ``__init__``, as it uses syntax which cannot be parsed by
+Python versions earlier than 3.5.
+"""
+
+
+__all__ = [
+    "AsyncWire",
+    "AsyncBolt",
+    "AsyncConnectionPool",
+    "AsyncGraph",
+    "AsyncTransaction",
+    "AsyncCursor",
+]
+
+
+import asyncio
+from collections import deque
+from functools import partial
+from logging import getLogger, DEBUG
+
+from monotonic import monotonic
+from six import raise_from
+
+from py2neo import ConnectionProfile
+from py2neo.addressing import Address
+from py2neo.client import Bookmark, bolt_user_agent
+from py2neo.client.bolt import (BOLT_4X_PROPOSALS, Bolt4x3, Bolt4xProtocol,
+                                BoltMessageReader, BoltMessageWriter, BoltResponse,
+                                BoltResult, BoltTransactionRef, PackStreamHydrant,
+                                agreed_version, write_handshake)
+from py2neo.cypher import Record
+from py2neo.errors import (Neo4jError,
+                           ConnectionUnavailable,
+                           ConnectionBroken,
+                           ConnectionLimit,
+                           ProtocolError)
+from py2neo.wiring import WireError, BrokenWireError
+
+
+log = getLogger(__name__)
+
+
+def _ssl_context(verify=True, hostname=None):
+    from ssl import SSLContext, PROTOCOL_TLS
+    context = SSLContext(PROTOCOL_TLS)
+    if verify:
+        from ssl import CERT_REQUIRED
+        context.verify_mode = CERT_REQUIRED
+        context.check_hostname = bool(hostname)
+    else:
+        from ssl import CERT_NONE
+        context.verify_mode = CERT_NONE
+    context.load_default_certs()
+    return context
+
+
+class AsyncWire(object):
+    """ Buffered asyncio stream connection, the asynchronous
+    counterpart of :class:`.Wire`.
+
+    Incoming data is received into a preallocated buffer, which is
+    only replaced once full, in the same way as for :class:`.Wire`.
+    Views returned by :meth:`.peek` and :meth:`.read` therefore remain
+    valid after the buffer is refilled. Outgoing data is collected by
+    :meth:`.write` and sent in a single operation by :meth:`.send`.
+    """
+
+    #: Initial size of the input buffer; this is also the maximum
+    #: number of bytes received in a single read.
+    input_buffer_size = 65536
+
+    @classmethod
+    async def open(cls, address, timeout=None, secure=False, verify=True, hostname=None):
+        """ Open a connection to a given network :class:`.Address`.
+
+        :param address:
+        :param timeout:
+        :param secure: if true, the connection will be secured by TLS
+        :param verify: if true, the server certificate will be verified
+        :param hostname: the host name to verify against
+        :returns: :class:`.AsyncWire` object
+        :raises WireError: if connection fails to open
+        """
+        address = Address(address)
+        if secure:
+            ssl = _ssl_context(verify, hostname)
+            server_hostname = hostname or address.host
+        else:
+            ssl = None
+            server_hostname = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(address.host, address.port_number,
+                                        ssl=ssl, server_hostname=server_hostname),
+                timeout)
+        except (IOError, OSError, asyncio.TimeoutError) as error:
+            raise_from(WireError("Cannot connect to %r" % (address,)), error)
+        else:
+            return cls(reader, writer)
+
+    def __init__(self, reader, writer):
+        self.__reader = reader
+        self.__writer = writer
+        self.__input = bytearray(self.input_buffer_size)
+        self.__input_view = memoryview(self.__input)
+        self.__input_start = 0
+        self.__input_end = 0
+        self.__output = bytearray()
+        self.__closed = False
+        self.__broken = False
+
+    def __mark_broken(self, message):
+        self.__broken = True
+        raise BrokenWireError(message)
+
+    def read(self, n):
+        """ Read bytes which have already been buffered. This should
+        be preceded by a call to :meth:`.fill`.
+
+        :returns: :class:`memoryview` over the bytes read
+        """
+        start = self.__input_start
+        end = start + n
+        if end > self.__input_end:
+            raise ValueError("Only %d bytes are buffered" % (self.__input_end - start))
+        self.__input_start = end
+        return self.__input_view[start:end]
+
+    async def fill(self, n):
+        """ Receive data from the network until at least `n` bytes
+        of unread data are buffered.
+        """
+        while self.__input_end - self.__input_start < n:
+            if self.__input_start + n > len(self.__input):
+                self.__renew_input(n)
+            try:
+                data = await self.__reader.read(len(self.__input) - self.__input_end)
+            except (IOError, OSError):
+                self.__mark_broken("Wire broken")
+            else:
+                if data:
+                    end = self.__input_end + len(data)
+                    self.__input_view[self.__input_end:end] = data
+                    self.__input_end = end
+                else:
+                    self.__mark_broken("Network read incomplete "
+                                       "(received %d of %d bytes)" %
+                                       (self.__input_end - self.__input_start, n))
+
+    def peek(self):
+        """ Return any buffered unread data.
+
+        :returns: :class:`memoryview` over the unread bytes
+        """
+        return self.__input_view[self.__input_start:self.__input_end]
+
+    def __renew_input(self, n):
+        # As for Wire, allocate a new input buffer, large enough to
+        # hold at least n bytes, and carry over any unread data,
+        # leaving the old buffer untouched for views still in use.
+        unread = self.__input_view[self.__input_start:self.__input_end]
+        if n > self.input_buffer_size:
+            size = 2 * n
+        else:
+            size = self.input_buffer_size
+        self.__input = bytearray(size)
+        self.__input_view = memoryview(self.__input)
+        self.__input_end = len(unread)
+        self.__input_view[:self.__input_end] = unread
+        self.__input_start = 0
+
+    def write(self, b):
+        """ Write bytes to the output buffer.
+        """
+        self.__output.extend(b)
+
+    async def send(self, final=False):
+        """ Send the contents of the output buffer to the network.
+
+        :param final: if true, the write end of the connection is
+            closed once the data has been sent
+        :returns: number of bytes sent
+        """
+        data = bytes(self.__output)
+        self.__output[:] = b""
+        try:
+            self.__writer.write(data)
+            await self.__writer.drain()
+            if final:
+                self.__writer.write_eof()
+        except (IOError, OSError):
+            self.__mark_broken("Wire broken")
+        return len(data)
+
+    def close(self):
+        """ Close the connection.
+        """
+        try:
+            self.__writer.close()
+        except (IOError, OSError):
+            self.__broken = True
+        else:
+            self.__closed = True
+
+    @property
+    def closed(self):
+        """ Flag indicating whether this connection has been closed locally.
+        """
+        return self.__closed
+
+    @property
+    def broken(self):
+        """ Flag indicating whether this connection has been closed remotely.
+        """
+        return self.__broken
+
+    @property
+    def local_address(self):
+        """ The local :class:`.Address` to which this connection is bound.
+        """
+        return Address(self.__writer.get_extra_info("sockname"))
+
+    @property
+    def remote_address(self):
+        """ The remote :class:`.Address` to which this connection is bound.
+        """
+        return Address(self.__writer.get_extra_info("peername"))
+
+
+class AsyncBoltMessageReader(BoltMessageReader):
+    """ Asynchronous reader for chunked Bolt messages.
+    """
+
+    async def read_message(self):
+        if not self._messages:
+            await self._read_messages()
+        return self._messages.popleft()
+
+    async def _read_messages(self):
+        while True:
+            messages, used, required = self._split_messages(self.wire.peek())
+            try:
+                if messages:
+                    self.wire.read(used)
+                    break
+                else:
+                    await self.wire.fill(required)
+            except WireError as error:
+                raise_from(ConnectionBroken("Failed to read message"), error)
+        self._queue_messages(messages)
+
+
+class AsyncBolt(Bolt4xProtocol):
+    """ Asynchronous Bolt 4.x connection, the counterpart of the
+    :class:`.Bolt4x0` family of connection classes, with which it
+    shares request building and response bookkeeping. Only the
+    network activity is carried out here.
+
+    Requests are queued without any network activity, and only sent
+    when a coroutine waits for a response. As with the synchronous
+    client, BEGIN is sent along with the first query in a transaction
+    rather than on its own.
+
+    Transactions and results are represented by the same
+    :class:`.BoltTransactionRef` and :class:`.BoltResult` objects as
+    used over synchronous connections.
+    """
+
+    messages = Bolt4x3.messages
+
+    @classmethod
+    async def open(cls, profile=None, user_agent=None, timeout=None):
+        """ Open and authenticate a Bolt connection.
+
+        :param profile: :class:`.ConnectionProfile` detailing how and
+            where to connect
+        :param user_agent:
+        :param timeout: maximum time, in seconds, to wait for the
+            network connection to be established
+        :returns: :class:`.AsyncBolt` connection object
+        :raises: :class:`.ConnectionUnavailable` if a connection cannot
+            be opened, or a protocol version cannot be agreed
+        """
+        if profile is None:
+            profile = ConnectionProfile(scheme="bolt")
+        try:
+            log.debug("[#%04X] C: (Dialing <%s>)", 0, profile.address)
+            wire = await AsyncWire.open(profile.address, timeout=timeout,
+                                        secure=profile.secure, verify=profile.verify,
+                                        hostname=profile.host)
+        except WireError as error:
+            raise_from(ConnectionUnavailable("Cannot open connection to %r" % profile), error)
+        try:
+            protocol_version = await cls._handshake(wire)
+            bolt = cls(wire, profile, protocol_version)
+            await bolt._hello(user_agent or bolt_user_agent())
+        except (TypeError, WireError, ConnectionBroken) as error:
+            wire.close()
+            raise_from(ConnectionUnavailable("Cannot open connection to %r" % profile), error)
+        except BaseException:
+            wire.close()
+            raise
+        else:
+            return bolt
+
+    @classmethod
+    async def _handshake(cls, wire):
+        write_handshake(wire, BOLT_4X_PROPOSALS)
+        await wire.send()
+        await wire.fill(4)
+        protocol_version = agreed_version(wire, wire.read(4))
+        if protocol_version[0] != 4:
+            raise TypeError("Unsupported protocol version %d.%d" % protocol_version)
+        return protocol_version
+
+    def __init__(self, wire, profile, protocol_version):
+        self.profile = profile
+        self.protocol_version = protocol_version
+        self.server_agent = None
+        self.connection_id = None
+        self._wire = wire
+        self._reader = AsyncBoltMessageReader(wire)
+        self._writer = BoltMessageWriter(wire, protocol_version)
+        self._responses = deque()
+        self._transaction = None
+        # Set on receipt of a FAILURE, after which the server
+        # will ignore all requests until a RESET is sent.
+        self._failed = False
+        self._polite = False
+        self.__local_port = wire.local_address.port_number
+        self.__time_opened = monotonic()
+
+    def __repr__(self):
+        return "<%s [#%04X]>" % (self.__class__.__name__, self.local_port)
+
+    @property
+    def closed(self):
+        return self._wire.closed
+
+    @property
+    def broken(self):
+        return self._wire.broken
+
+    @property
+    def local_port(self):
+        return self.__local_port
+
+    @property
+    def age(self):
+        """ The age of this connection in seconds.
+        """
+        return monotonic() - self.__time_opened
+
+    @property
+    def transaction(self):
+        return self._transaction
+
+    @property
+    def clean(self):
+        """ True if this connection is in a clean state, with no
+        transaction open, no responses outstanding and no failure
+        since the last reset.
+        """
+        return not (self._failed or self._transaction or self._responses)
+
+    def supports_multi(self):
+        return True
+
+    def _assert_open(self):
+        if self.closed:
+            raise ConnectionUnavailable("Connection has been closed")
+        if self.broken:
+            raise ConnectionUnavailable("Connection is broken")
+
+    def _assert_no_transaction(self):
+        if self._transaction:
+            raise TypeError("Cannot open multiple simultaneous transactions "
+                            "on a Bolt connection")
+
+    def _assert_transaction_open(self, tx):
+        if tx is not self._transaction:
+            raise ValueError("Transaction %r is not open on this connection" % tx)
+        if tx.broken:
+            raise ValueError("Transaction is broken")
+
+    async def _hello(self, user_agent):
+        self._assert_open()
+        extra = {"user_agent": user_agent,
+                 "scheme": "basic",
+                 "principal": self.profile.user,
+                 "credentials": self.profile.password}
+        response = self.append_message(0x01, extra, vital=True)
+        await self._sync(response)
+        response.audit()
+        self.server_agent = response.metadata.get("server")
+        self.connection_id = response.metadata.get("connection_id")
+        self._polite = True
+
+    async def close(self):
+        """ Close the connection, saying goodbye to the server first
+        if it is still listening.
+        """
+        if self.closed or self.broken:
+            return
+        try:
+            if self._polite:
+                self.append_message(0x02, response=False)
+                await self.send(final=True)
+        except ConnectionBroken:
+            pass
+        self._wire.close()
+        log.debug("[#%04X] C: (Hanging up)", self.local_port)
+
+    async def reset(self, force=False):
+        """ Reset the connection, if not already in a clean state (or
+        regardless, if forced), discarding any transaction and failure
+        state.
+
+        :returns: true if a reset was carried out
+        """
+        self._assert_open()
+        if force or not self.clean:
+            response = self.append_message(0x0F, vital=True)
+            await self._sync(response)
+            self._transaction = None
+            self._failed = False
+            response.audit()
+            return True
+        else:
+            return False
+
+    def auto_run(self, cypher, parameters=None, graph_name=None, readonly=False):
+        """ Queue a query to be run in an auto-commit transaction.
+        Nothing is sent until the first :meth:`.pull`.
+        """
+        self._assert_open()
+        self._assert_no_transaction()
+        self._transaction = BoltTransactionRef(self, graph_name, readonly)
+        return self._run(cypher, parameters, self._transaction.extra, final=True)
+
+    def begin(self, graph_name, readonly=False):
+        """ Queue the beginning of an explicit transaction. The BEGIN
+        is sent along with the first query in the transaction.
+        """
+        self._assert_open()
+        self._assert_no_transaction()
+        self._transaction = BoltTransactionRef(self, graph_name, readonly)
+        self._transaction.begin_response = self.append_message(0x11, self._transaction.extra)
+        return self._transaction
+
+    def run(self, tx, cypher, parameters=None):
+        """ Queue a query to be run within an explicit transaction.
+        Nothing is sent until the first :meth:`.pull`.
+        """
+        self._assert_open()
+        self._assert_transaction_open(tx)
+        return self._run(cypher, parameters)
+
+    def _run(self, cypher, parameters, extra=None, final=False):
+        response = self.append_message(0x10, cypher, parameters or {}, extra or {})
+        result = BoltResult(self._transaction, self, response)
+        self._transaction.append(result, final=final)
+        return result
+
+    async def pull(self, result, n=-1):
+        """ Request records for a result, and wait for them to arrive.
+
+        :param result: the result to pull records for
+        :param n: the number of records to pull, or -1 for all
+        """
+        response = self._append_pull(result, n)
+        try:
+            await self._sync(response)
+        except ConnectionBroken:
+            result.transaction.mark_broken()
+            raise
+        else:
+            await self._end_pull(result, response)
+            return response
+
+    async def fetch(self, result):
+        """ Take the next record from a result, waiting for more to
+        be pulled if none are yet buffered.
+
+        :returns: the next record, or :const:`None` if the result
+            has been exhausted
+        """
+        record = result.take()
+        if result.fetch_size > 0 and not result.complete():
+            if self._pull_ahead(result):
+                await self.send()
+            elif result.last().done():
+                await self._end_pull(result, result.last())
+                return record
+            if record is None:
+                await self._wait_for_pull(result)
+                record = result.take()
+        return record
+
+    async def discard(self, result):
+        """ Discard any records remaining for a result.
+        """
+        self._assert_open()
+        await self._wait_for_pull(result)
+        if result.complete():
+            return None
+        response = self._append_discard(result, self._assert_result_consumable(result))
+        try:
+            await self._sync(response)
+        except ConnectionBroken:
+            result.transaction.mark_broken()
+            raise
+        else:
+            await self._audit(self._transaction)
+            return response
+
+    async def commit(self, tx):
+        """ Commit a transaction, discarding any results that have not
+        been consumed.
+
+        :returns: :class:`.Bookmark` for the transaction
+        """
+        return await self._end_transaction(tx, 0x12, "commit")
+
+    async def rollback(self, tx):
+        """ Roll back a transaction.
+
+        :returns: :class:`.Bookmark` for the transaction
+        """
+        return await self._end_transaction(tx, 0x13, "rollback")
+
+    async def _end_transaction(self, tx, tag, verb):
+        self._assert_open()
+        self._assert_transaction_open(tx)
+        await self._discard_open_results(tx)
+        tx.set_complete()
+        response = self.append_message(tag)
+        try:
+            await self._sync(response)
+        except ConnectionBroken as error:
+            tx.mark_broken()
+            raise_from(ConnectionBroken("Transaction broken by disconnection "
+                                        "during %s" % verb), error)
+        else:
+            try:
+                await self._audit(tx)
+            except Neo4jError as error:
+                tx.mark_broken()
+                raise_from(ConnectionBroken("Failed to %s transaction" % verb), error)
+            else:
+                return Bookmark(response.metadata.get("bookmark"))
+
+    async def _end_pull(self, result, response):
+        self._settle_pull(result, response)
+        await self._audit(self._transaction)
+
+    async def _wait_for_pull(self, result):
+        response = self._pending_pull(result)
+        if response is None:
+            return
+        if not response.done():
+            try:
+                await self._wait(response)
+            except ConnectionBroken:
+                result.transaction.mark_broken()
+                raise
+        await self._end_pull(result, response)
+
+    async def _discard_open_results(self, tx):
+        for result in tx.items():
+            if not result.complete():
+                await self._wait_for_pull(result)
+        self._append_discards(tx)
+
+    def append_message(self, tag, *fields, **kwargs):
+        """ Write a request to the output queue, returning a
+        :class:`.BoltResponse` to collect the reply.
+
+        :param tag: unique message type identifier
+        :param fields: message payload
+        :param kwargs:
+            - vital: if true, the connection is closed on failure
+            - response: if false, no reply is expected
+            - capacity: accepted for compatibility with the
+              synchronous client, but ignored
+        """
+        self._writer.write_message(tag, fields)
+        if log.isEnabledFor(DEBUG):
+            if tag == 0x01:
+                fields = [dict(fields[0], credentials="*******")]
+            log.debug("[#%04X] C: %s %s", self.local_port, self.messages[tag],
+                      " ".join(map(repr, fields)))
+        if kwargs.get("response", True):
+            response = BoltResponse(vital=kwargs.get("vital", False))
+            self._responses.append(response)
+            return response
+        else:
+            return None
+
+    async def send(self, final=False):
+        try:
+            sent = await self._wire.send(final=final)
+        except WireError as error:
+            raise_from(ConnectionBroken("Failed to send Bolt messages"), error)
+        else:
+            if sent:
+                log.debug("[#%04X] C: (Sent %r bytes)", self.local_port, sent)
+
+    async def _fetch(self):
+        """ Fetch and process the next incoming message. As with the
+        synchronous client, a FAILURE is recorded against its
+        response rather than raised.
+        """
+        tag, fields = await self._reader.read_message()
+        if tag == 0x71:
+            log.debug("[#%04X] S: RECORD", self.local_port)
+            self._responses[0].add_records(fields)
+            return
+        log.debug("[#%04X] S: %s %s", self.local_port, self.messages.get(tag, "?"),
+                  " ".join(map(repr, fields)))
+        if tag == 0x70:
+            self._responses.popleft().set_success(**fields[0])
+        elif tag == 0x7F:
+            self._failed = True
+            response = self._responses.popleft()
+            response.set_failure(**fields[0])
+            if response.vital:
+                self._wire.close()
+        elif tag == 0x7E and not self._responses[0].vital:
+            self._responses.popleft().set_ignored()
+        else:
+            self._wire.close()
+            raise ProtocolError("Unexpected protocol message #%02X" % tag)
+
+    async def _wait(self, response):
+        while not response.done():
+            await self._fetch()
+
+    async def _sync(self, *responses):
+        await self.send()
+        for response in responses:
+            await self._wait(response)
+
+    async def _audit(self, task):
+        """ Check a task for failure, resetting the connection and
+        raising an exception if one is found. Unlike the synchronous
+        client, the connection is not released here; that is left to
+        whichever object acquired it.
+        """
+        if task is None:
+            return
+        try:
+            task.audit()
+        except Neo4jError:
+            await self.reset(force=True)
+            raise
+
+
+class AsyncConnectionPool(object):
+    """ A pool of asynchronous connections targeting a single Neo4j
+    server, the asynchronous counterpart of :class:`.ConnectionPool`.
+
+    When the pool is full, callers of :meth:`.acquire` wait in a
+    queue, with each released connection handed directly to the
+    caller that has been waiting longest.
+    """
+
+    default_max_size = 100
+
+    default_max_age = 3600
+
+    default_acquire_timeout = 60
+
+    def __init__(self, profile=None, user_agent=None, max_size=None, max_age=None,
+                 acquire_timeout=None):
+        self._profile = profile or ConnectionProfile()
+        self._user_agent = user_agent
+        if max_size is None:
+            self._max_size = self.default_max_size
+        else:
+            self._max_size = max_size
+        self._max_age = max_age or self.default_max_age
+        if acquire_timeout is None:
+            self._acquire_timeout = self.default_acquire_timeout
+        else:
+            self._acquire_timeout = acquire_timeout
+        self._in_use = set()
+        self._free_list = deque()
+        self._waiters = deque()
+        self._opening = 0
+        self._closed = False
+
+    def __repr__(self):
+        return "<%s profile=%r [%d/%d]>" % (self.__class__.__name__, self._profile,
+                                            self.in_use, self.size)
+
+    @property
+    def profile(self):
+        return self._profile
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def in_use(self):
+        """ The number of connections in this pool that are currently
+        in use.
+        """
+        return len(self._in_use)
+
+    @property
+    def size(self):
+        """ The total number of connections (both in-use and free, as
+        well as those being opened) currently owned by this pool.
+        """
+        return len(self._in_use) + len(self._free_list) + self._opening
+
+    @property
+    def waiting(self):
+        """ The number of callers currently waiting to acquire a
+        connection from this pool.
+        """
+        return len(self._waiters)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def _usable(self, cx):
+        return not (cx.closed or cx.broken) and cx.age <= self._max_age
+
+    async def acquire(self, timeout=None):
+        """ Acquire a connection from the pool, opening a new one if
+        none are free and the pool is not full.
+
+        :param timeout: the maximum time, in seconds, to wait for a
+            connection to become available if the pool is full,
+            overriding the pool-wide acquisition timeout
+        :returns: :class:`.AsyncBolt` connection
+        :raises: :class:`.ConnectionLimit` if no connection becomes
+            available in time
+        :raises: :class:`.ConnectionUnavailable` if a new connection
+            cannot be opened
+        """
+        if timeout is None:
+            timeout = self._acquire_timeout
+        deadline = monotonic() + timeout
+        while True:
+            if self._closed:
+                raise ConnectionUnavailable("Connection pool is closed")
+            while self._free_list:
+                cx = self._free_list.popleft()
+                if self._usable(cx):
+                    self._in_use.add(cx)
+                    return cx
+                await cx.close()
+            if self.size < self._max_size:
+                return await self._open()
+            if self._max_size == 0:
+                raise ConnectionLimit("Connection pool has no capacity")
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise ConnectionLimit("No connection available within %rs" % timeout)
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                cx = await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                raise ConnectionLimit("No connection available within %rs" % timeout)
+            finally:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if cx is not None:
+                return cx
+            # Otherwise, a connection was discarded, leaving room to
+            # open a new one, so go around again.
+
+    async def _open(self):
+        self._opening += 1
+        try:
+            cx = await AsyncBolt.open(self._profile, user_agent=self._user_agent)
+        except BaseException:
+            self._opening -= 1
+            self._wake(None)
+            raise
+        else:
+            self._opening -= 1
+            self._in_use.add(cx)
+            return cx
+
+    def _wake(self, cx):
+        """ Hand a connection (or :const:`None`, meaning that there is
+        now room to open a connection) to the longest waiter. Returns
+        true if a waiter accepted it.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(cx)
+                return True
+        return False
+
+    async def release(self, cx):
+        """ Release a connection back into the pool, resetting it
+        first if it is not in a clean state. Connections that cannot
+        be reused are closed and discarded. Releasing a connection
+        that is not in use by this pool has no effect.
+
+        :param cx: the connection to release
+        """
+        if cx not in self._in_use:
+            return
+        if self._usable(cx) and not self._closed:
+            try:
+                await cx.reset()
+            except (ConnectionUnavailable, ConnectionBroken, Neo4jError):
+                pass
+        if self._usable(cx) and not self._closed:
+            if not self._wake(cx):
+                self._in_use.remove(cx)
+                self._free_list.append(cx)
+        else:
+            self._in_use.remove(cx)
+            await cx.close()
+            self._wake(None)
+
+    async def close(self):
+        """ Close all connections owned by this pool, and prevent any
+        further connections from being acquired.
+        """
+        self._closed = True
+        while self._waiters:
+            self._waiters.popleft().cancel()
+        connections = list(self._free_list) + list(self._in_use)
+        self._free_list.clear()
+        self._in_use.clear()
+        for cx in connections:
+            await cx.close()
+
+
+class AsyncGraph(object):
+    """ Asynchronous counterpart of :class:`.Graph`, backed by a pool
+    of :class:`.AsyncBolt` connections to a single Neo4j server.
+
+    :param profile: a :class:`.ConnectionProfile` or URI string
+        describing the server to connect to
+    :param name: name of the database to use, or :const:`None` for
+        the default database
+    :param max_size: maximum number of connections in the pool
+    :param max_age: maximum age, in seconds, of pooled connections
+    :param acquire_timeout: maximum time, in seconds, to wait for a
+        connection when the pool is full
+    :param fetch_size: number of records to pull per batch when
+        streaming results, or -1 to pull all records at once
+    :param settings: additional connection settings, as accepted by
+        :class:`.ConnectionProfile`
+
+    Only the Bolt protocol is supported, and connections are always
+    made directly to the server in the profile; routing is not
+    supported.
+    """
+
+    #: Asynchronous graphs are not attached to a :class:`.GraphService`.
+    service = None
+
+    def __init__(self, profile=None, name=None, max_size=None, max_age=None,
+                 acquire_timeout=None, fetch_size=-1, **settings):
+        profile = ConnectionProfile(profile, **settings)
+        if profile.protocol != "bolt":
+            raise ValueError("Asynchronous connections require the Bolt protocol")
+        self.name = name
+        self.fetch_size = fetch_size
+        self._pool = AsyncConnectionPool(profile, max_size=max_size, max_age=max_age,
+                                         acquire_timeout=acquire_timeout)
+
+    def __repr__(self):
+        return "%s(%r, name=%r)" % (self.__class__.__name__, self._pool.profile.uri, self.name)
+
+    @property
+    def pool(self):
+        """ The :class:`.AsyncConnectionPool` backing this graph.
+        """
+        return self._pool
+
+    async def run(self, cypher, parameters=None, readonly=False, **kwparameters):
+        """ Run a single query in an auto-commit transaction.
+
+        :param cypher: Cypher query
+        :param parameters: dictionary of parameters
+        :param readonly: if true, the query is marked as read-only
+        :param kwparameters: extra parameters supplied by keyword
+        :returns: :class:`.AsyncCursor` object
+        """
+        parameters = dict(parameters or {}, **kwparameters)
+        cx = await self._pool.acquire()
+        try:
+            result = cx.auto_run(cypher, parameters, graph_name=self.name, readonly=readonly)
+            await cx.pull(result, self.fetch_size)
+        except BaseException:
+            await self._pool.release(cx)
+            raise
+        release = partial(self._pool.release, cx)
+        cursor = AsyncCursor(result, cx, PackStreamHydrant(self),
+                             on_complete=release, on_error=release)
+        await cursor._settle()
+        return cursor
+
+    async def evaluate(self, cypher, parameters=None, **kwparameters):
+        """ Run a query in an auto-commit transaction and return the
+        first value from the first record returned.
+        """
+        cursor = await self.run(cypher, parameters, **kwparameters)
+        try:
+            return await cursor.evaluate()
+        finally:
+            await cursor.close()
+
+    def begin(self, readonly=False):
+        """ Begin a new :class:`.AsyncTransaction`. No connection is
+        acquired until the first query is run. The transaction can be
+        used as an asynchronous context manager, which commits on
+        success and rolls back on error::
+
+            async with graph.begin() as tx:
+                await tx.run("CREATE (a:Person {name: $x})", x="Alice")
+
+        :param readonly: if true, the transaction is marked as read-only
+        :returns: :class:`.AsyncTransaction` object
+        """
+        return AsyncTransaction(self, readonly)
+
+    def pull(self, subgraph):
+        # Entities with stale labels or properties will call this
+        # method, which cannot be carried out without blocking.
+        raise TypeError("Entities cannot be loaded on demand from an %s; "
+                        "return them in full from the query "
+                        "instead" % self.__class__.__name__)
+
+    async def close(self):
+        """ Close all connections to the server.
+        """
+        await self._pool.close()
+
+
+class AsyncTransaction(object):
+    """ Explicit transaction, the asynchronous counterpart of
+    :class:`.Transaction`.
+    """
+
+    def __init__(self, graph, readonly=False):
+        self.graph = graph
+        self.readonly = readonly
+        self._cx = None
+        self._ref = None
+        self._closed = False
+        self._bookmark = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._closed:
+            return
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    @property
+    def closed(self):
+        """ Flag indicating whether this transaction has been closed.
+        """
+        return self._closed
+
+    @property
+    def bookmark(self):
+        """ The :class:`.Bookmark` returned when this transaction was
+        committed, if any.
+        """
+        return self._bookmark
+
+    async def run(self, cypher, parameters=None, **kwparameters):
+        """ Run a query within this transaction. The first query run
+        is sent along with the BEGIN for the transaction.
+
+        :param cypher: Cypher query
+        :param parameters: dictionary of parameters
+        :param kwparameters: extra parameters supplied by keyword
+        :returns: :class:`.AsyncCursor` object
+        """
+        if self._closed:
+            raise TypeError("Transaction is closed")
+        parameters = dict(parameters or {}, **kwparameters)
+        if self._cx is None:
+            self._cx = await self.graph.pool.acquire()
+            self._ref = self._cx.begin(self.graph.name, readonly=self.readonly)
+        try:
+            result = self._cx.run(self._ref, cypher, parameters)
+            await self._cx.pull(result, self.graph.fetch_size)
+        except BaseException:
+            await self._abandon()
+            raise
+        return AsyncCursor(result, self._cx, PackStreamHydrant(self.graph),
+                           on_error=self._abandon)
+
+    async def evaluate(self, cypher, parameters=None, **kwparameters):
+        """ Run a query within this transaction and return the first
+        value from the first record returned.
+        """
+        cursor = await self.run(cypher, parameters, **kwparameters)
+        return await cursor.evaluate()
+
+    async def commit(self):
+        """ Commit this transaction.
+
+        :returns: :class:`.Bookmark` for this transaction
+        """
+        if self._closed:
+            raise TypeError("Transaction is closed")
+        self._closed = True
+        cx, self._cx = self._cx, None
+        if cx is not None:
+            try:
+                self._bookmark = await cx.commit(self._ref)
+            finally:
+                await self.graph.pool.release(cx)
+        return self._bookmark
+
+    async def rollback(self):
+        """ Roll back this transaction.
+        """
+        if self._closed:
+            raise TypeError("Transaction is closed")
+        self._closed = True
+        cx, self._cx = self._cx, None
+        if cx is not None:
+            try:
+                await cx.rollback(self._ref)
+            finally:
+                await self.graph.pool.release(cx)
+
+    async def _abandon(self):
+        # Called on failure; the server will have already rolled back
+        # the transaction, so the connection can be released.
+        self._closed = True
+        cx, self._cx = self._cx, None
+        if cx is not None:
+            await self.graph.pool.release(cx)
+
+
+class AsyncCursor(object):
+    """ Forward-only navigator for a stream of records, the
+    asynchronous counterpart of :class:`.Cursor`. Records can be
+    iterated with ``async for``::
+
+        async for record in await graph.run("MATCH (a) RETURN a"):
+            print(record["a"])
+
+    """
+
+    def __init__(self, result, cx, hydrant=None, on_complete=None, on_error=None):
+        self._result = result
+        self._cx = cx
+        self._fields = result.fields()
+        if hydrant is not None and result.hydrate_with(hydrant):
+            hydrant = None
+        self._hydrant = hydrant
+        self._on_complete = on_complete
+        self._on_error = on_error
+        self._settled = False
+        self._current = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if await self.forward():
+            return self._current
+        else:
+            raise StopAsyncIteration()
+
+    def __getitem__(self, key):
+        return self._current[key]
+
+    @property
+    def current(self):
+        """ Returns the current record or :py:const:`None` if no record
+        has yet been selected.
+        """
+        return self._current
+
+    @property
+    def closed(self):
+        return self._result.offline
+
+    def keys(self):
+        """ Return the field names for the records in the stream.
+        """
+        return self._fields
+
+    def summary(self):
+        """ Return the result summary.
+        """
+        return self._result.summary()
+
+    def stats(self):
+        """ Return the execution statistics for this query.
+        """
+        stats = {}
+        for key, value in self._result.summary().get("stats", {}).items():
+            stats[key.replace("-", "_")] = value
+        return stats
+
+    async def _settle(self, error=False):
+        # Invoke the completion or error callback once, as soon as
+        # the result is fully received or fails.
+        if self._settled:
+            return
+        callback = None
+        if error:
+            callback = self._on_error
+        elif self._result.done():
+            callback = self._on_complete
+        else:
+            return
+        self._settled = True
+        if callback is not None:
+            await callback()
+
+    async def forward(self, amount=1):
+        """ Attempt to move the cursor forward by up to `amount`
+        records, waiting for more records to arrive if necessary.
+
+        :param amount: the amount to move the cursor
+        :returns: the amount that the cursor was able to move
+        """
+        if amount == 0:
+            return 0
+        if amount < 0:
+            raise ValueError("Cursor can only move forwards")
+        amount = int(amount)
+        moved = 0
+        while moved != amount:
+            try:
+                values = await self._cx.fetch(self._result)
+            except BaseException:
+                await self._settle(error=True)
+                raise
+            await self._settle()
+            if values is None:
+                break
+            if self._hydrant:
+                values = self._hydrant.hydrate_list(values)
+            self._current = Record(self._fields, values)
+            moved += 1
+        return moved
+
+    async def close(self):
+        """ Close the cursor, discarding any records that have not yet
+        been received from the server.
+        """
+        if not self._result.complete() and not self._result.offline:
+            try:
+                await self._cx.discard(self._result)
+            except BaseException:
+                await self._settle(error=True)
+                raise
+        await self._settle()
+
+    async def evaluate(self, field=0):
+        """ Return the value of the first field from the next record
+        (or the value of another field if explicitly specified), or
+        :const:`None` if there are no more records.
+        """
+        if await self.forward():
+            try:
+                return self[field]
+            except IndexError:
+                return None
+        else:
+            return None
+
+    async def data(self, *keys):
+        """ Consume and extract the entire result as a list of
+        dictionaries.
+        """
+        data = []
+        while await self.forward():
+            data.append(self._current.data(*keys))
+        return data
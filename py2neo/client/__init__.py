@@ -19,12 +19,13 @@
 
 from collections import deque, namedtuple, OrderedDict
 from logging import getLogger
-from os import linesep
-from random import random
+from os import getpid, linesep
+from random import random, sample
 from sys import platform, version_info
-from threading import Lock, current_thread
+from threading import Condition, Event, Lock, RLock, Thread, current_thread
 from time import sleep
 from uuid import UUID, uuid4
+from weakref import WeakSet, ref as weakref
 
 from monotonic import monotonic
 from packaging.version import Version
@@ -32,6 +33,7 @@ from six import raise_from
 
 from py2neo import ConnectionProfile, ServiceProfile
 from py2neo.compat import string_types
+from py2neo.data import Node, Relationship, FrozenNode, FrozenRelationship
 from py2neo.errors import (Neo4jError,
                            ConnectionUnavailable,
                            ConnectionBroken,
@@ -47,6 +49,26 @@ DEFAULT_MAX_CONNECTIONS = 40
 log = getLogger(__name__)
 
 
+# Objects holding per-process state, such as sockets, locks and threads,
+# which must be rebuilt in a child process after a fork.
+_fork_aware = WeakSet()
+
+
+def _after_fork_in_child():
+    for obj in list(_fork_aware):
+        obj._after_fork()
+
+
+try:
+    from os import register_at_fork
+except ImportError:
+    # Python < 3.7, or a platform without fork. Objects will instead
+    # detect a fork lazily, by a change of process ID.
+    pass
+else:
+    register_at_fork(after_in_child=_after_fork_in_child)
+
+
 ConnectionRecord = namedtuple("ConnectionRecord",
                               ["cxid", "since", "client_address",
                                "server_profile", "user_agent"])
@@ -264,7 +286,13 @@ class Connection(object):
         pass
 
     def reset(self, force=False):
-        pass
+        """ Reset the connection to a clean state, if it is not
+        already clean or if forced to do so.
+
+        :param force: if true, reset even if the connection is clean
+        :returns: true if a reset was carried out, false otherwise
+        """
+        return False
 
     def auto_run(self, cypher, parameters=None, graph_name=None, readonly=False,
                  # after=None, metadata=None, timeout=None
@@ -322,6 +350,35 @@ class Connection(object):
     def run(self, tx, cypher, parameters=None):
         raise NotImplementedError  # may have network activity
 
+    def run_many(self, tx, queries, commit=False, discard=False):
+        """ Run several queries within an open transaction, pulling
+        all records for each. Where the protocol allows, all requests
+        are sent together before any responses are read, so that the
+        whole batch costs a single network round trip.
+
+        :param tx: the transaction in which to run the queries
+        :param queries: sequence of (cypher, parameters) tuples
+        :param commit: if true, commit the transaction after the
+            queries, within the same round trip where possible; the
+            closing bookmark is then available as `tx.bookmark`
+        :param discard: if true, the records for each query are
+            discarded instead of pulled, leaving only the summary
+        :returns: list of :class:`.Result` objects
+
+        *New in version 2021.2.*
+        """
+        results = []
+        for cypher, parameters in queries:
+            result = self.run(tx, cypher, parameters)
+            if discard:
+                self.discard(result)
+            else:
+                self.pull(result)
+            results.append(result)
+        if commit:
+            tx.bookmark = self.commit(tx)
+        return results
+
     def pull(self, result, n=-1):
         """ Pull a number of records from a result.
 
@@ -415,13 +472,13 @@ class Connection(object):
         pass
 
     @classmethod
-    def default_hydrant(cls, profile, graph):
+    def default_hydrant(cls, profile, graph, identity_map=None, compact=False):
         if profile.protocol == "bolt":
             from py2neo.client.bolt import Bolt
-            return Bolt.default_hydrant(profile, graph)
+            return Bolt.default_hydrant(profile, graph, identity_map, compact)
         elif profile.protocol == "http":
             from py2neo.client.http import HTTP
-            return HTTP.default_hydrant(profile, graph)
+            return HTTP.default_hydrant(profile, graph, identity_map, compact)
         else:
             raise ValueError("Unknown scheme %r" % profile.scheme)
 
@@ -436,6 +493,15 @@ class Connection(object):
         multi-database.
         """
 
+    def take_latency(self):
+        """ Return the mean round-trip time, in seconds, of requests
+        made over this connection since this method was last called,
+        or :const:`None` if no round trips have been measured.
+
+        *New in version 2021.2.*
+        """
+        return None
+
     def get_cluster_overview(self, tx=None):
         """ Fetch an overview of the cluster of which the server is a
         member. If the server is not part of a cluster, a
@@ -612,6 +678,28 @@ class Connection(object):
         return data
 
 
+class _PoolWaiter(object):
+    """ A caller waiting in the queue to acquire a connection from a
+    full pool.
+    """
+
+    __slots__ = ("condition", "cx", "served")
+
+    def __init__(self, lock):
+        self.condition = Condition(lock)
+        self.cx = None
+        self.served = False
+
+    def serve(self, cx):
+        """ Hand over a connection to this waiter, or :const:`None`
+        to signal that it should retry. This must be called while
+        holding the pool lock.
+        """
+        self.cx = cx
+        self.served = True
+        self.condition.notify()
+
+
 class ConnectionPool(object):
     """ A pool of connections targeting a single Neo4j server.
     """
@@ -622,9 +710,15 @@ class ConnectionPool(object):
 
     default_max_age = 3600
 
+    default_acquire_timeout = 60
+
+    #: Weight given to each new sample in the exponentially weighted
+    #: moving average of round-trip latency.
+    latency_smoothing = 0.3
+
     @classmethod
     def open(cls, profile=None, user_agent=None, init_size=None, max_size=None, max_age=None,
-             on_broken=None):
+             on_broken=None, acquire_timeout=None):
         """ Create a new connection pool, with an option to seed one
         or more initial connections.
 
@@ -641,35 +735,80 @@ class ConnectionPool(object):
         :param on_broken: callback to execute when a connection in the
             pool is broken; this must accept an argument representing
             the connection profile and a second with an error message
+        :param acquire_timeout: the maximum time, in seconds, to wait
+            for a connection to become available when the pool is full
         :raises: :class:`.ConnectionUnavailable` if connections cannot
             be successfully made to seed the pool
         :raises: ValueError if the profile references an unsupported
             scheme
         """
-        pool = cls(profile, user_agent, max_size, max_age, on_broken)
+        pool = cls(profile, user_agent, max_size, max_age, on_broken, acquire_timeout)
         seeds = [pool.acquire() for _ in range(init_size or cls.default_init_size)]
         for seed in seeds:
             seed.release()
         return pool
 
-    def __init__(self, profile, user_agent=None, max_size=None, max_age=None, on_broken=None):
+    def __init__(self, profile, user_agent=None, max_size=None, max_age=None, on_broken=None,
+                 acquire_timeout=None):
         self._profile = profile or ConnectionProfile()
         self._user_agent = user_agent
         self._server_agent = None
         self._max_size = max_size or self.default_max_size
         self._max_age = max_age or self.default_max_age
+        if acquire_timeout is None:
+            self._acquire_timeout = self.default_acquire_timeout
+        else:
+            self._acquire_timeout = acquire_timeout
         self._on_broken = on_broken
-        self._in_use_list = deque()
-        self._quarantine = deque()
-        self._free_list = deque()
+        self._init_state()
         self._supports_multi = False
         # stats
         self._time_opened = monotonic()
+        self._latency = None
+        _fork_aware.add(self)
+
+    def _init_state(self):
+        self._pid = getpid()
+        # All pool state below is guarded by this lock, which is only
+        # ever held for bookkeeping, never for network activity. The
+        # in-use and quarantined connections are held in sets, so
+        # that release does not need to scan for the connection.
+        self._lock = Lock()
+        self._in_use = set()
+        self._quarantine = set()
+        self._free_list = deque()
+        self._idle_since = {}
+        self._waiters = deque()
+        self._opening = 0
+        # metrics
+        self._resets = 0
+        self._resets_avoided = 0
+
+    def _after_fork(self):
+        """ Forget all connections inherited from the parent process.
+
+        These connections are neither reset nor closed, as their
+        sockets are shared with the parent, which may still be using
+        them. The lock is also replaced, as it may have been held by
+        another thread at the time of the fork. New connections are
+        opened by the child on demand.
+        """
+        log.debug("Discarding connections inherited by pool for %r after fork", self.profile)
+        self._init_state()
+
+    def _check_fork(self):
+        """ Rebuild the pool state if this process has forked since
+        it was last used. This is only a fallback, for platforms on
+        which the pool cannot be notified of a fork directly.
+        """
+        if self._pid != getpid():
+            self._after_fork()
 
     def __str__(self):
-        in_use_list = list(self._in_use_list)
+        with self._lock:
+            in_use_list = list(self._in_use)
+            free = len(self._free_list) + len(self._quarantine)
         in_use = len(in_use_list)
-        free = len(self._free_list)
         capacity = in_use + free if self.max_size is None else self.max_size
         spare = (capacity - in_use - free)
         in_use_str = "".join(str(cx.tag)[0] if cx.tag else "X" for cx in in_use_list)
@@ -706,7 +845,12 @@ class ConnectionPool(object):
 
     @max_size.setter
     def max_size(self, value):
-        self._max_size = value
+        self._check_fork()
+        with self._lock:
+            self._max_size = value
+            # Waiters may now be able to open a new connection, or
+            # may need to give up if the pool is set to zero size.
+            self._wake_all()
 
     @property
     def max_age(self):
@@ -715,19 +859,59 @@ class ConnectionPool(object):
         """
         return self._max_age
 
+    @property
+    def acquire_timeout(self):
+        """ The maximum time, in seconds, that :meth:`.acquire` will
+        wait for a connection to become available when the pool is
+        full.
+        """
+        return self._acquire_timeout
+
+    @property
+    def waiting(self):
+        """ The number of callers currently waiting to acquire a
+        connection from this pool.
+        """
+        return len(self._waiters)
+
+    @property
+    def metrics(self):
+        """ A dictionary of counters for activity within this pool:
+
+        - ``resets`` -- the number of connections reset while being
+          sanitized for reuse
+        - ``resets_avoided`` -- the number of connections for which a
+          reset was skipped, as they were already in a clean state
+
+        *New in version 2021.2.*
+        """
+        with self._lock:
+            return {"resets": self._resets,
+                    "resets_avoided": self._resets_avoided}
+
+    @property
+    def latency(self):
+        """ Moving average of the round-trip time, in seconds, of
+        requests made over connections in this pool, or :const:`None`
+        if no round trips have yet been measured.
+
+        *New in version 2021.2.*
+        """
+        return self._latency
+
     @property
     def in_use(self):
         """ The number of connections in this pool that are currently
         in use.
         """
-        return len(self._in_use_list)
+        return len(self._in_use)
 
     @property
     def size(self):
         """ The total number of connections (both in-use and free)
         currently owned by this connection pool.
         """
-        return len(self._in_use_list) + len(self._free_list)
+        return len(self._in_use) + len(self._free_list) + len(self._quarantine)
 
     @property
     def age(self):
@@ -735,7 +919,7 @@ class ConnectionPool(object):
         """
         return monotonic() - self._time_opened
 
-    def _sanitize(self, cx, force_reset=False):
+    def _sanitize(self, cx, force_reset=False, reset=True):
         """ Attempt to clean up a connection, such that it can be
         reused.
 
@@ -746,7 +930,9 @@ class ConnectionPool(object):
 
         Should the connection be neither broken, closed nor expired,
         it will be reset (optionally forcibly so) and the connection
-        object will be returned, indicating success.
+        object will be returned, indicating success. Connections that
+        are already in a clean state will skip the reset unless it is
+        forced. If `reset` is false, only the checks are carried out.
         """
         if cx.broken or cx.closed:
             return None
@@ -754,9 +940,13 @@ class ConnectionPool(object):
         if expired:
             cx.close()
             return None
-        self._quarantine.append(cx)
-        cx.reset(force=force_reset)
-        self._quarantine.remove(cx)
+        if reset:
+            reset = cx.reset(force=force_reset)
+            with self._lock:
+                if reset:
+                    self._resets += 1
+                else:
+                    self._resets_avoided += 1
         return cx
 
     def _connect(self):
@@ -769,21 +959,23 @@ class ConnectionPool(object):
         return cx
 
     def _has_capacity(self):
-        return self.max_size is None or self.size < self.max_size
+        return self.max_size is None or self.size + self._opening < self.max_size
 
-    def acquire(self, force_reset=False, can_overfill=False):
+    def acquire(self, force_reset=False, can_overfill=False, timeout=None):
         """ Acquire a connection from the pool.
 
         In the simplest case, this will return an existing open
         connection, if one is free. If not, and the pool is not full,
         a new connection will be created. If the pool is full and no
-        free connections are available, this will block until a
-        connection is released, or until the acquire call is cancelled.
+        free connections are available, this will wait in a queue for
+        a connection to be released. Waiting callers are served in the
+        order in which they arrived, with each released connection
+        handed directly to the caller that has been waiting longest.
 
-        This method will raise :exc:`.ConnectionUnavailable` if the
-        maximum size of the pool is set to zero, if the pool is full
-        and all connections are in use, or if a new connection attempt
-        is made which fails.
+        This method will raise :exc:`.ConnectionLimit` if the maximum
+        size of the pool is set to zero, or if the pool remains full
+        for longer than the timeout. A failed attempt to open a new
+        connection will raise :exc:`.ConnectionUnavailable`.
 
         :param force_reset: if true, the connection will be forcibly
             reset before being returned; if false, this will only occur
@@ -792,45 +984,167 @@ class ConnectionPool(object):
             exceeded for this acquisition; this can be used to ensure
             system calls (such as fetching the routing table) can
             succeed even when at capacity
+        :param timeout: the maximum time, in seconds, to wait for a
+            connection if the pool is full; if :const:`None`, the
+            :attr:`.acquire_timeout` of the pool is used, and if zero,
+            this method will not wait at all
         :returns: a Bolt connection object
-        :raises: :class:`.ConnectionUnavailable` if no connection can
-            be acquired
+        :raises: :class:`.ConnectionLimit` if no connection can be
+            acquired within the timeout
+        :raises: :class:`.ConnectionUnavailable` if a new connection
+            cannot be opened
         """
         log.debug("Trying to acquire connection from pool %r", self)
-        cx = None
-        while cx is None or cx.broken or cx.closed:
-            if self.max_size == 0:
-                log.debug("Pool %r is set to zero size", self)
-                raise ConnectionLimit("Pool is set to zero size")
-            try:
-                # Plan A: select a free connection from the pool
-                cx = self._free_list.popleft()
-            except IndexError:
-                if self._has_capacity() or can_overfill:
-                    # Plan B: if the pool isn't full, open
-                    # a new connection. This may raise a
-                    # ConnectionUnavailable exception, which
-                    # should bubble up to the caller.
-                    cx = self._connect()
-                    if cx.supports_multi():
-                        self._supports_multi = True
+        self._check_fork()
+        if timeout is None:
+            timeout = self.acquire_timeout
+        deadline = monotonic() + timeout
+        while True:
+            with self._lock:
+                if self.max_size == 0:
+                    log.debug("Pool %r is set to zero size", self)
+                    raise ConnectionLimit("Pool is set to zero size")
+                try:
+                    # Plan A: select the most recently used free
+                    # connection from the pool, leaving those that
+                    # have been idle longest to be reaped.
+                    cx = self._free_list.pop()
+                except IndexError:
+                    if self._has_capacity() or can_overfill:
+                        # Plan B: if the pool isn't full, reserve
+                        # space for a new connection, to be opened
+                        # outside of the lock.
+                        self._opening += 1
+                        cx = None
+                    else:
+                        # Plan C: the pool is full and all connections
+                        # are in use. Join the queue of waiters until a
+                        # connection is handed over, or until capacity
+                        # is freed up by a connection being closed.
+                        log.debug("Pool %r is full with all connections "
+                                  "in use", self)
+                        cx = self._wait(deadline, timeout)
+                        if cx is None:
+                            continue
+                        # Connections handed over have already been
+                        # sanitized by the releasing thread.
+                        sanitize = force_reset
                 else:
-                    # Plan C: the pool is full and all connections
-                    # are in use. Return immediately to allow the
-                    # caller to make an alternative choice.
-                    log.debug("Pool %r is full with all connections "
-                              "in use", self)
-                    raise ConnectionLimit("Pool is full")
-            else:
-                cx = self._sanitize(cx, force_reset=force_reset)
+                    del self._idle_since[cx]
+                    self._in_use.add(cx)
+                    sanitize = True
+            if cx is None:
+                # This may raise a ConnectionUnavailable exception,
+                # which should bubble up to the caller.
+                cx = self._open_reserved()
+                break
+            # Free connections were reset when they were released, so
+            # only need to be reset here if this is forced.
+            if not sanitize or self._sanitize(cx, force_reset=force_reset, reset=force_reset):
+                break
+            # The connection was broken, closed or expired
+            with self._lock:
+                self._in_use.remove(cx)
+                self._wake_one()
         log.debug("Connection %r acquired by thread %r", cx, current_thread())
-        self._in_use_list.append(cx)
         return cx
 
+    def _open_reserved(self, idle=False):
+        """ Open a new connection in a space previously reserved by
+        incrementing the count of connections being opened. The new
+        connection is marked as in use unless `idle` is true, in which
+        case it is handed over to a waiter or added to the free list.
+        """
+        try:
+            cx = self._connect()
+        except BaseException:
+            with self._lock:
+                self._opening -= 1
+                self._wake_one()
+            raise
+        else:
+            with self._lock:
+                self._opening -= 1
+                if idle:
+                    self._hand_over(cx)
+                else:
+                    self._in_use.add(cx)
+            if cx.supports_multi():
+                self._supports_multi = True
+            return cx
+
+    def _wait(self, deadline, timeout):
+        """ Wait for a connection to be handed over by a releasing
+        thread, or for capacity to become available. This must be
+        called while holding the pool lock.
+
+        :returns: the connection handed over, which will already be
+            marked as in use, or :const:`None` if capacity has become
+            available for a new connection to be opened
+        :raises: :class:`.ConnectionLimit` if the deadline passes
+            before this waiter is served
+        """
+        waiter = _PoolWaiter(self._lock)
+        self._waiters.append(waiter)
+        try:
+            while not waiter.served:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    if timeout:
+                        raise ConnectionLimit("Timed out after %gs waiting for a "
+                                              "connection from pool %r" % (timeout, self))
+                    else:
+                        raise ConnectionLimit("Pool is full")
+                waiter.condition.wait(remaining)
+        finally:
+            if not waiter.served:
+                self._waiters.remove(waiter)
+        return waiter.cx
+
+    def _hand_over(self, cx):
+        """ Hand a connection to the longest waiter, if there is one,
+        otherwise return it to the free list. This must be called
+        while holding the pool lock.
+        """
+        latency = cx.take_latency()
+        if latency is not None:
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += self.latency_smoothing * (latency - self._latency)
+        try:
+            waiter = self._waiters.popleft()
+        except IndexError:
+            self._free_list.append(cx)
+            self._idle_since[cx] = monotonic()
+        else:
+            self._in_use.add(cx)
+            waiter.serve(cx)
+
+    def _wake_one(self):
+        """ Wake the longest waiter, to allow it to open a new
+        connection in capacity that has been freed up. This must be
+        called while holding the pool lock.
+        """
+        try:
+            waiter = self._waiters.popleft()
+        except IndexError:
+            pass
+        else:
+            waiter.serve(None)
+
+    def _wake_all(self):
+        """ Wake all waiters. This must be called while holding the
+        pool lock.
+        """
+        while self._waiters:
+            self._waiters.popleft().serve(None)
+
     def release(self, cx, force_reset=False):
         """ Release a Bolt connection, putting it back into the pool
         if the connection is healthy and the pool is not already at
-        capacity.
+        capacity. If other callers are waiting to acquire a
+        connection, it is handed directly to the longest waiter.
 
         :param cx: the connection to release
         :param force_reset: if true, the connection will be forcibly
@@ -841,39 +1155,122 @@ class ConnectionPool(object):
             pool
         """
         log.debug("Releasing connection %r from thread %r", cx, current_thread())
-        if cx in self._free_list or cx in self._quarantine:
-            return
-        if cx not in self._in_use_list:
-            # Connection does not belong to this pool
-            log.debug("Connection %r does not belong to pool %r", cx, self)
-            return
-        self._in_use_list.remove(cx)
-        cx.tag = None
-        if self._has_capacity():
+        self._check_fork()
+        with self._lock:
+            if cx not in self._in_use:
+                # Connection is already free, is being sanitized, or
+                # does not belong to this pool
+                log.debug("Connection %r is not in use in pool %r", cx, self)
+                return
+            self._in_use.remove(cx)
+            cx.tag = None
+            has_capacity = self._has_capacity()
+            if has_capacity:
+                # Hold the connection in quarantine while it is being
+                # sanitized, so that it still counts towards the size
+                # of the pool.
+                self._quarantine.add(cx)
+        if has_capacity:
             # If there is spare capacity in the pool, attempt to
             # sanitize the connection and return it to the pool.
-            cx = self._sanitize(cx, force_reset=force_reset)
-            if cx:
-                # Carry on only if sanitation succeeded.
-                if self._has_capacity():
-                    # Check again if there is still capacity.
-                    self._free_list.append(cx)
-                    pass  # Removed waiting list mechanism (11 Nov 2020)
-                else:
-                    # Otherwise, close the connection.
-                    cx.close()
-        else:
-            # If the pool is full, simply close the connection.
-            cx.close()
+            sanitized = self._sanitize(cx, force_reset=force_reset)
+            with self._lock:
+                self._quarantine.remove(cx)
+                if sanitized and self._has_capacity():
+                    # Carry on only if sanitation succeeded and
+                    # there is still capacity.
+                    self._hand_over(cx)
+                    return
+                elif not sanitized:
+                    self._wake_one()
+                    return
+        # If the pool is full, simply close the connection.
+        cx.close()
+        with self._lock:
+            self._wake_one()
 
     def prune(self):
         """ Release all broken connections marked as "in use" and then
         close all free connections.
         """
-        for cx in list(self._in_use_list):
-            if cx.broken:
-                cx.release()
-        self.__close(self._free_list)
+        self._check_fork()
+        with self._lock:
+            broken = [cx for cx in self._in_use if cx.broken]
+            free, self._free_list = self._free_list, deque()
+            self._idle_since.clear()
+        for cx in broken:
+            cx.release()
+        self.__close(free)
+
+    def maintain(self, min_idle=0, max_idle_time=None):
+        """ Carry out routine maintenance on this pool, away from the
+        request path.
+
+        Free connections that are broken, closed or older than the
+        maximum age are closed. Those idle for longer than
+        `max_idle_time` are also closed, unless needed to keep
+        `min_idle` free connections available, in which case they are
+        reset to check that they are still alive. Finally, new
+        connections are opened, up to the maximum size of the pool,
+        until at least `min_idle` are free.
+
+        :param min_idle: number of free connections to keep open and
+            ready for use
+        :param max_idle_time: time, in seconds, after which an idle
+            connection is closed or checked for liveness
+        """
+        self._check_fork()
+        now = monotonic()
+        with self._lock:
+            keep = deque()
+            due = []
+            for cx in self._free_list:
+                if self._is_stale(cx) or (max_idle_time is not None and
+                                          now - self._idle_since[cx] > max_idle_time):
+                    due.append(cx)
+                    del self._idle_since[cx]
+                else:
+                    keep.append(cx)
+            self._free_list = keep
+            self._quarantine.update(due)
+            spare = len(keep)
+        for cx in due:
+            alive = False
+            if spare < min_idle and not self._is_stale(cx):
+                try:
+                    cx.reset(force=True)
+                except Exception as error:
+                    log.debug("Liveness check failed for connection %r (%s)", cx, error)
+                else:
+                    alive = not self._is_stale(cx)
+            if alive:
+                spare += 1
+            else:
+                log.debug("Closing idle connection %r", cx)
+                cx.close()
+            with self._lock:
+                self._quarantine.remove(cx)
+                if alive:
+                    self._hand_over(cx)
+                else:
+                    self._wake_one()
+        while True:
+            with self._lock:
+                if (self.max_size == 0 or not self._has_capacity() or
+                        len(self._free_list) + self._opening >= min_idle):
+                    break
+                self._opening += 1
+            try:
+                self._open_reserved(idle=True)
+            except (ConnectionUnavailable, ConnectionBroken) as error:
+                log.debug("Unable to open idle connection for pool %r (%s)", self, error)
+                break
+
+    def _is_stale(self, cx):
+        """ Return true if a connection is broken, closed or older
+        than the maximum age for this pool.
+        """
+        return cx.broken or cx.closed or (self.max_age is not None and cx.age > self.max_age)
 
     def close(self):
         """ Close all connections immediately.
@@ -899,7 +1296,10 @@ class ConnectionPool(object):
         """
         self.max_size = 0
         self.prune()
-        self.__close(self._in_use_list)
+        with self._lock:
+            in_use = deque(self._in_use)
+            self._in_use.clear()
+        self.__close(in_use)
 
     @classmethod
     def __close(cls, connections):
@@ -924,6 +1324,113 @@ class ConnectionPool(object):
             self._on_broken(self._profile, message)
 
 
+class LoadBalancer(object):
+    """ Base class for strategies that choose between the pools of
+    connections to several servers, any of which could equally serve
+    a request. These are used for distributing read workloads across
+    the members of a cluster.
+
+    Strategies can be selected by name with the ``load_balancing``
+    setting, or an instance can be passed instead.
+
+    *New in version 2021.2.*
+    """
+
+    @classmethod
+    def for_name(cls, name):
+        """ Create a load balancer from a strategy name.
+
+        :param name: ``"least_connected"`` or ``"least_latency"``
+        :raises ValueError: if the name is not recognised
+        """
+        if name == "least_connected":
+            return LeastConnectedLoadBalancer()
+        elif name == "least_latency":
+            return LeastLatencyLoadBalancer()
+        else:
+            raise ValueError("Unknown load balancing strategy %r" % name)
+
+    def order(self, pools):
+        """ Return a list of the given pools, in the order in which
+        they should be tried. Pools may be omitted.
+
+        :param pools: list of :class:`.ConnectionPool` objects
+        """
+        raise NotImplementedError
+
+
+class LeastConnectedLoadBalancer(LoadBalancer):
+    """ Load balancing strategy that prefers the pools with fewest
+    connections in use. This is the default strategy.
+
+    Pools that are younger than :attr:`.warm_up_time` seconds are
+    used for only a fraction of requests, as long as at least one
+    older pool exists. This prevents spikes in activity on new
+    members by gradually introducing them to workload, and avoids
+    over-compensation by the least-connected algorithm.
+    """
+
+    #: Age, in seconds, at which a pool receives its full share of work.
+    warm_up_time = 60
+
+    #: Fraction of requests for which younger pools are considered.
+    warm_up_rate = 0.1
+
+    def order(self, pools):
+        if any(pool.age >= self.warm_up_time for pool in pools):
+            pools = [pool for pool in pools
+                     if pool.age >= self.warm_up_time or random() < self.warm_up_rate]
+        return sorted(pools, key=lambda p: p.in_use)
+
+
+class LeastLatencyLoadBalancer(LoadBalancer):
+    """ Load balancing strategy that prefers the pools with the lowest
+    expected wait. This is estimated from the moving average of round
+    trip latency for each pool (see :attr:`.ConnectionPool.latency`)
+    multiplied by the number of requests in flight, including any
+    waiting for a connection.
+
+    To avoid every client herding onto the same server between
+    measurements, two pools are picked at random and the better of
+    these is tried first (the "power of two choices"). The remainder
+    follow, in order of cost. Pools with no latency measured yet are
+    assumed to perform at the average of the others, so that new
+    members are gradually brought into use.
+    """
+
+    def order(self, pools):
+        pools = list(pools)
+        if len(pools) < 2:
+            return pools
+        known = [pool.latency for pool in pools if pool.latency is not None]
+        default_latency = sum(known) / len(known) if known else 0.0
+
+        def cost(pool):
+            latency = default_latency if pool.latency is None else pool.latency
+            return latency * (pool.in_use + pool.waiting + 1)
+
+        first = min(sample(pools, 2), key=cost)
+        pools.remove(first)
+        return [first] + sorted(pools, key=cost)
+
+
+def _maintain_pools(connector_ref, stopped, interval):
+    """ Maintenance loop for the pools held by a connector, run in a
+    background thread until the connector is closed or collected.
+    """
+    while True:
+        connector = connector_ref()
+        if connector is None:
+            break
+        try:
+            connector.maintain()
+        except Exception as error:
+            log.warning("Pool maintenance failed (%s)", error)
+        del connector
+        if stopped.wait(interval):
+            break
+
+
 class Connector(object):
     """ A connection pool abstraction that uses an appropriate
     connection pool implementation and is coupled with a transaction
@@ -941,10 +1448,31 @@ class Connector(object):
     :param max_age: the maximum permitted age, in seconds, for
         connections to be retained within pools held by this
         connector
+    :param routing_refresh_ttl: an optional override for the time to
+        live of routing tables, in seconds
+    :param fetch_size: the number of records to pull from the server
+        in each batch when streaming results; if unset, results are
+        pulled in full when a query is run
+    :param acquire_timeout: the maximum time, in seconds, to wait for
+        a connection to become available when all pools are full
+    :param maintenance_interval: if set, a background thread will
+        maintain all pools held by this connector at this interval, in
+        seconds; see :meth:`.ConnectionPool.maintain`
+    :param min_idle: the number of free connections that the
+        maintenance thread should keep open in each pool
+    :param max_idle_time: the time, in seconds, after which the
+        maintenance thread should close an idle connection, or check
+        its liveness if it is needed to make up the `min_idle` count
+    :param load_balancing: a :class:`.LoadBalancer`, or the name of a
+        load balancing strategy, for choosing between readers; see
+        :meth:`.LoadBalancer.for_name`
     """
 
     def __init__(self, profile=None, user_agent=None, init_size=None,
-                 max_size=None, max_age=None, routing_refresh_ttl=None):
+                 max_size=None, max_age=None, routing_refresh_ttl=None,
+                 fetch_size=None, acquire_timeout=None,
+                 maintenance_interval=None, min_idle=None, max_idle_time=None,
+                 load_balancing=None):
         self._profile = ServiceProfile(profile)
         self._initial_routers = [ConnectionProfile(profile)]
         self._user_agent = user_agent
@@ -953,12 +1481,62 @@ class Connector(object):
         self._max_size = max_size
         self._max_age = max_age
         self._routing_refresh_ttl = routing_refresh_ttl
+        self._fetch_size = fetch_size
+        self._acquire_timeout = acquire_timeout
+        self._min_idle = min_idle or 0
+        self._max_idle_time = max_idle_time
+        self._maintenance_interval = maintenance_interval
+        if load_balancing is None:
+            self._load_balancer = LeastConnectedLoadBalancer()
+        elif isinstance(load_balancing, LoadBalancer):
+            self._load_balancer = load_balancing
+        else:
+            self._load_balancer = LoadBalancer.for_name(load_balancing)
+        self._pid = getpid()
+        self._default_graph_name = None
+        self._default_graph_name_known = False
         self._pools = {}
+        self._pools_lock = Lock()
         if self._profile.routing:
             self._router = Router()
         else:
             self._router = None
         self._add_pools(*self._initial_routers)
+        self._closed = False
+        self._start_maintenance()
+        _fork_aware.add(self)
+
+    def _start_maintenance(self):
+        self._maintenance_stopped = Event()
+        if self._maintenance_interval and not self._closed:
+            thread = Thread(target=_maintain_pools,
+                            args=(weakref(self), self._maintenance_stopped,
+                                  self._maintenance_interval),
+                            name="py2neo.maintenance")
+            thread.daemon = True
+            thread.start()
+
+    def _after_fork(self):
+        """ Prepare this connector for use in a child process after a
+        fork. Routing information is retained, so that the child need
+        not rediscover the cluster, while each pool separately discards
+        the connections inherited from the parent. The maintenance
+        thread, which does not survive a fork, is restarted if enabled.
+        """
+        self._pid = getpid()
+        self._pools_lock = Lock()
+        if self._router is not None:
+            self._router._after_fork()
+        self._start_maintenance()
+
+    def _check_fork(self):
+        """ Prepare this connector for use in a child process if this
+        process has forked since it was last used. This is only a
+        fallback, for platforms on which the connector cannot be
+        notified of a fork directly.
+        """
+        if self._pid != getpid():
+            self._after_fork()
 
     def __repr__(self):
         return "<{} to {!r}>".format(self.__class__.__name__, self.profile)
@@ -973,21 +1551,28 @@ class Connector(object):
     def _add_pools(self, *profiles):
         """ Adds connection pools for one or more connection profiles.
         Pools that already exist will be skipped.
+
+        Routing tables may be fetched by several threads at once, so
+        the check and creation for each pool are carried out under a
+        lock, to avoid a duplicate pool replacing (and orphaning) the
+        one added by another thread.
         """
         for profile in profiles:
-            if profile in self._pools:
-                # This profile already has a pool,
-                # no need to add it again
-                continue
-            log.debug("Adding connection pool for profile %r", profile)
-            pool = ConnectionPool.open(
-                profile,
-                user_agent=self._user_agent,
-                init_size=self._init_size,
-                max_size=self._max_size,
-                max_age=self._max_age,
-                on_broken=self._on_broken)
-            self._pools[profile] = pool
+            with self._pools_lock:
+                if profile in self._pools:
+                    # This profile already has a pool,
+                    # no need to add it again
+                    continue
+                log.debug("Adding connection pool for profile %r", profile)
+                pool = ConnectionPool.open(
+                    profile,
+                    user_agent=self._user_agent,
+                    init_size=self._init_size,
+                    max_size=self._max_size,
+                    max_age=self._max_age,
+                    on_broken=self._on_broken,
+                    acquire_timeout=self._acquire_timeout)
+                self._pools[profile] = pool
 
     def invalidate_routing_table(self, graph_name):
         """ Invalidate the routing table for the given graph.
@@ -1005,6 +1590,10 @@ class Connector(object):
         while True:  # TODO: some limit to this, maybe with repeater?
             ro_profiles, rw_profiles, expired = rt.runners()
             if not expired:
+                if rt.is_due() and rt.set_updating():
+                    # The table is nearing expiry, so refresh it in the
+                    # background while the current entries are used.
+                    self._refresh_in_background(graph_name, rt)
                 return ro_profiles, rw_profiles
             elif rt.is_updating():
                 if readonly and ro_profiles:
@@ -1026,45 +1615,131 @@ class Connector(object):
         """
         if self._router is None:
             raise TypeError("Routing not enabled for service")
-        log.debug("Attempting to refresh routing table for %s", _repr_graph_name(graph_name))
+        self._check_fork()
         rt = self._router.get_routing_table(graph_name)
-        rt.set_updating()
+        if not rt.set_updating():
+            # Another thread is already refreshing this table, so
+            # wait for that to finish instead.
+            rt.wait_until_updated()
+            return self._router.get_routing_table(graph_name)
         try:
-            known_routers = self._router.routers + self._initial_routers  # TODO de-dupe
-            log.debug("Known routers are: %s", ", ".join(map(repr, known_routers)))
-            for router in known_routers:
-                log.debug("Asking %r for routing table", router)
+            return self._fetch_routing_table(graph_name)
+        finally:
+            rt.set_not_updating()
+
+    def _refresh_in_background(self, graph_name, rt):
+        """ Refresh a routing table in a background thread. The update
+        flag for the table must already have been set by the caller,
+        and is cleared once the refresh is complete.
+        """
+
+        def refresh():
+            try:
+                self._fetch_routing_table(graph_name)
+            except Exception as error:
+                # The table will be refreshed on the request path
+                # once it expires, so this is not yet fatal.
+                log.warning("Background refresh of routing table for %s failed (%s)",
+                            _repr_graph_name(graph_name), error)
+            finally:
+                rt.set_not_updating()
+
+        log.debug("Refreshing routing table for %s in background", _repr_graph_name(graph_name))
+        thread = Thread(target=refresh, name="py2neo.routing")
+        thread.daemon = True
+        thread.start()
+
+    def _fetch_routing_table(self, graph_name):
+        """ Fetch a new routing table from the first available router
+        and update the routing information for the given graph. The
+        caller is responsible for setting the update flag.
+        """
+        log.debug("Attempting to refresh routing table for %s", _repr_graph_name(graph_name))
+        # Routers from the latest routing table are tried first,
+        # falling back to the initial routers. These may overlap.
+        known_routers = list(OrderedDict.fromkeys(self._router.routers +
+                                                  self._initial_routers))
+        log.debug("Known routers are: %s", ", ".join(map(repr, known_routers)))
+        for router in known_routers:
+            log.debug("Asking %r for routing table", router)
+            try:
+                pool = self._pools[router]
+            except KeyError:
+                continue
+            try:
+                cx = pool.acquire(can_overfill=True)
+            except (ConnectionUnavailable, ConnectionBroken, ConnectionLimit):
+                continue  # try the next router instead
+            else:
                 try:
-                    pool = self._pools[router]
-                except KeyError:
+                    routers, ro_runners, rw_runners, ttl = cx.route(graph_name)
+                    if self._routing_refresh_ttl is not None:
+                        ttl = self._routing_refresh_ttl
+                except (ConnectionUnavailable, ConnectionBroken, ConnectionLimit) as error:
+                    log.debug(error.args[0])
                     continue
-                try:
-                    cx = pool.acquire(can_overfill=True)
-                except (ConnectionUnavailable, ConnectionBroken, ConnectionLimit):
-                    continue  # try the next router instead
                 else:
-                    try:
-                        routers, ro_runners, rw_runners, ttl = cx.route(graph_name)
-                        if self._routing_refresh_ttl is not None:
-                            ttl = self._routing_refresh_ttl
-                    except (ConnectionUnavailable, ConnectionBroken, ConnectionLimit) as error:
-                        log.debug(error.args[0])
-                        continue
-                    else:
-                        # TODO: comment this algorithm
-                        self._add_pools(*routers)
-                        self._add_pools(*ro_runners)
-                        self._add_pools(*rw_runners)
-                        old_profiles = self._router.update(graph_name, routers, ro_runners, rw_runners, ttl)
-                        for profile in old_profiles:
-                            self.prune(profile)
-                        return self._router.get_routing_table(graph_name)
-                    finally:
-                        cx.release()
-            else:
-                raise ServiceUnavailable("Cannot connect to any known routers")
-        finally:
-            rt.set_not_updating()
+                    # TODO: comment this algorithm
+                    self._add_pools(*routers)
+                    self._add_pools(*ro_runners)
+                    self._add_pools(*rw_runners)
+                    old_profiles = self._router.update(graph_name, routers, ro_runners, rw_runners, ttl)
+                    for profile in old_profiles:
+                        self.prune(profile)
+                    return self._router.get_routing_table(graph_name)
+                finally:
+                    cx.release()
+        else:
+            raise ServiceUnavailable("Cannot connect to any known routers")
+
+    def prefetch_routing_tables(self, graph_names=None, max_workers=8):
+        """ Fetch routing tables for several graph databases at once,
+        so that the first use of each does not need to wait for one.
+        Tables that are not yet due for refresh are skipped. Failures
+        are logged, but otherwise ignored, as the table concerned will
+        be fetched again on first use.
+
+        This method has no effect if routing is not enabled.
+
+        :param graph_names: names of graph databases for which to fetch
+            routing tables; if omitted, tables are fetched for the
+            default graph database and all those returned by
+            :meth:`.graph_names`
+        :param max_workers: maximum number of routing tables to fetch
+            concurrently
+        :returns: dictionary mapping graph database names to the
+            :class:`.RoutingTable` fetched for each
+
+        *New in version 2021.2.*
+        """
+        if self._router is None:
+            return {}
+        self._check_fork()
+        if graph_names is None:
+            graph_names = [None] + self.graph_names()
+        pending = deque(graph_name for graph_name in OrderedDict.fromkeys(graph_names)
+                        if self._router.get_routing_table(graph_name).is_due())
+        routing_tables = {}
+
+        def fetch():
+            while True:
+                try:
+                    graph_name = pending.popleft()
+                except IndexError:
+                    break
+                try:
+                    routing_tables[graph_name] = self.refresh_routing_table(graph_name)
+                except Exception as error:
+                    log.warning("Failed to prefetch routing table for %s (%s)",
+                                _repr_graph_name(graph_name), error)
+
+        workers = [Thread(target=fetch, name="py2neo.routing")
+                   for _ in range(min(max_workers, len(pending)))]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return routing_tables
 
     def get_router_profiles(self):
         """ Get the last known router profiles.
@@ -1085,6 +1760,19 @@ class Connector(object):
         """
         return self._user_agent
 
+    @property
+    def load_balancer(self):
+        """ The :class:`.LoadBalancer` used to choose between readers.
+        """
+        return self._load_balancer
+
+    @property
+    def fetch_size(self):
+        """ The number of records pulled in each batch when streaming
+        results, or :const:`None` if results are pulled in full.
+        """
+        return self._fetch_size
+
     @property
     def server_agent(self):
         """ A server agent taken from one of the connection pools
@@ -1103,9 +1791,19 @@ class Connector(object):
         return {profile: pool.in_use
                 for profile, pool in self._pools.items()}
 
+    @property
+    def metrics(self):
+        """ A dictionary mapping each profile to the
+        :attr:`~.ConnectionPool.metrics` for the pool of connections
+        to that profile.
+        """
+        return {profile: pool.metrics
+                for profile, pool in list(self._pools.items())}
+
     def _acquire(self, graph_name=None, readonly=False):
         """ Acquire a connection from a pool owned by this connector.
         """
+        self._check_fork()
         if readonly:
             return self._acquire_ro(graph_name)
         else:
@@ -1148,37 +1846,43 @@ class Connector(object):
                 # we have no option but to bail out.
                 raise ServiceUnavailable("No servers available")
 
-            if any(pool.age >= 60 for pool in pools):
-                # Assuming we have at least one pool that has been
-                # alive for over a minute, reduce the usage of any
-                # pools that have been been alive for less than a
-                # minute to 10%. This prevents spikes in activity on
-                # new members by gradually introducing them to
-                # workload, and avoids over-compensation by the
-                # least-connected algorithm.
-                pools = [pool for pool in pools
-                         if pool.age >= 60 or random() < 0.1]
-
-            for pool in sorted(pools, key=lambda p: p.in_use):
+            full_pools = []
+            for pool in self._load_balancer.order(pools):
                 log.debug("Using connection pool %r", pool)
                 try:
-                    cx = pool.acquire()
+                    cx = pool.acquire(timeout=0)
                 except (ConnectionUnavailable, ConnectionBroken):
                     self.prune(pool.profile)
                     continue
                 except ConnectionLimit:
                     # Limit can occur if the pool is full (no spare) or
-                    # if it is set to zero size. In this case, wait a
-                    # short time before trying again.
+                    # if it is set to zero size.
                     if pool.size == 0:
                         self.prune(pool.profile)
-                    sleep(0.1)
+                    elif pool.max_size != 0:
+                        full_pools.append(pool)
                     continue
                 else:
                     if cx is not None:
                         cx.tag = "R"
                         return cx
 
+            if full_pools:
+                # Every usable pool is full, so queue for a connection
+                # from the least busy of these. This will raise
+                # ConnectionLimit if none is released in time.
+                pool = min(full_pools, key=lambda p: p.waiting)
+                try:
+                    cx = pool.acquire()
+                except (ConnectionUnavailable, ConnectionBroken):
+                    self.prune(pool.profile)
+                else:
+                    cx.tag = "R"
+                    return cx
+            else:
+                # Wait a short time before trying again.
+                sleep(0.1)
+
     def _acquire_rw(self, graph_name=None):
         """ Acquire a read-write connection from a pool owned by this
         connector.
@@ -1228,17 +1932,20 @@ class Connector(object):
             for pool in sorted(pools, key=lambda p: p.in_use):
                 log.debug("Using connection pool %r", pool)
                 try:
+                    # If the pool is full, this will queue for a
+                    # connection, raising ConnectionLimit if none is
+                    # released in time.
                     cx = pool.acquire()
                 except (ConnectionUnavailable, ConnectionBroken):
                     self.prune(pool.profile)
                     break
                 except ConnectionLimit:
-                    # Limit can occur if pool is full (no spare) or
-                    # set to zero size.
+                    # Limit can occur if pool is set to zero size or
+                    # remains full for longer than the timeout.
                     if pool.size == 0:
                         self.prune(pool.profile)
                         raise ServiceUnavailable("Write server pool is set to zero size")
-                    break
+                    raise
                 else:
                     if cx is not None:
                         cx.tag = "W"
@@ -1279,11 +1986,12 @@ class Connector(object):
         else:
             pool.prune()
             if self._router is not None and pool.size == 0:
-                log.debug("Removing connection pool for profile %r", profile)
-                try:
-                    del self._pools[profile]
-                except KeyError:
-                    pass  # already gone
+                with self._pools_lock:
+                    # Only remove the pool that was pruned, not one
+                    # added in its place by another thread.
+                    if self._pools.get(profile) is pool:
+                        log.debug("Removing connection pool for profile %r", profile)
+                        del self._pools[profile]
 
     def close(self):
         """ Close all connections immediately.
@@ -1307,9 +2015,25 @@ class Connector(object):
         rejected, and released connections will be closed instead
         of being returned to the pool.
         """
+        self._closed = True
+        self._maintenance_stopped.set()
         for pool in self._pools.values():
             pool.close()
 
+    @property
+    def closed(self):
+        """ True if :meth:`.close` has been called on this connector.
+        """
+        return self._closed
+
+    def maintain(self):
+        """ Carry out a single round of maintenance on all pools held
+        by this connector. This is called periodically by the
+        maintenance thread, if enabled.
+        """
+        for pool in list(self._pools.values()):
+            pool.maintain(self._min_idle, self._max_idle_time)
+
     def _on_broken(self, profile, message):
         """ Handle a broken connection.
         """
@@ -1354,6 +2078,13 @@ class Connector(object):
         :raises ConnectionUnavailable: if a begin attempt cannot be made
         :raises ConnectionBroken: if a begin attempt is made, but fails due to disconnection
         :raises Failure: if the server signals a failure condition
+
+        *Changed in version 2021.2: over Bolt 3.0 and above, and over
+        HTTP, the transaction is not begun on the server until the
+        first request is made within it. A failure to begin, such as
+        for an unknown database, an expired bookmark or a lack of
+        access, is therefore raised by that first request (which may
+        be a commit or rollback) rather than by this method.*
         """
         cx = self._acquire(graph_name)
         try:
@@ -1427,6 +2158,29 @@ class Connector(object):
             self.prune(cx.profile)
             raise
 
+    def run_many(self, tx, queries, commit=False, discard=False):
+        """ Run several Cypher queries within an open explicit
+        transaction, pipelining the requests where possible.
+
+        :param tx:
+        :param queries: sequence of (cypher, parameters) tuples
+        :param commit: if true, commit the transaction after the
+            queries, pipelining the commit where possible
+        :param discard: if true, discard the records for each query
+            instead of pulling them
+        :returns: list of :class:`.Result` objects, with all records
+            pulled (or discarded)
+        :raises ConnectionUnavailable: if an attempt to run cannot be made
+        :raises ConnectionBroken: if an attempt to run is made, but fails due to disconnection
+        :raises Failure: if the server signals a failure condition
+        """
+        cx = self._reacquire(tx)
+        try:
+            return cx.run_many(tx, queries, commit=commit, discard=discard)
+        except (ConnectionUnavailable, ConnectionBroken):
+            self.prune(cx.profile)
+            raise
+
     def pull(self, result, n=-1):
         if n == 0:
             return
@@ -1437,12 +2191,33 @@ class Connector(object):
             self.prune(cx.profile)
             raise
 
+    def fetch(self, result):
+        """ Return the next record from a result, retrieving more
+        records from the server first if the result is being streamed
+        and none are buffered.
+
+        :param result: the result from which to fetch
+        :returns: record or :const:`None` if the result is exhausted
+        :raises ConnectionBroken: if the result is being streamed and
+            the connection fails
+        """
+        try:
+            return result.fetch()
+        except (ConnectionUnavailable, ConnectionBroken):
+            self.prune(result.profile)
+            raise
+
     def discard(self, result):
-        cx = self._reacquire(result.transaction)
+        """ Discard the remainder of a result that is being streamed,
+        allowing the connection in use to be released.
+
+        :param result: the result to discard
+        :raises ConnectionBroken: if the connection fails
+        """
         try:
-            cx.discard(result)
+            result.discard()
         except (ConnectionUnavailable, ConnectionBroken):
-            self.prune(cx.profile)
+            self.prune(result.profile)
             raise
 
     def supports_multi(self):
@@ -1479,9 +2254,21 @@ class Connector(object):
                 value.add(record[0])  # The first column is 'name'
             return sorted(value)
 
-    def default_graph_name(self):
+    def default_graph_name(self, refresh=False):
         """ Fetch the default graph database name for the service.
+
+        The name is cached after the first successful lookup, as it
+        rarely changes and costs a round trip to determine.
+
+        :param refresh: if true, ignore any cached name and fetch it
+            again
         """
+        if refresh or not self._default_graph_name_known:
+            self._default_graph_name = self._fetch_default_graph_name()
+            self._default_graph_name_known = True
+        return self._default_graph_name
+
+    def _fetch_default_graph_name(self):
         try:
             result = self._show_databases()
         except TypeError:
@@ -1507,16 +2294,156 @@ class Connector(object):
             return None
 
 
+class ConnectorRegistry(object):
+    """ Registry of :class:`.Connector` objects, allowing a single
+    connector (and its pools of warm connections) to be shared between
+    all users with the same profile and connector settings.
+
+    Connectors are reference counted by user, with each user tracked
+    by weak reference. When the last user of a connector goes away, the
+    connector is kept open for reuse by a later user, up to a limit of
+    :attr:`.max_unused` such connectors, beyond which the least
+    recently used are closed. A connector that has been explicitly
+    closed is replaced on next use.
+
+    The registry is fork-aware: a child process never receives a
+    connector created by its parent, and the parent's connectors are
+    left untouched by the child.
+
+    *New in version 2021.2.*
+    """
+
+    #: Maximum number of connectors without users to keep open.
+    max_unused = 4
+
+    def __init__(self):
+        self.__reset()
+        _fork_aware.add(self)
+
+    def _after_fork(self):
+        # Forget (but do not close) connectors belonging to the
+        # parent process.
+        self.__reset()
+
+    def __reset(self):
+        # Reentrant, as the weak reference callbacks that release
+        # connectors may be triggered by garbage collection at any
+        # point, including while the lock is held.
+        self._lock = RLock()
+        self._pid = getpid()
+        self._connectors = {}
+        self._users = {}
+        self._unused = OrderedDict()
+        self._refs = set()
+
+    def __len__(self):
+        return len(self._connectors)
+
+    @classmethod
+    def default(cls):
+        """ Return the default, process-wide registry.
+        """
+        return _default_connector_registry
+
+    def connector(self, user, profile=None, **settings):
+        """ Return a shared connector for the given profile and
+        settings, creating one if necessary.
+
+        :param user: object that will use the connector; the connector
+            is held for as long as this object remains alive
+        :param profile: :class:`.ServiceProfile` for the connector
+        :param settings: other connector settings, as accepted by the
+            :class:`.Connector` constructor
+        :returns: :class:`.Connector` object
+        """
+        if getpid() != self._pid:
+            # Forked since last use, so forget (but do not close)
+            # connectors belonging to the parent process.
+            self.__reset()
+        profile = ServiceProfile(profile)
+        key = (profile, tuple(sorted(settings.items())))
+        with self._lock:
+            connector = self._connectors.get(key)
+            if connector is not None and connector.closed:
+                self._forget(key)
+                connector = None
+        if connector is None:
+            # Connectors may open connections on construction, so
+            # create outside of the lock, then check again.
+            new_connector = Connector(profile, **settings)
+            with self._lock:
+                connector = self._connectors.get(key)
+                if connector is None or connector.closed:
+                    connector = self._connectors[key] = new_connector
+                    self._users[key] = 0
+                    new_connector = None
+            if new_connector is not None:
+                new_connector.close()
+        with self._lock:
+            self._unused.pop(key, None)
+            self._users[key] += 1
+            self._refs.add(weakref(user, lambda ref: self._release(ref, key)))
+        return connector
+
+    def _release(self, ref, key):
+        with self._lock:
+            if ref not in self._refs:
+                return
+            self._refs.remove(ref)
+            self._users[key] -= 1
+            if self._users[key] > 0:
+                return
+            self._unused[key] = self._connectors[key]
+            evicted = []
+            while len(self._unused) > self.max_unused:
+                old_key, _ = self._unused.popitem(last=False)
+                evicted.append(self._connectors[old_key])
+                self._forget(old_key)
+        for connector in evicted:
+            connector.close()
+
+    def _forget(self, key):
+        del self._connectors[key]
+        del self._users[key]
+        self._unused.pop(key, None)
+
+    def clear(self):
+        """ Close and remove all connectors held by this registry.
+        Connectors still in use will be closed too.
+        """
+        with self._lock:
+            connectors = list(self._connectors.values())
+            self.__reset()
+        for connector in connectors:
+            connector.close()
+
+
+_default_connector_registry = ConnectorRegistry()
+
+
 class Router(object):
 
+    #: Fraction of its time to live after which a routing table is
+    #: refreshed in the background, ahead of expiry.
+    refresh_ahead = 0.7
+
     def __init__(self):
         self._lock = Lock()
         self._routers = []
         self._routing_tables = {}  # graph_name: routing_table
 
+    def _after_fork(self):
+        """ Replace locks that may have been held by another thread at
+        the time of a fork, keeping all routing information.
+        """
+        self._lock = Lock()
+        for routing_table in self._routing_tables.values():
+            routing_table._update_lock = Lock()
+
     @property
     def routers(self):
-        return self._routers
+        with self._lock:
+            return list(self._routers)
 
     def get_routing_table(self, graph_name):
         """ Return the routing table for the given graph.
@@ -1532,35 +2459,43 @@ class Router(object):
     def invalidate_routing_table(self, graph_name):
         """ Invalidate the routing table for the given graph.
         """
-        try:
-            del self._routing_tables[graph_name]
-        except KeyError:
-            pass
+        with self._lock:
+            try:
+                del self._routing_tables[graph_name]
+            except KeyError:
+                pass
 
     def update(self, graph_name, routers, ro_runners, rw_runners, ttl):
-        old_profiles = set(profile for profile in self._routers
-                           if profile not in routers)
-        self._routers[:] = routers
-        routing_table = RoutingTable(ro_runners, rw_runners, monotonic() + ttl)
-        if graph_name in self._routing_tables:
-            rt = self._routing_tables[graph_name]
-            rt.replace(routing_table)
-            old_profiles.update(profile for profile in rt
-                                if profile not in routing_table)
-        else:
-            self._routing_tables[graph_name] = routing_table
-        return old_profiles
+        # Tables may be updated by background refresh and prefetch
+        # threads while others are in use, so all changes are made
+        # under the router lock.
+        with self._lock:
+            old_profiles = set(profile for profile in self._routers
+                               if profile not in routers)
+            self._routers[:] = routers
+            now = monotonic()
+            routing_table = RoutingTable(ro_runners, rw_runners, now + ttl,
+                                         now + ttl * self.refresh_ahead)
+            if graph_name in self._routing_tables:
+                rt = self._routing_tables[graph_name]
+                rt.replace(routing_table)
+                old_profiles.update(profile for profile in rt
+                                    if profile not in routing_table)
+            else:
+                self._routing_tables[graph_name] = routing_table
+            return old_profiles
 
     def set_broken(self, profile):
-        log.debug("Removing profile %r from router list", profile)
-        try:
-            self._routers.remove(profile)
-        except ValueError:
-            pass  # ignore
-        for graph_name, routing_table in self._routing_tables.items():
-            log.debug("Removing profile %r from routing table for %s", profile,
-                      _repr_graph_name(graph_name))
-            routing_table.remove(profile)
+        with self._lock:
+            log.debug("Removing profile %r from router list", profile)
+            try:
+                self._routers.remove(profile)
+            except ValueError:
+                pass  # ignore
+            for graph_name, routing_table in self._routing_tables.items():
+                log.debug("Removing profile %r from routing table for %s", profile,
+                          _repr_graph_name(graph_name))
+                routing_table.remove(profile)
 
     def set_updating(self, graph_name):
         try:
@@ -1577,10 +2512,11 @@ class Router(object):
 
 class RoutingTable(object):
 
-    def __init__(self, ro_runners=None, rw_runners=None, expiry_time=None):
+    def __init__(self, ro_runners=None, rw_runners=None, expiry_time=None, refresh_time=None):
         self._ro_runners = list(ro_runners or ())
         self._rw_runners = list(rw_runners or ())
         self._expiry_time = expiry_time or monotonic()
+        self._refresh_time = refresh_time or self._expiry_time
         self._update_lock = Lock()
 
     def __repr__(self):
@@ -1597,6 +2533,15 @@ class RoutingTable(object):
     def expiry_time(self):
         return self._expiry_time
 
+    @property
+    def refresh_time(self):
+        return self._refresh_time
+
+    def is_due(self):
+        """ True if this table should be refreshed ahead of expiry.
+        """
+        return monotonic() >= self._refresh_time
+
     def runners(self):
         """ Tuple of (ro_profiles, rw_profiles, expired=true/false)
         """
@@ -1617,7 +2562,10 @@ class RoutingTable(object):
         return self._update_lock.locked()
 
     def set_updating(self):
-        self._update_lock.acquire(False)
+        """ Set the update flag, returning true if it was not already
+        set by another caller.
+        """
+        return self._update_lock.acquire(False)
 
     def set_not_updating(self):
         self._update_lock.release()
@@ -1633,6 +2581,7 @@ class RoutingTable(object):
         self._ro_runners = routing_table._ro_runners
         self._rw_runners = routing_table._rw_runners
         self._expiry_time = routing_table._expiry_time
+        self._refresh_time = routing_table._refresh_time
         return (set(old_ro_runners) - set(self._ro_runners),
                 set(old_rw_runners) - set(self._rw_runners))
 
@@ -1647,6 +2596,8 @@ class TransactionRef(object):
         self.graph_name = graph_name
         self.txid = txid or uuid4()
         self.readonly = readonly
+        # Closing bookmark, set if committed by run_many
+        self.bookmark = None
         self.__broken = False
         self.__time_created = monotonic()
 
@@ -1731,11 +2682,153 @@ class Result(object):
         """
         raise NotImplementedError
 
+    def fetch(self):
+        """ Return the next record, retrieving more records from the
+        server first if the buffer is empty and the result is being
+        streamed. This method may carry out network activity.
+
+        :returns: record or :class:`None` if the result is exhausted
+        """
+        return self.take()
+
+    def discard(self):
+        """ Discard the remainder of the result, if it is still being
+        streamed. This method may carry out network activity.
+        """
+
+    def hydrate_with(self, hydrant):
+        """ Request that records are hydrated by the given hydrant as
+        they are decoded, rather than being hydrated separately after
+        they have been taken. Not all forms of result support this.
+
+        :param hydrant: :class:`.Hydrant` to use
+        :returns: :const:`True` if records taken from this result will
+            already be hydrated, :const:`False` otherwise
+        """
+        return False
+
 
 class Hydrant(object):
 
+    #: :class:`.IdentityMap` used to hydrate repeated occurrences of
+    #: an entity into a single object, or :const:`None` if every
+    #: occurrence should be hydrated separately.
+    identity_map = None
+
+    #: If :const:`True`, nodes and relationships are hydrated into
+    #: compact, read-only :class:`.FrozenNode` and
+    #: :class:`.FrozenRelationship` objects.
+    compact = False
+
     def hydrate_list(self, obj):
         raise NotImplementedError
 
     def dehydrate(self, data, version=None):
         raise NotImplementedError
+
+
+class IdentityMap(object):
+    """ Map of hydrated entities, keyed by entity type and identity.
+
+    When used by a hydrant, an identity map ensures that each node or
+    relationship received from the server is hydrated into the same
+    object as any previous occurrence of that entity, rather than
+    into a new object each time. This reduces the number of objects
+    created for results in which the same entities appear repeatedly,
+    such as paths through a common node. Entities referenced only as
+    the start or end of a relationship are also taken from the map
+    where possible, saving a round trip to the server to fill in
+    their details.
+
+    An identity map should only be used for entities from a single
+    graph, and is typically scoped to a single transaction.
+
+    :param max_size: maximum number of entities to hold, beyond which
+        the least recently used entities are evicted; if :const:`None`,
+        the map can grow without limit
+
+    *New in version 2021.2.*
+    """
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._entities = OrderedDict()
+
+    def __repr__(self):
+        return "<%s size=%d max_size=%r>" % (self.__class__.__name__,
+                                             len(self._entities), self._max_size)
+
+    def __len__(self):
+        return len(self._entities)
+
+    @property
+    def max_size(self):
+        """ The maximum number of entities held by this map, or
+        :const:`None` if unlimited.
+        """
+        return self._max_size
+
+    def node(self, graph, identity):
+        """ Return the node with a given identity, creating and
+        storing a new reference to that node if none exists.
+        """
+        node = self._get(Node, identity)
+        if node is None:
+            node = self._put(Node, identity, Node.ref(graph, identity))
+        return node
+
+    def relationship(self, graph, identity, start_node, r_type, end_node):
+        """ Return the relationship with a given identity, creating
+        and storing a new reference to that relationship if none
+        exists.
+        """
+        rel = self._get(Relationship, identity)
+        if rel is None:
+            rel = self._put(Relationship, identity,
+                            Relationship.ref(graph, identity, start_node, r_type, end_node))
+        return rel
+
+    def frozen_node(self, graph, identity, labels=None, properties=None):
+        """ Return the frozen node with a given identity, creating and
+        storing a new one if none exists. A stored node that was only
+        referenced as a relationship end, and so has no labels, is
+        replaced if labels are now available.
+        """
+        node = self._get(FrozenNode, identity)
+        if node is None or (node.labels is None and labels is not None):
+            node = self._put(FrozenNode, identity, FrozenNode(graph, identity, labels, properties))
+        return node
+
+    def frozen_relationship(self, graph, identity, start_node, r_type, end_node, properties=None):
+        """ Return the frozen relationship with a given identity,
+        creating and storing a new one if none exists.
+        """
+        rel = self._get(FrozenRelationship, identity)
+        if rel is None:
+            rel = self._put(FrozenRelationship, identity,
+                            FrozenRelationship(graph, identity, start_node, r_type, end_node, properties))
+        return rel
+
+    def clear(self):
+        """ Remove all entities from this map.
+        """
+        self._entities.clear()
+
+    def _get(self, entity_type, identity):
+        key = (entity_type, identity)
+        try:
+            entity = self._entities[key]
+        except KeyError:
+            return None
+        else:
+            if self._max_size is not None:
+                # Move this entity to the most recently used end.
+                self._entities[key] = self._entities.pop(key)
+            return entity
+
+    def _put(self, entity_type, identity, entity):
+        self._entities[(entity_type, identity)] = entity
+        if self._max_size is not None:
+            while len(self._entities) > self._max_size:
+                self._entities.popitem(last=False)
+        return entity
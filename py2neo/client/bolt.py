@@ -54,15 +54,16 @@ from collections import deque, namedtuple
 from io import BytesIO
 from itertools import islice
 from logging import getLogger
-from struct import pack as struct_pack, unpack as struct_unpack
+from struct import Struct, pack as struct_pack, unpack_from as struct_unpack_from
 
-from six import PY2, raise_from
+from six import PY2, raise_from, text_type
 
-from interchange.packstream import pack, unpack, Structure, Packer
+from interchange.packstream import pack, unpack, Structure, Packer, Unpacker
+from monotonic import monotonic
 
 from py2neo import ConnectionProfile
 from py2neo.client import bolt_user_agent, Connection, Hydrant, TransactionRef, Result, Bookmark
-from py2neo.data import Node, Relationship, Path
+from py2neo.data import Node, Relationship, Path, FrozenNode, FrozenRelationship
 from py2neo.errors import (Neo4jError,
                            ConnectionUnavailable,
                            ConnectionBroken,
@@ -76,13 +77,239 @@ BOLT_SIGNATURE = b"\x60\x60\xB0\x17"
 log = getLogger(__name__)
 
 
+#: Protocol version proposals for Bolt 4.x, each given as a 2-tuple
+#: of the bytes sent during the handshake and a description for the
+#: log. These are shared by the synchronous and asynchronous clients.
+BOLT_4X_PROPOSALS = (
+    (b"\x00\x03\x03\x04", "4.3~4.0"),  # Neo4j 4.3.x and Neo4j 4.2, 4.1, 4.0 (patched)
+    (b"\x00\x00\x00\x04", "4.0"),      # Neo4j 4.2, 4.1, 4.0 (unpatched)
+)
+
+
+def write_handshake(wire, proposals):
+    """ Write the Bolt signature and up to four protocol version
+    proposals to a wire, without sending them.
+
+    :param wire: the wire to write to
+    :param proposals: sequence of (bytes, description) proposals
+    """
+    local_port = wire.local_address.port_number
+    log.debug("[#%04X] C: <BOLT>", local_port)
+    wire.write(BOLT_SIGNATURE)
+    log.debug("[#%04X] C: <PROTOCOL> %s", local_port,
+              " | ".join(description for _, description in proposals))
+    wire.write(b"".join(data for data, _ in proposals).ljust(16, b"\x00"))
+
+
+def agreed_version(wire, data):
+    """ Return the protocol version agreed by the server in reply to
+    a handshake.
+
+    :param wire: the wire over which the handshake was carried out
+    :param data: the four bytes received in reply
+    :returns: 2-tuple of (major, minor) version numbers
+    :raises TypeError: if no version could be agreed
+    """
+    v = bytearray(data)
+    if v == bytearray([0, 0, 0, 0]):
+        raise TypeError("Unable to negotiate compatible protocol version")
+    log.debug("[#%04X] S: <PROTOCOL> %d.%d", wire.local_address.port_number, v[-1], v[-2])
+    return v[-1], v[-2]
+
+
 unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
 
 
+_unpack_u16 = Struct(">H").unpack_from
+_unpack_u32 = Struct(">I").unpack_from
+_unpack_i8 = Struct(">b").unpack_from
+_unpack_i16 = Struct(">h").unpack_from
+_unpack_i32 = Struct(">i").unpack_from
+_unpack_i64 = Struct(">q").unpack_from
+_unpack_f64 = Struct(">d").unpack_from
+
+
+class StructureUnpacker(Unpacker):
+    """ General-purpose PackStream unpacker, used by
+    :func:`.unpack_record` for structures that it does not decode
+    itself. This extends the base unpacker to also accept the
+    STRUCT_8 and STRUCT_16 markers, used for structures of more
+    than fifteen fields.
+    """
+
+    def unpack(self):
+        marker = self._data[self._offset]
+        if marker == 0xDC:  # STRUCT_8
+            self._offset += 1
+            size = self._read_u8()
+        elif marker == 0xDD:  # STRUCT_16
+            self._offset += 1
+            size = self._read_u16be()
+        else:
+            return super(StructureUnpacker, self).unpack()
+        # No temporal or spatial structure has this many fields, so
+        # there is nothing here to hydrate.
+        tag = self._read_u8()
+        fields = [self.unpack() for _ in range(size)]
+        return Structure(tag, *fields)
+
+    def unpack_value(self):
+        """ Unpack the next value from the data.
+
+        :returns: 2-tuple of the value and the offset immediately
+            following it
+        """
+        value = self.unpack()
+        return value, self._offset
+
+
+def unpack_record(data, handlers=None):
+    """ Unpack the fields of a RECORD message.
+
+    This is a specialised alternative to the general-purpose
+    PackStream unpacker, tuned for the values that make up the bulk
+    of most results. Each value is decoded by a function looked up
+    from a table indexed by marker byte, reading directly from the
+    message data. Temporal and spatial values are rare in comparison,
+    and are handed over to the general-purpose unpacker.
+
+    Structures can be hydrated as they are decoded by passing a
+    dictionary of handlers, keyed by structure tag. Each handler is
+    called with the decoded fields of a structure, and its return
+    value used in place of that structure.
+
+    :param data: RECORD message data, including the two-byte header
+    :param handlers: dictionary of structure handlers
+    :returns: list of message fields, as would be returned by
+        `list(unpack(data, offset=2))` if no handlers are given
+    """
+    value, _ = _unpack_value(data, 2, handlers or {})
+    return [value]
+
+
+def _unpack_value(data, p, h):
+    marker = data[p]
+    p += 1
+    if marker < 0x80:
+        return marker, p
+    elif marker >= 0xF0:
+        return marker - 0x100, p
+    else:
+        return _value_unpackers[marker](data, p, marker, h)
+
+
+def _unpack_items(data, p, size, h):
+    items = []
+    for _ in range(size):
+        marker = data[p]
+        if marker < 0x80:
+            items.append(marker)
+            p += 1
+        else:
+            item, p = _value_unpackers[marker](data, p + 1, marker, h)
+            items.append(item)
+    return items, p
+
+
+def _unpack_entries(data, p, size, h):
+    entries = {}
+    for _ in range(size):
+        key, p = _unpack_value(data, p, h)
+        entries[key], p = _unpack_value(data, p, h)
+    return entries, p
+
+
+def _unpack_string(data, p, size):
+    q = p + size
+    return text_type(data[p:q], "utf-8"), q
+
+
+def _unpack_bytes(data, p, size):
+    q = p + size
+    return bytes(data[p:q]), q
+
+
+def _unpack_structure(data, start, p, size, h):
+    # The structure marker is found at `start` and its tag at `p`,
+    # with any size bytes in between.
+    tag = data[p]
+    try:
+        handler = h[tag]
+    except KeyError:
+        if tag in (78, 80, 82, 114):
+            fields, p = _unpack_items(data, p + 1, size, h)
+            return Structure(tag, *fields), p
+        else:
+            return StructureUnpacker(data, start).unpack_value()
+    else:
+        fields, p = _unpack_items(data, p + 1, size, h)
+        return handler(*fields), p
+
+
+def _unpack_unknown(data, p, marker, h):
+    raise ValueError("Unknown PackStream marker %02X" % marker)
+
+
+def _build_value_unpackers():
+    unpackers = [_unpack_unknown] * 0x100
+    for marker in range(0x80, 0x90):
+        unpackers[marker] = lambda data, p, m, h: _unpack_string(data, p, m & 0x0F)
+    for marker in range(0x90, 0xA0):
+        unpackers[marker] = lambda data, p, m, h: _unpack_items(data, p, m & 0x0F, h)
+    for marker in range(0xA0, 0xB0):
+        unpackers[marker] = lambda data, p, m, h: _unpack_entries(data, p, m & 0x0F, h)
+    for marker in range(0xB0, 0xC0):
+        unpackers[marker] = lambda data, p, m, h: _unpack_structure(data, p - 1, p, m & 0x0F, h)
+    unpackers[0xC0] = lambda data, p, m, h: (None, p)
+    unpackers[0xC1] = lambda data, p, m, h: (_unpack_f64(data, p)[0], p + 8)
+    unpackers[0xC2] = lambda data, p, m, h: (False, p)
+    unpackers[0xC3] = lambda data, p, m, h: (True, p)
+    unpackers[0xC8] = lambda data, p, m, h: (_unpack_i8(data, p)[0], p + 1)
+    unpackers[0xC9] = lambda data, p, m, h: (_unpack_i16(data, p)[0], p + 2)
+    unpackers[0xCA] = lambda data, p, m, h: (_unpack_i32(data, p)[0], p + 4)
+    unpackers[0xCB] = lambda data, p, m, h: (_unpack_i64(data, p)[0], p + 8)
+    unpackers[0xCC] = lambda data, p, m, h: _unpack_bytes(data, p + 1, data[p])
+    unpackers[0xCD] = lambda data, p, m, h: _unpack_bytes(data, p + 2, _unpack_u16(data, p)[0])
+    unpackers[0xCE] = lambda data, p, m, h: _unpack_bytes(data, p + 4, _unpack_u32(data, p)[0])
+    unpackers[0xD0] = lambda data, p, m, h: _unpack_string(data, p + 1, data[p])
+    unpackers[0xD1] = lambda data, p, m, h: _unpack_string(data, p + 2, _unpack_u16(data, p)[0])
+    unpackers[0xD2] = lambda data, p, m, h: _unpack_string(data, p + 4, _unpack_u32(data, p)[0])
+    unpackers[0xD4] = lambda data, p, m, h: _unpack_items(data, p + 1, data[p], h)
+    unpackers[0xD5] = lambda data, p, m, h: _unpack_items(data, p + 2, _unpack_u16(data, p)[0], h)
+    unpackers[0xD6] = lambda data, p, m, h: _unpack_items(data, p + 4, _unpack_u32(data, p)[0], h)
+    unpackers[0xD8] = lambda data, p, m, h: _unpack_entries(data, p + 1, data[p], h)
+    unpackers[0xD9] = lambda data, p, m, h: _unpack_entries(data, p + 2, _unpack_u16(data, p)[0], h)
+    unpackers[0xDA] = lambda data, p, m, h: _unpack_entries(data, p + 4, _unpack_u32(data, p)[0], h)
+    unpackers[0xDC] = lambda data, p, m, h: _unpack_structure(data, p - 1, p + 1, data[p], h)
+    unpackers[0xDD] = lambda data, p, m, h: _unpack_structure(data, p - 1, p + 2, _unpack_u16(data, p)[0], h)
+    for marker in range(0xF0, 0x100):
+        unpackers[marker] = lambda data, p, m, h: (m - 0x100, p)
+    return unpackers
+
+
+_value_unpackers = _build_value_unpackers()
+
+
 class PackStreamHydrant(Hydrant):
 
-    def __init__(self, graph):
+    def __init__(self, graph, identity_map=None, compact=False):
         self.graph = graph
+        self.identity_map = identity_map
+        self.compact = compact
+        if compact:
+            self.structure_handlers = {
+                78: self._hydrate_frozen_node,
+                82: self._hydrate_frozen_relationship,
+                80: self._hydrate_unpacked_path,
+                114: unbound_relationship,
+            }
+        else:
+            self.structure_handlers = {
+                78: self._hydrate_node,
+                82: self._hydrate_relationship,
+                80: self._hydrate_unpacked_path,
+                114: unbound_relationship,
+            }
 
     def hydrate_list(self, obj):
         for i, value in enumerate(obj):
@@ -108,31 +335,51 @@ class PackStreamHydrant(Hydrant):
 
     def hydrate_structure(self, obj):
         tag = obj.tag
-        if tag == 78:
-            return self._hydrate_node(*obj.fields)
-        elif tag == 82:
-            return self._hydrate_relationship(*obj.fields)
+        if tag == 78 or tag == 82:
+            return self.structure_handlers[tag](*obj.fields)
         elif tag == 80:
             return self._hydrate_path(*obj.fields)
         else:
             return obj
 
     def _hydrate_node(self, identity, labels, properties):
-        node = Node.ref(self.graph, identity)
-        node.clear_labels()
-        node.update_labels(labels)
-        node.clear()
-        node.update(properties)
+        if self.identity_map is None:
+            node = Node.ref(self.graph, identity)
+        else:
+            node = self.identity_map.node(self.graph, identity)
+        node._load_labels(labels)
+        node._load_properties(properties)
         return node
 
     def _hydrate_relationship(self, identity, start_node_id, end_node_id, r_type, properties):
-        start_node = Node.ref(self.graph, start_node_id)
-        end_node = Node.ref(self.graph, end_node_id)
-        rel = Relationship.ref(self.graph, identity, start_node, r_type, end_node)
-        rel.clear()
-        rel.update(properties)
+        if self.identity_map is None:
+            start_node = Node.ref(self.graph, start_node_id)
+            end_node = Node.ref(self.graph, end_node_id)
+            rel = Relationship.ref(self.graph, identity, start_node, r_type, end_node)
+        else:
+            start_node = self.identity_map.node(self.graph, start_node_id)
+            end_node = self.identity_map.node(self.graph, end_node_id)
+            rel = self.identity_map.relationship(self.graph, identity, start_node, r_type, end_node)
+        rel._load_properties(properties)
         return rel
 
+    def _hydrate_frozen_node(self, identity, labels, properties):
+        if self.identity_map is None:
+            return FrozenNode(self.graph, identity, labels, properties)
+        else:
+            return self.identity_map.frozen_node(self.graph, identity, labels, properties)
+
+    def _hydrate_frozen_relationship(self, identity, start_node_id, end_node_id, r_type, properties):
+        if self.identity_map is None:
+            start_node = FrozenNode(self.graph, start_node_id)
+            end_node = FrozenNode(self.graph, end_node_id)
+            return FrozenRelationship(self.graph, identity, start_node, r_type, end_node, properties)
+        else:
+            start_node = self.identity_map.frozen_node(self.graph, start_node_id)
+            end_node = self.identity_map.frozen_node(self.graph, end_node_id)
+            return self.identity_map.frozen_relationship(self.graph, identity, start_node,
+                                                         r_type, end_node, properties)
+
     def _hydrate_path(self, nodes, relationships, sequence):
         nodes = [self._hydrate_node(n_id, n_label, n_properties)
                  for n_id, n_label, n_properties in nodes]
@@ -140,106 +387,133 @@ class PackStreamHydrant(Hydrant):
         for r_id, r_type, r_properties in relationships:
             u_rel = unbound_relationship(r_id, r_type, r_properties)
             u_rels.append(u_rel)
-        return Path.hydrate(self.graph, nodes, u_rels, sequence)
+        return Path.hydrate(self.graph, nodes, u_rels, sequence, self.identity_map)
+
+    def _hydrate_unpacked_path(self, nodes, u_rels, sequence):
+        # Used as a structure handler, in which case the nodes and
+        # unbound relationships have already been hydrated. Paths are
+        # always made up of full entities, so any frozen nodes need
+        # to be converted.
+        if self.compact:
+            nodes = [self._hydrate_node(node.identity, node.labels, node) for node in nodes]
+        return Path.hydrate(self.graph, nodes, u_rels, sequence, self.identity_map)
 
 
 class BoltMessageReader(object):
+    """ Reader for chunked Bolt messages.
+
+    Rather than reading each chunk header and body from the wire
+    separately, the reader scans all data currently buffered in a
+    single pass, splitting out every complete message found. These
+    are then unpacked together and queued, so that a stream of small
+    RECORD messages costs one scan per buffer fill instead of two
+    wire reads per chunk.
+    """
 
     def __init__(self, wire):
         self.wire = wire
-        if PY2:
-            self.read_message = self.read_message_py2
+        self._messages = deque()
 
     def read_message(self):
-        chunks = []
-        while True:
-            try:
-                hi, lo = self.wire.read(2)
-            except WireError as error:
-                raise_from(ConnectionBroken("Failed to read message"), error)
-            else:
-                if hi == lo == 0:
-                    # We hit a zero chunk...
-                    if chunks:
-                        # ... and some non-zero chunks have been collected,
-                        # therefore we can exit the loop with a message.
-                        break
-                    else:
-                        # ... and no non-zero chunks have yet been collected,
-                        # therefore, this must be a null message used for
-                        # keep-alive and we should carry on looping.
-                        pass
-                else:
-                    # We found a non-zero chunk which can be collected.
-                    size = hi << 8 | lo
-                    chunks.append(self.wire.read(size))
-        message = b"".join(chunks)
-        assert message  # the message should never be empty
-        _, n = divmod(message[0], 0x10)
-        try:
-            fields = list(unpack(message, offset=2))
-        except ValueError as error:
-            raise_from(ProtocolError("Bad message content"), error)
+        """ Return the next message, reading more data from the wire
+        if no complete messages are already buffered.
+
+        :returns: 2-tuple of (tag, fields)
+        """
+        if not self._messages:
+            self._read_messages()
+        return self._messages.popleft()
+
+    def peek_message(self):
+        """ If another complete message has already been read, return
+        the tag for that message, otherwise return `None`.
+        """
+        if self._messages:
+            return self._messages[0][0]
         else:
-            return message[1], fields
+            return None
 
-    def read_message_py2(self):
-        chunks = []
+    def _read_messages(self):
+        """ Read and unpack all complete messages available, waiting
+        for more data from the network until at least one exists.
+        """
         while True:
+            messages, used, required = self._split_messages(self.wire.peek())
             try:
-                hi, lo = self.wire.read(2)
+                if messages:
+                    self.wire.read(used)
+                    break
+                else:
+                    self.wire.fill(required)
             except WireError as error:
                 raise_from(ConnectionBroken("Failed to read message"), error)
+        self._queue_messages(messages)
+
+    def _queue_messages(self, messages):
+        """ Unpack and queue messages split out of the buffered data.
+        """
+        for message in messages:
+            tag = message[1]
+            if tag == 0x71:
+                # RECORD messages are left packed until taken from
+                # their result, at which point they can be unpacked
+                # and hydrated in a single pass.
+                self._messages.append((tag, [message]))
+                continue
+            try:
+                fields = list(unpack(message, offset=2))
+            except ValueError as error:
+                raise_from(ProtocolError("Bad message content"), error)
             else:
-                if hi == lo == 0:
-                    # We hit a zero chunk...
-                    if chunks:
-                        # ... and some non-zero chunks have been collected,
-                        # therefore we can exit the loop with a message.
-                        break
-                    else:
-                        # ... and no non-zero chunks have yet been collected,
-                        # therefore, this must be a null message used for
-                        # keep-alive and we should carry on looping.
-                        pass
-                else:
-                    # We found a non-zero chunk which can be collected.
-                    size = hi << 8 | lo
-                    chunks.append(self.wire.read(size))
-        message = bytearray(b"".join(map(bytes, chunks)))
-        assert message  # the message should never be empty
-        _, n = divmod(message[0], 0x10)
-        try:
-            fields = list(unpack(message, offset=2))
-        except ValueError as error:
-            raise_from(ProtocolError("Bad message content"), error)
-        else:
-            return message[1], fields
+                self._messages.append((tag, fields))
 
-    def peek_message(self):
-        """ If another complete message exists, return the tag for
-        that message, otherwise return `None`.
+    @classmethod
+    def _split_messages(cls, data):
+        """ Scan buffered data for complete messages.
+
+        :returns: 3-tuple of (list of messages, number of bytes used by
+            those messages, number of bytes required to make progress
+            if no messages were found)
         """
-        data = self.wire.peek()
+        messages = []
+        chunks = []
+        end = len(data)
+        used = 0
         p = 0
-
-        def peek_chunk():
+        while True:
             q = p + 2
-            if q < len(data):
-                size, = struct_unpack(">H", data[p:q])
+            if q > end:
+                return messages, used, q
+            size, = struct_unpack_from(">H", data, p)
+            if size == 0:
+                # We hit a zero chunk...
+                if chunks:
+                    # ... and some non-zero chunks have been
+                    # collected, therefore we have a message.
+                    messages.append(cls._join(chunks))
+                    chunks = []
+                # Otherwise this must be a null message used for
+                # keep-alive and can be skipped over. Either way,
+                # the data read so far is no longer required.
+                used = p = q
+            else:
+                # We found a non-zero chunk which can be collected.
                 r = q + size
-                if r < len(data):
-                    return size
-            return -1
+                if r > end:
+                    return messages, used, r
+                chunks.append(data[q:r])
+                p = r
 
-        while True:
-            chunk_size = peek_chunk()
-            if chunk_size == -1:
-                return None
-            elif chunk_size == 0:
-                return data[3]
-            else:
-                p += 2 + chunk_size
+    @staticmethod
+    def _join(chunks):
+        if PY2:
+            return bytearray(b"".join(chunk.tobytes() for chunk in chunks))
+        elif len(chunks) == 1:
+            # Most messages fit into a single chunk, in which case
+            # the view onto the buffered data can be unpacked directly.
+            return chunks[0]
+        else:
+            return b"".join(chunks)
 
 
 class BoltMessageWriter(object):
@@ -305,8 +579,8 @@ class Bolt(Connection):
         raise TypeError("Unsupported protocol version %d.%d" % protocol_version)
 
     @classmethod
-    def default_hydrant(cls, profile, graph):
-        return PackStreamHydrant(graph)
+    def default_hydrant(cls, profile, graph, identity_map=None, compact=False):
+        return PackStreamHydrant(graph, identity_map, compact)
 
     @classmethod
     def _proposed_versions(cls, data, offset=0):
@@ -321,7 +595,7 @@ class Bolt(Connection):
 
     @classmethod
     def accept(cls, wire, min_protocol_version=None):
-        data = wire.read(20)
+        data = bytearray(wire.read(20))
         if data[0:4] != BOLT_SIGNATURE:
             raise ProtocolError("Incoming connection did not provide Bolt signature")
         for major, minor in cls._proposed_versions(data, offset=4):
@@ -377,20 +651,12 @@ class Bolt(Connection):
 
     @classmethod
     def _handshake(cls, wire):
-        local_port = wire.local_address.port_number
-        log.debug("[#%04X] C: <BOLT>", local_port)
-        wire.write(BOLT_SIGNATURE)
-        log.debug("[#%04X] C: <PROTOCOL> 4.3~4.0 | 4.0 | 3.0 | 2.0", local_port)
-        wire.write(b"\x00\x03\x03\x04"      # Neo4j 4.3.x and Neo4j 4.2, 4.1, 4.0 (patched)
-                   b"\x00\x00\x00\x04"      # Neo4j 4.2, 4.1, 4.0 (unpatched)
-                   b"\x00\x00\x00\x03"      # Neo4j 3.5.x
-                   b"\x00\x00\x00\x02")     # Neo4j 3.4.x
+        write_handshake(wire, BOLT_4X_PROPOSALS + (
+            (b"\x00\x00\x00\x03", "3.0"),  # Neo4j 3.5.x
+            (b"\x00\x00\x00\x02", "2.0"),  # Neo4j 3.4.x
+        ))
         wire.send()
-        v = bytearray(wire.read(4))
-        if v == bytearray([0, 0, 0, 0]):
-            raise TypeError("Unable to negotiate compatible protocol version")
-        log.debug("[#%04X] S: <PROTOCOL> %d.%d", local_port, v[-1], v[-2])
-        return v[-1], v[-2]
+        return agreed_version(wire, wire.read(4))
 
     def __init__(self, wire, profile, on_release=None):
         super(Bolt, self).__init__(profile, on_release=on_release)
@@ -479,6 +745,14 @@ class Bolt1(Bolt):
         self._responses = deque()
         self._transaction = None
         self._metadata = {}
+        # Set on receipt of a FAILURE, after which the server
+        # will ignore all requests until a RESET is sent.
+        self._failed = False
+        # Round-trip timing, from the sending of synchronous requests
+        # to the receipt of the first reply.
+        self._sync_started = None
+        self._latency_total = 0.0
+        self._latency_count = 0
 
     @property
     def transaction(self):
@@ -503,13 +777,35 @@ class Bolt1(Bolt):
         if not self.server_agent.startswith("Neo4j/"):
             raise ProtocolError("Unexpected server agent {!r}".format(self.server_agent))
 
+    def take_latency(self):
+        count = self._latency_count
+        if count == 0:
+            return None
+        latency = self._latency_total / count
+        self._latency_total = 0.0
+        self._latency_count = 0
+        return latency
+
+    @property
+    def clean(self):
+        """ True if this connection is in a clean state, with no
+        transaction open, no responses outstanding and no failure
+        since the last reset. A clean connection can be reused
+        without being reset.
+        """
+        return not (self._failed or self._transaction or self._responses)
+
     def reset(self, force=False):
         self._assert_open()
-        if force or self._transaction:
+        if force or not self.clean:
             response = self.append_message(0x0F, vital=True)
             self._sync(response)
             self._audit(response)
             self._transaction = None
+            self._failed = False
+            return True
+        else:
+            return False
 
     def _set_transaction(self, graph_name=None, readonly=False, after=None, metadata=None, timeout=None):
         self._assert_open()
@@ -602,13 +898,54 @@ class Bolt1(Bolt):
         self._transaction.append(result, final=final)
         return result
 
-    def pull(self, result, n=-1, capacity=-1):
+    def run_many(self, tx, queries, commit=False, discard=False):
         self._assert_open()
-        self._assert_result_consumable(result)
-        if n != -1:
-            raise IndexError("Flow control is not available in this version of Neo4j")
-        response = self.append_message(0x3F, capacity=capacity)
-        result.append(response, final=True)
+        if tx is None:
+            raise ValueError("Transaction is None")
+        self._assert_transaction_open(tx)
+        results = []
+        responses = []
+        for cypher, parameters in queries:
+            result = self._run(tx.graph_name, cypher, parameters or {})
+            results.append(result)
+            if discard:
+                responses.append(self._append_discard(result, -1))
+            else:
+                responses.append(self._append_pull(result, -1))
+        commit_response = self._append_commit() if commit else None
+        try:
+            # Send every RUN and PULL or DISCARD (and the COMMIT, if
+            # there is one) at once, then wait for all of the responses.
+            # If one query fails, the server ignores those that follow,
+            # and the failure is raised from the transaction audit.
+            if commit_response is None:
+                self._sync(*responses)
+            else:
+                self._sync(*(responses + [commit_response]))
+        except BrokenWireError as error:
+            tx.mark_broken()
+            raise_from(ConnectionBroken("Transaction broken by disconnection "
+                                        "during pipelined run"), error)
+        for result, response in zip(results, responses):
+            self._end_pull(result, response)
+        if commit_response is not None:
+            # The transaction is only marked complete now, so that
+            # the connection is not released until this final audit.
+            tx.set_complete()
+            self._audit_begin(tx)
+            try:
+                self._audit(commit_response)
+            except Neo4jError as error:
+                tx.mark_broken()
+                raise_from(ConnectionBroken("Failed to commit transaction"), error)
+            else:
+                tx.bookmark = Bookmark(commit_response.metadata.get("bookmark"))
+        elif commit:
+            tx.bookmark = self.commit(tx)
+        return results
+
+    def pull(self, result, n=-1, capacity=-1):
+        response = self._append_pull(result, n, capacity)
         try:
             self._sync(response)
         except BrokenWireError as error:
@@ -617,14 +954,53 @@ class Bolt1(Bolt):
             raise_from(ConnectionBroken("Transaction broken by disconnection "
                                         "during pull"), error)
         else:
-            self._audit(self._transaction)
+            self._end_pull(result, response)
             return response
 
-    def discard(self, result):
+    def _append_pull(self, result, n, capacity=-1):
+        """ Queue a PULL for a result, without sending it.
+        """
         self._assert_open()
         self._assert_result_consumable(result)
+        if n != -1:
+            raise IndexError("Flow control is not available in this version of Neo4j")
+        response = self.append_message(0x3F, capacity=capacity)
+        result.append(response, final=True)
+        return response
+
+    def _end_pull(self, result, response):
+        self._audit(self._transaction)
+
+    def _append_commit(self):
+        """ Queue a COMMIT, without sending it, and return the
+        response. If this protocol version cannot pipeline a COMMIT,
+        :const:`None` is returned instead.
+        """
+        return None
+
+    def _audit_begin(self, tx):
+        """ Raise the failure of a deferred BEGIN as-is, if there was
+        one, rather than reporting it as a failure of the request
+        that followed.
+        """
+        response = tx.begin_response
+        if response is not None and response.failed():
+            tx.mark_broken()
+            self._audit(response)
+
+    def _append_discard(self, result, qid=-1):
+        """ Queue a DISCARD for the remainder of a result, without
+        sending it. The `qid` is ignored, as random query access is
+        not supported before Bolt 4.0.
+        """
         response = self.append_message(0x2F)
         result.append(response, final=True)
+        return response
+
+    def discard(self, result):
+        self._assert_open()
+        self._assert_result_consumable(result)
+        response = self._append_discard(result)
         try:
             self._sync(response)
         except BrokenWireError as error:
@@ -768,12 +1144,17 @@ class Bolt1(Bolt):
         failed state into an exception.
         """
         tag, fields = self.read_message()
+        if self._sync_started is not None:
+            self._latency_total += monotonic() - self._sync_started
+            self._latency_count += 1
+            self._sync_started = None
         if tag == 0x70:
             self._responses.popleft().set_success(**fields[0])
             self._metadata.update(fields[0])
         elif tag == 0x71:
             self._responses[0].add_records(fields)
         elif tag == 0x7F:
+            self._failed = True
             rs = self._responses.popleft()
             rs.set_failure(**fields[0])
             if rs.vital:
@@ -795,6 +1176,9 @@ class Bolt1(Bolt):
             self._fetch()
 
     def _sync(self, *responses):
+        # Only synchronous requests are timed, as the replies to
+        # requests sent ahead of time may not be read straight away.
+        self._sync_started = monotonic()
         self.send()
         for response in responses:
             self._wait(response)
@@ -894,21 +1278,21 @@ class Bolt3(Bolt2):
         self._transaction = BoltTransactionRef(self, graph_name, readonly,
                                                # after, metadata, timeout
                                                )
-        response = self.append_message(0x11, self._transaction.extra)
-        try:
-            self._sync(response)
-        except BrokenWireError as error:
-            raise_from(ConnectionBroken("Transaction could not begin "
-                                        "due to disconnection"), error)
-        else:
-            self._audit(self._transaction)
-            return self._transaction
+        # The BEGIN is not sent straight away, but along with the
+        # first request made within the transaction. A failure to
+        # begin, such as for an unknown database or a lack of access,
+        # is therefore not raised here, but by that first request
+        # (which may be the COMMIT or ROLLBACK of an empty
+        # transaction). It is raised as-is, not as a failure of that
+        # request.
+        self._transaction.begin_response = self.append_message(0x11, self._transaction.extra)
+        return self._transaction
 
     def commit(self, tx):
         self._assert_open()
         self._assert_transaction_open(tx)
         self._transaction.set_complete()
-        response = self.append_message(0x12)
+        response = self._append_commit()
         try:
             self._sync(response)
         except BrokenWireError as error:
@@ -916,6 +1300,7 @@ class Bolt3(Bolt2):
             raise_from(ConnectionBroken("Transaction broken by disconnection "
                                         "during commit"), error)
         else:
+            self._audit_begin(tx)
             try:
                 self._audit(self._transaction)
             except Neo4jError as error:
@@ -936,6 +1321,7 @@ class Bolt3(Bolt2):
             raise_from(ConnectionBroken("Transaction broken by disconnection "
                                         "during rollback"), error)
         else:
+            self._audit_begin(tx)
             try:
                 self._audit(self._transaction)
             except Neo4jError as error:
@@ -950,26 +1336,20 @@ class Bolt3(Bolt2):
         self._transaction.append(result, final=final)
         return result
 
+    def _append_commit(self):
+        return self.append_message(0x12)
 
-class Bolt4x0(Bolt3):
 
-    protocol_version = (4, 0)
+class Bolt4xProtocol(object):
+    """ Request building and response bookkeeping for Bolt 4.x,
+    shared by the :class:`.Bolt4x0` family of connection classes and
+    by the asynchronous :class:`~py2neo.aio.AsyncBolt`.
 
-    messages = {
-        0x01: "HELLO",
-        0x02: "GOODBYE",
-        0x0F: "RESET",
-        0x10: "RUN",
-        0x11: "BEGIN",
-        0x12: "COMMIT",
-        0x13: "ROLLBACK",
-        0x2F: "DISCARD",
-        0x3F: "PULL",
-        0x70: "SUCCESS",
-        0x71: "RECORD",
-        0x7E: "IGNORED",
-        0x7F: "FAILURE",
-    }
+    None of these methods carry out any network activity. Requests
+    are queued by the :meth:`append_message` method of the connection
+    class, which is also responsible for sending those requests and
+    for waiting for the responses.
+    """
 
     def _assert_result_consumable(self, result):
         try:
@@ -986,12 +1366,91 @@ class Bolt4x0(Bolt3):
         else:
             raise IndexError("Result is fully consumed")
 
-    def pull(self, result, n=-1, capacity=-1):
+    def _append_pull(self, result, n, capacity=-1):
+        """ Queue a PULL for a result, without sending it.
+        """
         self._assert_open()
         qid = self._assert_result_consumable(result)
         args = {"n": n, "qid": qid}
         response = self.append_message(0x3F, args, capacity=capacity)
         result.append(response, final=(n == -1))
+        result.fetch_size = n
+        return response
+
+    def _append_discard(self, result, qid):
+        """ Queue a DISCARD for the remainder of a result, without
+        sending it.
+        """
+        response = self.append_message(0x2F, {"n": -1, "qid": qid})
+        result.append(response, final=True)
+        return response
+
+    def _append_discards(self, tx):
+        """ Queue a DISCARD for each result in a transaction that is
+        still being streamed. These will be sent along with the next
+        request, which will typically be a COMMIT or ROLLBACK. Any
+        PULL sent ahead of time for these results must already have
+        been answered.
+        """
+        for result in tx.items():
+            if not result.complete():
+                self._append_discard(result, -1 if result is tx.last() else tx.index(result))
+
+    def _pull_ahead(self, result):
+        """ Queue a PULL for the next batch of a streamed result, if
+        the last batch requested has arrived in full and the server
+        has more records. This allows that batch to be transferred
+        while the current one is still being consumed.
+
+        :returns: true if a PULL was queued, and should be sent
+        """
+        response = result.last()
+        if response.done() and response.metadata.get("has_more"):
+            self._append_pull(result, result.fetch_size)
+            return True
+        else:
+            return False
+
+    def _pending_pull(self, result):
+        """ Return the response for the last PULL sent for a result,
+        or :const:`None` if no such PULL is outstanding.
+        """
+        response = result.last()
+        if response is result.header() or result.complete():
+            return None
+        else:
+            return response
+
+    def _settle_pull(self, result, response):
+        """ Mark a result as complete, if the server has sent the last
+        batch of records in response to a PULL.
+        """
+        if response.done() and not response.metadata.get("has_more"):
+            result.set_complete()
+
+
+class Bolt4x0(Bolt4xProtocol, Bolt3):
+
+    protocol_version = (4, 0)
+
+    messages = {
+        0x01: "HELLO",
+        0x02: "GOODBYE",
+        0x0F: "RESET",
+        0x10: "RUN",
+        0x11: "BEGIN",
+        0x12: "COMMIT",
+        0x13: "ROLLBACK",
+        0x2F: "DISCARD",
+        0x3F: "PULL",
+        0x70: "SUCCESS",
+        0x71: "RECORD",
+        0x7E: "IGNORED",
+        0x7F: "FAILURE",
+    }
+
+    def pull(self, result, n=-1, capacity=-1):
+        response = self._append_pull(result, n, capacity)
         try:
             self._sync(response)
         except BrokenWireError as error:
@@ -999,15 +1458,30 @@ class Bolt4x0(Bolt3):
             raise_from(ConnectionBroken("Transaction broken by disconnection "
                                         "during pull"), error)
         else:
-            self._audit(self._transaction)
+            self._end_pull(result, response)
             return response
 
+    def fetch(self, result):
+        record = result.take()
+        if result.fetch_size > 0 and not result.complete():
+            if self._pull_ahead(result):
+                self.send()
+            elif result.last().done():
+                self._end_pull(result, result.last())
+                return record
+            if record is None:
+                self._wait_for_pull(result)
+                record = result.take()
+        return record
+
     def discard(self, result):
         self._assert_open()
-        qid = self._assert_result_consumable(result)
-        args = {"n": -1, "qid": qid}
-        response = self.append_message(0x2F, args)
-        result.append(response, final=True)
+        self._wait_for_pull(result)
+        if result.complete():
+            # The outstanding pull exhausted the result, so
+            # there is nothing left to discard.
+            return None
+        response = self._append_discard(result, self._assert_result_consumable(result))
         try:
             self._sync(response)
         except BrokenWireError as error:
@@ -1018,9 +1492,52 @@ class Bolt4x0(Bolt3):
             self._audit(self._transaction)
             return response
 
+    def commit(self, tx):
+        self._assert_open()
+        self._assert_transaction_open(tx)
+        self._discard_open_results(tx)
+        return super(Bolt4x0, self).commit(tx)
+
+    def rollback(self, tx):
+        self._assert_open()
+        self._assert_transaction_open(tx)
+        self._discard_open_results(tx)
+        return super(Bolt4x0, self).rollback(tx)
+
     def route(self, graph_name=None, context=None):
         return self._route4(graph_name, context)
 
+    def _end_pull(self, result, response):
+        # The result must be settled before the audit, as that may
+        # release the connection once the transaction is done.
+        self._settle_pull(result, response)
+        self._audit(self._transaction)
+
+    def _wait_for_pull(self, result):
+        """ Wait for the outstanding PULL for a result to be answered,
+        if one has been sent ahead of time.
+        """
+        response = self._pending_pull(result)
+        if response is None:
+            return
+        if not response.done():
+            # The PULL may not have been sent yet, if queueing later
+            # requests in the same batch failed, so send it first.
+            self.send()
+            try:
+                self._wait(response)
+            except BrokenWireError as error:
+                result.transaction.mark_broken()
+                raise_from(ConnectionBroken("Transaction broken by disconnection "
+                                            "during pull"), error)
+        self._end_pull(result, response)
+
+    def _discard_open_results(self, tx):
+        for result in tx.items():
+            if not result.complete():
+                self._wait_for_pull(result)
+        self._append_discards(tx)
+
 
 class Bolt4x1(Bolt4x0):
 
@@ -1155,6 +1672,17 @@ class BoltTransactionRef(ItemizedTask, TransactionRef):
         self.after = after
         self.metadata = metadata
         self.timeout = timeout
+        # Response to a BEGIN message, if one has been sent
+        self.begin_response = None
+
+    def failed(self):
+        return ((self.begin_response is not None and self.begin_response.failed()) or
+                ItemizedTask.failed(self))
+
+    def audit(self):
+        if self.begin_response is not None:
+            self.begin_response.audit()
+        ItemizedTask.audit(self)
 
     @property
     def extra(self):
@@ -1181,12 +1709,17 @@ class BoltResult(ItemizedTask, Result):
     failure of the query.
     """
 
+    #: The number of records requested by each PULL when streaming,
+    #: or -1 if all records are pulled at once.
+    fetch_size = -1
+
     def __init__(self, tx, cx, response):
         ItemizedTask.__init__(self)
         Result.__init__(self, tx)
         self.__record_type = None
         self.__cx = cx
         self._profile = cx.profile
+        self._structure_handlers = None
         self.append(response)
         self._last_taken = 0
 
@@ -1220,7 +1753,7 @@ class BoltResult(ItemizedTask, Result):
                 i += 1
             else:
                 self._last_taken = i
-                return record
+                return self._unpack_record(record)
         return None
 
     def peek(self, limit):
@@ -1228,12 +1761,36 @@ class BoltResult(ItemizedTask, Result):
         i = self._last_taken
         while i < self._items_len:
             response = self._items[i]
-            records.extend(response.peek_records(limit - len(records)))
+            records.extend(map(self._unpack_record,
+                               response.peek_records(limit - len(records))))
             if len(records) == limit:
                 break
             i += 1
         return records
 
+    def hydrate_with(self, hydrant):
+        try:
+            self._structure_handlers = hydrant.structure_handlers
+        except AttributeError:
+            return False
+        else:
+            return True
+
+    def _unpack_record(self, data):
+        try:
+            fields = unpack_record(data, self._structure_handlers)
+        except ValueError as error:
+            raise_from(ProtocolError("Bad message content"), error)
+        else:
+            return fields[0]
+
+    def fetch(self):
+        return self.__cx.fetch(self)
+
+    def discard(self):
+        if not self.complete() and not self.offline:
+            self.__cx.discard(self)
+
     def has_more_records(self):
         for item in self._items[1:]:
             has_more = item.metadata.get("has_more", False)
@@ -19,9 +19,12 @@
 
 from __future__ import absolute_import
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from itertools import islice
 from logging import getLogger
 from json import dumps as json_dumps, loads as json_loads
+from os import getpid
+from threading import Lock
 
 from packaging.version import Version
 from six import raise_from
@@ -30,8 +33,9 @@ from urllib3.exceptions import HTTPError
 
 from py2neo import ConnectionProfile
 from py2neo.compat import urlsplit
-from py2neo.client import http_user_agent, Connection, TransactionRef, Result, Bookmark
-from py2neo.client.json import JSONHydrant, dehydrate
+from py2neo.client import (http_user_agent, Connection, TransactionRef, Result, Bookmark,
+                           _fork_aware)
+from py2neo.client.json import JSONHydrant, JSONReader, dehydrate
 from py2neo.errors import Neo4jError, ConnectionUnavailable, ProtocolError
 
 
@@ -41,8 +45,8 @@ log = getLogger(__name__)
 class HTTP(Connection):
 
     @classmethod
-    def default_hydrant(cls, profile, graph):
-        return JSONHydrant(graph)
+    def default_hydrant(cls, profile, graph, identity_map=None, compact=False):
+        return JSONHydrant(graph, identity_map, compact)
 
     @classmethod
     def open(cls, profile=None, user_agent=None, on_release=None, on_broken=None):
@@ -59,48 +63,42 @@ class HTTP(Connection):
         """
         if profile is None:
             profile = ConnectionProfile(scheme="http")
+        http = cls(profile, on_release=on_release)
         try:
-            http = cls(profile, on_release=on_release)
             http._hello(user_agent or http_user_agent())
-            return http
         except HTTPError as error:
+            http.close()
             raise_from(ConnectionUnavailable("Cannot open connection to %r", profile), error)
+        except Exception:
+            http.close()
+            raise
+        else:
+            return http
 
     def __init__(self, profile, on_release=None):
         super(HTTP, self).__init__(profile, on_release=on_release)
-        self.http_pool = None
+        # Network connections are not owned by this object, but are
+        # instead drawn from a keep-alive pool shared by all HTTP
+        # connection objects for the same server.
+        self._server = HTTPPoolRegistry.default().acquire(profile)
         self.headers = {}
         self.__closed = False
-        self._make_pool(profile)
-
-    def _make_pool(self, profile):
-        if profile.secure:
-            from ssl import CERT_NONE, CERT_REQUIRED
-            from certifi import where as cert_where
-            self.http_pool = HTTPSConnectionPool(
-                host=profile.host,
-                port=profile.port_number,
-                maxsize=1,
-                block=True,
-                cert_reqs=CERT_REQUIRED if profile.verify else CERT_NONE,
-                ca_certs=cert_where()
-            )
-        else:
-            self.http_pool = HTTPConnectionPool(
-                host=profile.host,
-                port=profile.port_number,
-                maxsize=1,
-                block=True,
-            )
 
     def close(self):
-        self.http_pool.close()
-        self.__closed = True
+        if not self.__closed:
+            self.__closed = True
+            HTTPPoolRegistry.default().release(self._server)
 
     @property
     def closed(self):
         return self.__closed
 
+    @property
+    def http_pool(self):
+        # Looked up each time, as the shared pool may be replaced by
+        # a larger one as more connection objects come to use it.
+        return self._server.http_pool
+
     @property
     def broken(self):
         return False
@@ -108,6 +106,33 @@ class HTTP(Connection):
     def _hello(self, user_agent):
         self.headers.update(make_headers(basic_auth=":".join(self.profile.auth),
                                          user_agent=user_agent))
+        server = self._server
+        if server.neo4j_version is None:
+            self._discover()
+            server.neo4j_version = self._neo4j_version
+            server.neo4j_edition = self._neo4j_edition
+        else:
+            self._neo4j_version = server.neo4j_version
+            self._neo4j_edition = server.neo4j_edition
+        self.server_agent = "Neo4j/{}".format(self._neo4j_version)
+
+        # Given the root discovery endpoint isn't authenticated, we don't
+        # catch incorrect passwords here, and this wouldn't then be signalled
+        # to the user until later on. So here, we make a second call to a
+        # different URL for that reason only. This is only done once for
+        # each set of credentials used with this server.
+        authorization = self.headers.get("authorization")
+        if authorization not in server.authorized:
+            r = self.http_pool.request(method="GET",
+                                       url="/db/data/",
+                                       headers=dict(self.headers))
+            data = r.data.decode("utf-8")
+            rs = HTTPResponse.from_json(r.status, data or "{}")
+            rs.audit()
+            server.authorized.add(authorization)
+
+    def _discover(self):
+        self._neo4j_edition = None
         r = self.http_pool.request(method="GET",
                                    url="/",
                                    headers=dict(self.headers))
@@ -149,18 +174,6 @@ class HTTP(Connection):
             #   "neo4j_version" : "3.5.12"
             # }
             self._neo4j_version = Version(metadata["neo4j_version"])  # Neo4j 3.x
-        self.server_agent = "Neo4j/{}".format(self._neo4j_version)
-
-        # Given the root discovery endpoint isn't authenticated, we don't
-        # catch incorrect passwords here, and this wouldn't then be signalled
-        # to the user until later on. So here, we make a second call to a
-        # different URL for that reason only.
-        r = self.http_pool.request(method="GET",
-                                   url="/db/data/",
-                                   headers=dict(self.headers))
-        data = r.data.decode("utf-8")
-        rs = HTTPResponse.from_json(r.status, data or "{}")
-        rs.audit()
 
     def fast_forward(self, bookmark):
         raise NotImplementedError("Bookmarking is not yet supported over HTTP")
@@ -168,18 +181,19 @@ class HTTP(Connection):
     def auto_run(self, cypher, parameters=None, graph_name=None, readonly=False,
                  # after=None, metadata=None, timeout=None
                  ):
+        result = None
         try:
             if graph_name and not self.supports_multi():
                 raise TypeError("Neo4j {} does not support "
                                 "named graphs".format(self.neo4j_version))
             # if readonly:
             #     log.warning("Readonly transactions are not supported over HTTP")
-            r = self._post(HTTPTransactionRef.autocommit_uri(graph_name), cypher, parameters)
-            rs = HTTPResponse.from_json(r.status, r.data.decode("utf-8"))
-            rs.audit()
-            return HTTPResult(HTTPTransactionRef(graph_name), rs.result(), profile=self.profile)
+            r = self._post(HTTPTransactionRef.autocommit_uri(graph_name), [(cypher, parameters)],
+                           stream=True)
+            result = self._open_result(HTTPTransactionRef(graph_name), r)
+            return result
         finally:
-            self.release()
+            self._release_unless_streaming(result)
 
     def begin(self, graph_name, readonly=False,
               # after=None, metadata=None, timeout=None
@@ -196,19 +210,21 @@ class HTTP(Connection):
             #     raise TypeError("Transaction metadata is not supported over HTTP")
             # if timeout:
             #     raise TypeError("Transaction timeouts are not supported over HTTP")
-            r = self._post(HTTPTransactionRef.begin_uri(graph_name))
-            rs = HTTPResponse.from_json(r.status, r.data.decode("utf-8"))
-            location_path = urlsplit(r.headers["Location"]).path
-            tx = HTTPTransactionRef(graph_name, location_path.rpartition("/")[-1])
-            rs.audit(tx)
-            return tx
+            #
+            # The transaction is not begun on the server straight away,
+            # but along with the first statements run within it. Until
+            # then, there is nothing to commit or roll back.
+            return HTTPTransactionRef(graph_name, readonly=readonly)
         finally:
             self.release()
 
     def commit(self, tx):
         try:
+            self._finish_streaming(tx)
             if tx.broken:
                 raise ValueError("Transaction is broken")
+            if not tx.begun:
+                return Bookmark()
             r = self._post(tx.commit_uri())
         except ProtocolError:
             tx.mark_broken()
@@ -222,8 +238,11 @@ class HTTP(Connection):
 
     def rollback(self, tx):
         try:
+            self._finish_streaming(tx)
             if tx.broken:
                 raise ValueError("Transaction is broken")
+            if not tx.begun:
+                return Bookmark()
             r = self._delete(tx.uri())
         except ProtocolError:
             tx.mark_broken()
@@ -236,34 +255,119 @@ class HTTP(Connection):
             self.release()
 
     def run(self, tx, cypher, parameters=None):
+        result = None
+        try:
+            result = self._run_statements(tx, [(cypher, parameters)], stream=True)
+            return result
+        finally:
+            self._release_unless_streaming(result)
+
+    def run_many(self, tx, queries, commit=False, discard=False):
+        """ Run several queries within a transaction, sending all the
+        statements in a single request. If nothing has yet been run in
+        the transaction, the transaction is begun by the same request.
+        If `commit` is true, the transaction is also committed by that
+        request, so a short transaction can be carried out in a single
+        round trip. If `discard` is true, the records returned are
+        dropped rather than buffered.
+        """
         try:
-            r = self._post(tx.uri(), cypher, parameters)
+            results = self._run_statements(tx, queries, commit=commit)
+            for result in results:
+                if discard:
+                    result.discard()
+                else:
+                    result._pull()
+            return results
+        finally:
+            self.release()
+
+    def _run_statements(self, tx, queries, commit=False, stream=False):
+        """ Post a number of statements within a transaction, beginning
+        and committing the transaction as required.
+
+        If `stream` is true, a single statement is expected, and a
+        single result is returned, the records of which are read from
+        the network as they are pulled. Otherwise, the response is
+        read in full and a list of results returned.
+        """
+        self._finish_streaming(tx)
+        if tx.broken:
+            raise ValueError("Transaction is broken")
+        if tx.begun:
+            url = tx.commit_uri() if commit else tx.uri()
+        elif commit:
+            if not queries:
+                tx.bookmark = Bookmark()
+                return []
+            url = HTTPTransactionRef.autocommit_uri(tx.graph_name)
+        else:
+            url = HTTPTransactionRef.begin_uri(tx.graph_name)
+        try:
+            r = self._post(url, queries, stream=stream)
         except ProtocolError:
             tx.mark_broken()
             raise
+        if not tx.begun and not commit and "Location" in r.headers:
+            tx.set_begun(urlsplit(r.headers["Location"]).path.rpartition("/")[-1])
+        if stream:
+            return self._open_result(tx, r)
+        rs = HTTPResponse.from_json(r.status, r.data.decode("utf-8"))
+        rs.audit(tx)
+        if commit:
+            tx.bookmark = Bookmark()
+        return [HTTPResult(tx, rs.result(i), profile=self.profile)
+                for i in range(len(queries))]
+
+    def _open_result(self, tx, r):
+        """ Read the response to a single statement up to the point
+        at which its records begin, and return a result from which
+        those records can then be streamed.
+        """
+        rs = HTTPResponseStream(r)
+        try:
+            streaming = rs.open()
+        except ProtocolError:
+            tx.mark_broken()
+            raise
+        if streaming:
+            result = HTTPResult(tx, rs.result(), profile=self.profile, stream=rs, cx=self)
+            tx.streaming = result
+            return result
         else:
-            rs = HTTPResponse.from_json(r.status, r.data.decode("utf-8"))
+            # The response held no records, and has already been
+            # read in full.
             rs.audit(tx)
             return HTTPResult(tx, rs.result(), profile=self.profile)
-        finally:
+
+    def _release_unless_streaming(self, result):
+        # While a response is still being read, its network connection
+        # is held, so this connection is held too, in order that the
+        # connection pool continues to bound the number of network
+        # connections in use. It is released once the result is no
+        # longer streamed.
+        if result is None or result.offline:
             self.release()
 
+    @classmethod
+    def _finish_streaming(cls, tx):
+        # Requests within a transaction cannot overlap, so any records
+        # still to be read for an earlier query must be buffered before
+        # a new request can be made.
+        if tx.streaming is not None:
+            tx.streaming._pull()
+
     def pull(self, result, n=-1):
         try:
-            # TODO: lower-memory algorithm that doesn't require
-            #  duplication of potentially large data sets
-            if n == -1:
-                result._buffer.extend(result._data)
-                result._data[:] = []
-            else:
-                result._buffer.extend(result._data[:n])
-                result._data[:n] = []
+            if n > 0:
+                result.fetch_size = n
+            result._pull(n)
         finally:
             self.release()
 
     def discard(self, result):
         try:
-            result._data[:] = []
+            result.discard()
         finally:
             self.release()
 
@@ -318,24 +422,23 @@ class HTTP(Connection):
         record = result.take()
         return record
 
-    def _post(self, url, statement=None, parameters=None):
-        log.debug("POST %r %r %r", url, statement, parameters)
-        if statement:
-            statements = [
-                OrderedDict([
-                    ("statement", statement),
-                    ("parameters", dehydrate(parameters or {})),
-                    ("resultDataContents", ["REST"]),
-                    ("includeStats", True),
-                ])
-            ]
-        else:
-            statements = []
+    def _post(self, url, queries=(), stream=False):
+        log.debug("POST %r %r", url, queries)
+        statements = [
+            OrderedDict([
+                ("statement", statement),
+                ("parameters", dehydrate(parameters or {})),
+                ("resultDataContents", ["REST"]),
+                ("includeStats", True),
+            ])
+            for statement, parameters in queries
+        ]
         try:
             return self.http_pool.request(method="POST",
                                           url=url,
                                           headers=dict(self.headers, **{"Content-Type": "application/json"}),
-                                          body=json_dumps({"statements": statements}))
+                                          body=json_dumps({"statements": statements}),
+                                          preload_content=not stream)
         except HTTPError as error:
             raise_from(ProtocolError("Failed to POST to %r" % url), error)
 
@@ -357,6 +460,16 @@ class HTTPTransactionRef(TransactionRef):
     def __init__(self, graph_name, txid=None, readonly=False):
         super(HTTPTransactionRef, self).__init__(graph_name, txid, readonly)
         self.failure = None
+        # A transaction only exists on the server once a request has
+        # been made within it, at which point it is given an ID.
+        self.begun = txid is not None
+        # The result, if any, whose records are still being read
+        # from the response to the latest request.
+        self.streaming = None
+
+    def set_begun(self, txid):
+        self.txid = txid
+        self.begun = True
 
     def __bool__(self):
         return not self.broken
@@ -391,21 +504,36 @@ class HTTPTransactionRef(TransactionRef):
 
 
 class HTTPResult(Result):
+    """ Result of a statement run over HTTP.
 
-    def __init__(self, tx, result, profile):
+    Records are held in one of two places: either in a list decoded
+    from a response read in full, or in a response stream, from which
+    they are read only as they are pulled. In both cases, records are
+    moved into a buffer when pulled, and are removed from the buffer
+    as they are taken, so that a streamed result can be consumed in
+    memory bounded by the number of records pulled at once.
+    """
+
+    #: The number of records pulled in each batch when streaming,
+    #: or -1 if all records are pulled at once.
+    fetch_size = -1
+
+    def __init__(self, tx, result, profile, stream=None, cx=None):
         Result.__init__(self, tx)
         self._profile = profile
         self._columns = result.get("columns", ())
         self._data = result.get("data", [])
-        self._buffer = []
+        self._buffer = deque()
         self._summary = {}
         if "stats" in result:
             self._summary["stats"] = result["stats"]
-        self._cursor = 0
+        self._stream = stream
+        # Connection held on behalf of this result while streaming
+        self._cx = cx
 
     @property
     def offline(self):
-        return True
+        return self._stream is None
 
     @property
     def profile(self):
@@ -419,21 +547,73 @@ class HTTPResult(Result):
 
     def take(self):
         try:
-            record = self._buffer[self._cursor]["rest"]
+            record = self._buffer.popleft()
         except IndexError:
             return None
         else:
-            self._cursor += 1
-            return record
+            return record["rest"]
 
     def peek(self, limit):
-        records = []
-        for i in range(limit):
-            try:
-                records.append(self._buffer[self._cursor + i]["rest"])
-            except IndexError:
-                break
-        return records
+        return [record["rest"] for record in islice(self._buffer, limit)]
+
+    def fetch(self):
+        record = self.take()
+        if record is None and (self._data or self._stream):
+            self._pull(self.fetch_size)
+            record = self.take()
+        return record
+
+    def discard(self):
+        self._data[:] = []
+        if self._stream is not None:
+            while self._stream.next_row() is not None:
+                pass
+            self._end_stream()
+
+    def _pull(self, n=-1):
+        """ Move up to `n` records (or all records, if `n` is -1)
+        into the buffer, reading from the response stream if
+        required.
+        """
+        if self._data:
+            if n == -1:
+                self._buffer.extend(self._data)
+                self._data[:] = []
+                n = 0
+            else:
+                taken = self._data[:n]
+                self._buffer.extend(taken)
+                self._data[:n] = []
+                n -= len(taken)
+        if self._stream is not None:
+            while n != 0:
+                try:
+                    row = self._stream.next_row()
+                except ProtocolError:
+                    self._detach_stream()
+                    self._tx.mark_broken()
+                    raise
+                if row is None:
+                    self._end_stream()
+                    break
+                self._buffer.append(row)
+                n -= 1
+
+    def _detach_stream(self):
+        stream, self._stream = self._stream, None
+        if self._tx.streaming is self:
+            self._tx.streaming = None
+        cx, self._cx = self._cx, None
+        if cx is not None:
+            cx.release()
+        return stream
+
+    def _end_stream(self):
+        stream = self._detach_stream()
+        result = stream.result()
+        if "stats" in result:
+            self._summary["stats"] = result["stats"]
+        stream.audit(self._tx)
 
 
 class HTTPResponse(object):
@@ -441,7 +621,7 @@ class HTTPResponse(object):
     @classmethod
     def from_json(cls, status, data):
         try:
-            content = json_loads(data, object_hook=JSONHydrant.json_to_packstream)
+            content = json_loads(data)
         except ValueError as error:
             raise_from(ProtocolError("Cannot decode response content as JSON"), error)
         else:
@@ -481,3 +661,221 @@ class HTTPResponse(object):
             if tx is not None:
                 tx.mark_broken()
             raise failure
+
+
+class HTTPResponseStream(HTTPResponse):
+    """ Response to a single statement, read incrementally from the
+    network. The response content is filled in as it is read, except
+    for the records of the result, which are handed out one at a time
+    by :meth:`.next_row` rather than being stored.
+    """
+
+    #: Number of bytes read from the network at a time.
+    chunk_size = 65536
+
+    def __init__(self, r):
+        super(HTTPResponseStream, self).__init__(r.status, {})
+        self._response = r
+        self._reader = JSONReader(r.stream(self.chunk_size))
+        self._rows = self._parse()
+
+    def _parse(self):
+        # Generates None when the records of the first result begin,
+        # followed by each of those records in turn.
+        reader = self._reader
+        for _ in reader.elements("{", "}"):
+            key = reader.value()
+            reader.expect(":")
+            if key != "results":
+                self._content[key] = reader.value()
+                continue
+            results = self._content["results"] = []
+            for _ in reader.elements("[", "]"):
+                if results:
+                    results.append(reader.value())
+                    continue
+                result = {}
+                results.append(result)
+                for _ in reader.elements("{", "}"):
+                    key = reader.value()
+                    reader.expect(":")
+                    if key == "data":
+                        yield None
+                        for _ in reader.elements("[", "]"):
+                            yield reader.value()
+                    else:
+                        result[key] = reader.value()
+
+    def _next(self):
+        try:
+            return next(self._rows)
+        except StopIteration:
+            self._response.release_conn()
+            raise
+        except ValueError as error:
+            self._response.close()
+            raise_from(ProtocolError("Cannot decode response content as JSON"), error)
+        except HTTPError as error:
+            self._response.close()
+            raise_from(ProtocolError("Failed to read response"), error)
+
+    def open(self):
+        """ Read up to the start of the records of the first result.
+
+        :returns: :const:`True` if records follow, or :const:`False`
+            if the response has been read in full
+        """
+        try:
+            self._next()
+        except StopIteration:
+            return False
+        else:
+            return True
+
+    def next_row(self):
+        """ Read and return the next record, or :const:`None` if there
+        are no more records, in which case the remainder of the
+        response will also have been read.
+        """
+        try:
+            return self._next()
+        except StopIteration:
+            return None
+
+
+class HTTPServerState(object):
+    """ Shared state for a single HTTP server, held by a
+    :class:`.HTTPPoolRegistry`.
+    """
+
+    def __init__(self, http_pool, size):
+        #: Keep-alive urllib3 connection pool for this server.
+        self.http_pool = http_pool
+        #: Maximum number of connections held by that pool.
+        self.size = size
+        #: Server version and edition, once discovered.
+        self.neo4j_version = None
+        self.neo4j_edition = None
+        #: Authorization headers already checked against this server.
+        self.authorized = set()
+        self.users = 0
+
+
+class HTTPPoolRegistry(object):
+    """ Registry of urllib3 connection pools, holding one pool per
+    server, shared by all :class:`.HTTP` connection objects for that
+    server.
+
+    Each HTTP connection object is only ever used by one thread at a
+    time, and holds at most one network connection at a time (for as
+    long as a response is being read), so the number of requests in
+    flight to a server is limited by the py2neo connection pools
+    rather than by urllib3. The shared pool is sized to hold a network
+    connection for every HTTP connection object using it, growing as
+    required, so it never blocks and never has to discard a connection
+    on return. Idle connections are kept alive for reuse, avoiding
+    repeated TCP and TLS setup. Server discovery and credential checks are also carried
+    out only once per server, rather than once per connection object.
+
+    A pool is closed when the last connection object using it is
+    closed. The registry is fork-aware: a child process never uses a
+    pool created by its parent.
+
+    *New in version 2021.2.*
+    """
+
+    #: Number of connections for which each shared pool is initially
+    #: sized, before growing to match its number of users.
+    initial_size = 32
+
+    def __init__(self):
+        self.__reset()
+        _fork_aware.add(self)
+
+    def _after_fork(self):
+        # Forget (but do not close) pools belonging to the parent
+        # process, as their sockets are shared with it.
+        self.__reset()
+
+    def __reset(self):
+        self._lock = Lock()
+        self._pid = getpid()
+        self._servers = {}
+
+    def __len__(self):
+        return len(self._servers)
+
+    @classmethod
+    def default(cls):
+        """ Return the default, process-wide registry.
+        """
+        return _default_http_pool_registry
+
+    @classmethod
+    def _key(cls, profile):
+        return profile.secure, profile.verify, profile.host, profile.port_number
+
+    def _make_pool(self, profile, size):
+        if profile.secure:
+            from ssl import CERT_NONE, CERT_REQUIRED
+            from certifi import where as cert_where
+            return HTTPSConnectionPool(
+                host=profile.host,
+                port=profile.port_number,
+                maxsize=size,
+                block=False,
+                cert_reqs=CERT_REQUIRED if profile.verify else CERT_NONE,
+                ca_certs=cert_where()
+            )
+        else:
+            return HTTPConnectionPool(
+                host=profile.host,
+                port=profile.port_number,
+                maxsize=size,
+                block=False,
+            )
+
+    def acquire(self, profile):
+        """ Return the shared :class:`.HTTPServerState` for a profile,
+        creating it if necessary, and register a new user of it.
+        """
+        if getpid() != self._pid:
+            self.__reset()
+        key = self._key(profile)
+        replaced = None
+        with self._lock:
+            try:
+                server = self._servers[key]
+            except KeyError:
+                log.debug("Creating shared HTTP pool for %s:%s", profile.host, profile.port_number)
+                server = self._servers[key] = HTTPServerState(
+                    self._make_pool(profile, self.initial_size), self.initial_size)
+            server.users += 1
+            if server.users > server.size:
+                # Replace the pool with one twice the size. Connections
+                # still checked out of the old pool are closed when they
+                # are returned to it.
+                replaced = server.http_pool
+                server.size *= 2
+                log.debug("Growing shared HTTP pool for %s:%s to %d connections",
+                          profile.host, profile.port_number, server.size)
+                server.http_pool = self._make_pool(profile, server.size)
+        if replaced is not None:
+            replaced.close()
+        return server
+
+    def release(self, server):
+        """ Unregister a user of a shared :class:`.HTTPServerState`,
+        closing its pool if no users remain.
+        """
+        with self._lock:
+            server.users -= 1
+            if server.users > 0:
+                return
+            for key, value in list(self._servers.items()):
+                if value is server:
+                    del self._servers[key]
+        server.http_pool.close()
+
+
+_default_http_pool_registry = HTTPPoolRegistry()
@@ -17,8 +17,11 @@
 # limitations under the License.
 
 
+from codecs import getincrementaldecoder
 from collections import namedtuple
+from json import JSONDecoder
 from logging import getLogger
+from re import compile as re_compile
 
 from interchange.packstream import Structure
 
@@ -33,13 +36,17 @@ log = getLogger(__name__)
 INT64_MIN = -(2 ** 63)
 INT64_MAX = 2 ** 63 - 1
 
+WHITESPACE = re_compile(r"[ \t\n\r]*")
+
 
 class JSONHydrant(Hydrant):
 
     unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
 
-    def __init__(self, graph):
+    def __init__(self, graph, identity_map=None, compact=False):
         self.graph = graph
+        self.identity_map = identity_map
+        self.compact = compact
         self.hydration_functions = {}
 
     @classmethod
@@ -53,7 +60,8 @@ class JSONHydrant(Hydrant):
     def json_to_packstream(cls, data):
         """ This converts from JSON format into PackStream prior to
         proper hydration. This code needs to die horribly in a freak
-        yachting accident.
+        yachting accident. Results received over HTTP are now hydrated
+        in a single pass by `hydrate_list` instead.
         """
         # TODO: other partial hydration
         if "self" in data:
@@ -84,46 +92,100 @@ class JSONHydrant(Hydrant):
             return data
 
     def hydrate_list(self, values):
-        """ Convert JSON values into native values. This is the other half
-        of the HTTP hydration process, and is basically a copy of the
-        Bolt/PackStream hydration code. It needs to be combined with the
-        code in `json_to_packstream` so that hydration is done in a single
-        pass.
+        """ Convert a list of JSON values, as received in REST format,
+        into native values. Nodes, relationships and paths are
+        recognised by their shape and hydrated directly from the
+        decoded JSON, so that each value is only visited once.
         """
         assert isinstance(values, list)
         for i, value in enumerate(values):
             if isinstance(value, (list, dict, Structure)):
-                values[i] = self.hydrate_object(value)
+                values[i] = self.hydrate_json(value)
         return values
 
+    def hydrate_json(self, value):
+        """ Hydrate a single JSON value, as received in REST format.
+        """
+        if isinstance(value, dict):
+            if "self" in value:
+                identity = self._uri_to_id(value["self"])
+                if "type" in value:
+                    fields = (identity,
+                              self._uri_to_id(value["start"]),
+                              self._uri_to_id(value["end"]),
+                              value["type"],
+                              value["data"])
+                    if self.compact:
+                        return self._hydrate_frozen_relationship(fields)
+                    else:
+                        return self._hydrate_relationship(fields)
+                else:
+                    fields = (identity, value["metadata"]["labels"], value["data"])
+                    if self.compact:
+                        return self._hydrate_frozen_node(fields)
+                    else:
+                        return self._hydrate_node(fields)
+            elif "nodes" in value and "relationships" in value:
+                return self._hydrate_path(value)
+            else:
+                # from warnings import warn
+                # warn("Map literals returned over the Neo4j HTTP interface are ambiguous "
+                #      "and may be unintentionally hydrated as graph objects")
+                return {key: self.hydrate_json(item) if isinstance(item, (list, dict)) else item
+                        for key, item in value.items()}
+        elif isinstance(value, list):
+            return [self.hydrate_json(item) if isinstance(item, (list, dict)) else item
+                    for item in value]
+        elif isinstance(value, Structure):
+            return self.hydrate_object(value)
+        else:
+            return value
+
+    def _hydrate_path(self, value):
+        from py2neo.data import Path
+        # Paths are always made up of full entities, even in compact
+        # mode. Nodes and relationships are only given as URIs, so
+        # relationship types and properties must be looked up
+        # separately.
+        nodes = [self._hydrate_node((identity, None, None))
+                 for identity in map(self._uri_to_id, value["nodes"])]
+        rel_ids = list(map(self._uri_to_id, value["relationships"]))
+        if rel_ids:
+            r_dict = {r.identity: r for r in RelationshipMatcher(self.graph).get(rel_ids)}
+            u_rels = [self.unbound_relationship(i, type(r_dict[i]).__name__, dict(r_dict[i]))
+                      for i in rel_ids]
+        else:
+            u_rels = []
+        sequence = [i // 2 + 1 for i in range(2 * len(rel_ids))]
+        for i, direction in enumerate(value["directions"]):
+            if direction == "<-":
+                sequence[2 * i] *= -1
+        return Path.hydrate(self.graph, nodes, u_rels, sequence, self.identity_map)
+
     def hydrate_object(self, obj):
-        log.debug("Hydrating object %r", obj)
-        from py2neo.data import Node, Relationship, Path
+        """ Hydrate a value in which graph structures have already
+        been converted into PackStream form by `json_to_packstream`.
+        """
+        from py2neo.data import Path
         if isinstance(obj, Structure):
             tag = obj.tag
             fields = obj.fields
             if tag == ord(b"N"):
-                obj = Node.ref(self.graph, fields[0])
-                if fields[1] is not None:
-                    obj._remote_labels = frozenset(fields[1])
-                    obj.clear_labels()
-                    obj.update_labels(fields[1])
-                if fields[2] is not None:
-                    obj.clear()
-                    obj.update(self.hydrate_object(fields[2]))
-                return obj
+                if self.compact:
+                    return self._hydrate_frozen_node(fields)
+                else:
+                    return self._hydrate_node(fields)
             elif tag == ord(b"R"):
-                start_node = Node.ref(self.graph, fields[1])
-                end_node = Node.ref(self.graph, fields[2])
-                obj = Relationship.ref(self.graph, fields[0], start_node, fields[3], end_node)
-                if fields[4] is not None:
-                    obj.clear()
-                    obj.update(self.hydrate_object(fields[4]))
-                return obj
+                if self.compact:
+                    return self._hydrate_frozen_relationship(fields)
+                else:
+                    return self._hydrate_relationship(fields)
             elif tag == ord(b"P"):
+                # Paths are always made up of full entities, even in
+                # compact mode.
+                nodes = [self._hydrate_node(node.fields) for node in fields[0]]
                 # Herein lies a dirty hack to retrieve missing relationship
                 # detail for paths received over HTTP.
-                nodes = [self.hydrate_object(node) for node in fields[0]]
                 u_rels = []
                 typeless_u_rel_ids = []
                 for r in fields[1]:
@@ -141,7 +203,7 @@ class JSONHydrant(Hydrant):
                                 u_rel.properties
                             )
                 sequence = fields[2]
-                return Path.hydrate(self.graph, nodes, u_rels, sequence)
+                return Path.hydrate(self.graph, nodes, u_rels, sequence, self.identity_map)
             else:
                 try:
                     f = self.hydration_functions[tag]
@@ -157,6 +219,55 @@ class JSONHydrant(Hydrant):
         else:
             return obj
 
+    def _hydrate_node(self, fields):
+        from py2neo.data import Node
+        if self.identity_map is None:
+            node = Node.ref(self.graph, fields[0])
+        else:
+            node = self.identity_map.node(self.graph, fields[0])
+        if fields[1] is not None:
+            node._remote_labels = frozenset(fields[1])
+            node._load_labels(fields[1])
+        if fields[2] is not None:
+            node._load_properties(fields[2])
+        return node
+
+    def _hydrate_relationship(self, fields):
+        from py2neo.data import Node, Relationship
+        if self.identity_map is None:
+            start_node = Node.ref(self.graph, fields[1])
+            end_node = Node.ref(self.graph, fields[2])
+            rel = Relationship.ref(self.graph, fields[0], start_node, fields[3], end_node)
+        else:
+            start_node = self.identity_map.node(self.graph, fields[1])
+            end_node = self.identity_map.node(self.graph, fields[2])
+            rel = self.identity_map.relationship(self.graph, fields[0],
+                                                 start_node, fields[3], end_node)
+        if fields[4] is not None:
+            rel._load_properties(fields[4])
+        return rel
+
+    def _hydrate_frozen_node(self, fields):
+        from py2neo.data import FrozenNode
+        properties = fields[2]
+        if self.identity_map is None:
+            return FrozenNode(self.graph, fields[0], fields[1], properties)
+        else:
+            return self.identity_map.frozen_node(self.graph, fields[0], fields[1], properties)
+
+    def _hydrate_frozen_relationship(self, fields):
+        from py2neo.data import FrozenNode, FrozenRelationship
+        properties = fields[4]
+        if self.identity_map is None:
+            start_node = FrozenNode(self.graph, fields[1])
+            end_node = FrozenNode(self.graph, fields[2])
+            return FrozenRelationship(self.graph, fields[0], start_node, fields[3], end_node, properties)
+        else:
+            start_node = self.identity_map.frozen_node(self.graph, fields[1])
+            end_node = self.identity_map.frozen_node(self.graph, fields[2])
+            return self.identity_map.frozen_relationship(self.graph, fields[0], start_node,
+                                                         fields[3], end_node, properties)
+
     def dehydrate(self, data, version=None):
         """ Dehydrate to JSON.
         """
@@ -203,3 +314,125 @@ def dehydrate(data):
         return list(map(dehydrate, data))
     else:
         raise TypeError("Neo4j does not support JSON parameters of type %s" % type(data).__name__)
+
+
+class JSONReader(object):
+    """ Incremental reader for a JSON document that arrives as a
+    sequence of byte chunks.
+
+    The structure of the document is walked one token at a time, and
+    complete values are only decoded where asked for. This allows a
+    large document, such as a long list of records, to be processed
+    while holding no more than a small window of its text in memory.
+
+    >>> reader = JSONReader([b'{"data": [[1], ', b'[2]]}'])
+    >>> for _ in reader.elements("{", "}"):
+    ...     key = reader.value()
+    ...     reader.expect(":")
+    ...     for _ in reader.elements("[", "]"):
+    ...         print(reader.value())
+    [1]
+    [2]
+
+    :param chunks: iterable of UTF-8 encoded byte strings
+    :param object_hook: function applied to every decoded object, as
+        for :func:`json.loads`
+    :raises ValueError: if the document is not valid JSON
+    """
+
+    def __init__(self, chunks, object_hook=None):
+        self._chunks = iter(chunks)
+        self._utf8 = getincrementaldecoder("utf-8")()
+        self._decoder = JSONDecoder(object_hook=object_hook)
+        self._text = u""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=1):
+        """ Read chunks until at least `size` characters not yet
+        consumed are held, discarding any text already consumed.
+
+        :returns: :const:`False` if the end of the document was
+            reached first, :const:`True` otherwise
+        """
+        text = [self._text[self._pos:]]
+        length = len(text[0])
+        self._pos = 0
+        try:
+            while length < size and not self._eof:
+                try:
+                    chunk = next(self._chunks)
+                except StopIteration:
+                    self._eof = True
+                    chunk = self._utf8.decode(b"", True)
+                else:
+                    chunk = self._utf8.decode(chunk)
+                text.append(chunk)
+                length += len(chunk)
+        finally:
+            self._text = u"".join(text)
+        return length >= size
+
+    def peek(self):
+        """ Return the next character that is not whitespace, without
+        consuming it.
+
+        :returns: single character, or an empty string at the end of
+            the document
+        """
+        while True:
+            self._pos = WHITESPACE.match(self._text, self._pos).end()
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if not self._fill():
+                return u""
+
+    def expect(self, chars):
+        """ Consume the next character that is not whitespace, which
+        must be one of `chars`.
+
+        :returns: the character consumed
+        :raises ValueError: if any other character is found
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError("Expected one of %r, found %r" % (chars, char))
+        self._pos += 1
+        return char
+
+    def elements(self, opening, closing):
+        """ Consume the opening character of an array or object, then
+        generate once for each element or member within it, leaving
+        the element itself to be read by the caller. The separators
+        and closing character are consumed in between.
+        """
+        self.expect(opening)
+        if self.peek() == closing:
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self.expect(u"," + closing) == closing:
+                return
+
+    def value(self):
+        """ Decode and return the next complete value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._text, self._pos)
+            except ValueError:
+                # The value is incomplete (or invalid). Read on until
+                # the window has doubled in size before trying again,
+                # so that large values are not decoded over and over.
+                if self._eof:
+                    raise
+                self._fill(2 * (len(self._text) - self._pos) or 1)
+            else:
+                if end < len(self._text) or self._eof:
+                    self._pos = end
+                    return value
+                # A number at the very end of the window may yet
+                # continue into the next chunk.
+                self._fill(len(self._text) - self._pos + 1)
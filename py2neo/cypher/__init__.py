@@ -81,9 +81,14 @@ class Cursor(object):
 
     """
 
-    def __init__(self, result, hydrant=None, sample_size=3):
+    def __init__(self, result, hydrant=None, sample_size=3, connector=None):
         self._result = result
+        self._connector = connector
         self._fields = self._result.fields()
+        if hydrant is not None and result.hydrate_with(hydrant):
+            # Records will be hydrated by the result itself as they
+            # are decoded, so no separate pass is required.
+            hydrant = None
         self._hydrant = hydrant
         self._current = None
         self.sample_size = sample_size
@@ -197,7 +202,10 @@ class Cursor(object):
         amount = int(amount)
         moved = 0
         while moved != amount:
-            values = self._result.take()
+            if self._connector is None:
+                values = self._result.fetch()
+            else:
+                values = self._connector.fetch(self._result)
             if values is None:
                 break
             if self._hydrant:
@@ -206,6 +214,21 @@ class Cursor(object):
             moved += 1
         return moved
 
+    def close(self):
+        """ Close the cursor, discarding any records that have not yet
+        been received from the server. Records already received can
+        still be navigated to.
+
+        This is only necessary for results that are being streamed
+        and which are not going to be consumed in full, as the
+        underlying connection is otherwise held until the final
+        record has been received.
+        """
+        if self._connector is None:
+            self._result.discard()
+        else:
+            self._connector.discard(self._result)
+
     def preview(self, limit=None):
         """ Construct a :class:`.Table` containing a preview of
         upcoming records, including no more than the given `limit`.
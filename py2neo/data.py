@@ -28,6 +28,8 @@ __all__ = [
     "Relationship",
     "Path",
     "walk",
+    "FrozenNode",
+    "FrozenRelationship",
     "UniquenessError",
 ]
 
@@ -42,7 +44,7 @@ from interchange import geo as spatial
 from interchange import time
 from interchange.collections import SetView, PropertyDict
 
-from py2neo.compat import string_types, ustr, xstr
+from py2neo.compat import Mapping, string_types, ustr, xstr
 from py2neo.cypher import cypher_escape, cypher_repr, cypher_join
 from py2neo.cypher.encoding import CypherEncoder, LabelSetView
 from py2neo.cypher.queries import (
@@ -544,6 +546,7 @@ class Entity(PropertyDict, Walkable):
     """
 
     _graph = None
+    _uuid = None
     identity = None
 
     @classmethod
@@ -553,12 +556,19 @@ class Entity(PropertyDict, Walkable):
     def __init__(self, iterable, properties):
         Walkable.__init__(self, iterable)
         PropertyDict.__init__(self, properties)
-        uuid = str(uuid4())
-        while "0" <= uuid[-7] <= "9":
-            uuid = str(uuid4())
-        self.__uuid__ = uuid
         self._stale = set()
 
+    @property
+    def __uuid__(self):
+        # Generated on first use, as this is comparatively expensive
+        # and not required for most entities hydrated from results.
+        if self._uuid is None:
+            uuid = str(uuid4())
+            while "0" <= uuid[-7] <= "9":
+                uuid = str(uuid4())
+            self._uuid = uuid
+        return self._uuid
+
     def __bool__(self):
         return len(self) > 0
 
@@ -608,6 +618,16 @@ class Entity(PropertyDict, Walkable):
         self._stale.discard("properties")
         super(Entity, self).clear()
 
+    def _load_properties(self, properties):
+        """ Replace all properties with those received from the
+        server. Property values stored in the database are never
+        null, so these can be copied in bulk, bypassing the checks
+        applied to individual property updates.
+        """
+        self._stale.discard("properties")
+        dict.clear(self)
+        dict.update(self, properties)
+
 
 class Node(Entity):
     """ A node is a fundamental unit of data storage within a property
@@ -762,6 +782,13 @@ class Node(Entity):
         for label in labels:
             self.add_label(label)
 
+    def _load_labels(self, labels):
+        """ Replace all labels with those received from the server.
+        """
+        self._stale.discard("labels")
+        self._labels.clear()
+        self._labels.update(labels)
+
 
 class Relationship(Entity):
     """ A relationship represents a typed connection between a pair of nodes.
@@ -930,22 +957,29 @@ class Path(Walkable):
     """
 
     @classmethod
-    def hydrate(cls, graph, nodes, u_rels, sequence):
+    def hydrate(cls, graph, nodes, u_rels, sequence, identity_map=None):
         last_node = nodes[0]
         steps = [last_node]
         for i, rel_index in enumerate(sequence[::2]):
             next_node = nodes[sequence[2 * i + 1]]
             if rel_index > 0:
                 u_rel = u_rels[rel_index - 1]
-                start_node = Node.ref(graph, last_node.identity)
-                end_node = Node.ref(graph, next_node.identity)
+                start_node_id, end_node_id = last_node.identity, next_node.identity
             else:
                 u_rel = u_rels[-rel_index - 1]
-                start_node = Node.ref(graph, next_node.identity)
-                end_node = Node.ref(graph, last_node.identity)
-            rel = Relationship.ref(graph, u_rel.id, start_node, u_rel.type, end_node)
-            rel.clear()
-            rel.update(u_rel.properties)
+                start_node_id, end_node_id = next_node.identity, last_node.identity
+            if identity_map is None:
+                start_node = Node.ref(graph, start_node_id)
+                end_node = Node.ref(graph, end_node_id)
+                rel = Relationship.ref(graph, u_rel.id, start_node, u_rel.type, end_node)
+            else:
+                start_node = identity_map.node(graph, start_node_id)
+                end_node = identity_map.node(graph, end_node_id)
+                rel = identity_map.relationship(graph, u_rel.id, start_node, u_rel.type, end_node)
+            if u_rel.properties is not None:
+                # Properties are not always received for relationships
+                # within a path, in which case they are left stale.
+                rel._load_properties(u_rel.properties)
             steps.append(rel)
             last_node = next_node
         return cls(*steps)
@@ -1020,6 +1054,175 @@ class Path(Walkable):
 walk = Path.walk
 
 
+_interned_label_sets = {}
+
+#: Maximum number of distinct label sets to intern, beyond which
+#: further label sets are returned without being shared.
+_max_interned_label_sets = 4096
+
+
+def _intern_labels(labels):
+    """ Return a frozenset of labels, shared with every other caller
+    that has requested the same set of labels, in whatever order.
+    """
+    labels = frozenset(labels)
+    try:
+        return _interned_label_sets[labels]
+    except KeyError:
+        if len(_interned_label_sets) >= _max_interned_label_sets:
+            return labels
+        return _interned_label_sets.setdefault(labels, labels)
+
+
+class _FrozenEntity(Mapping):
+    """ Base class for compact, read-only entities.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return self._properties.get(key)
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    def __iter__(self):
+        return iter(self._properties)
+
+    def __len__(self):
+        return len(self._properties)
+
+    def __bool__(self):
+        return len(self._properties) > 0
+
+    def __nonzero__(self):
+        return len(self._properties) > 0
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return False
+        if self.graph is None or self.identity is None:
+            return False
+        return self.graph == other.graph and self.identity == other.identity
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self.graph is not None and self.identity is not None:
+            return hash(self.graph.service) ^ hash(self.graph.name) ^ hash(self.identity)
+        else:
+            return hash(id(self))
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def _repr_args(self, args):
+        kwargs = OrderedDict()
+        d = self._properties
+        for key in sorted(d):
+            if CypherEncoder.is_safe_key(key):
+                args.append("%s=%r" % (key, d[key]))
+            else:
+                kwargs[key] = d[key]
+        if kwargs:
+            args.append("**{%s}" % ", ".join("%r: %r" % (k, kwargs[k]) for k in kwargs))
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(args))
+
+
+class FrozenNode(_FrozenEntity):
+    """ Compact, read-only representation of a node, as hydrated from
+    results in compact mode.
+
+    Frozen nodes carry only the graph, identity, labels and properties
+    of the node they represent, held in a fixed set of slots instead
+    of the full structure of a :class:`.Node`. Sets of labels are
+    interned, so that nodes with the same labels share a single
+    :class:`frozenset`. Properties can be read as for a :class:`.Node`,
+    but cannot be modified.
+
+    A node referenced only as the start or end of a relationship has
+    :const:`None` for its labels, as these are not received from the
+    server. Such nodes will also have no properties.
+
+    Frozen nodes cannot be pushed or pulled directly; use
+    :meth:`.thaw` to obtain an equivalent :class:`.Node` for that.
+
+    *New in version 2021.2.*
+    """
+
+    __slots__ = ("graph", "identity", "labels", "_properties")
+
+    def __init__(self, graph, identity, labels=None, properties=None):
+        self.graph = graph
+        self.identity = identity
+        self.labels = None if labels is None else _intern_labels(labels)
+        self._properties = {} if properties is None else properties
+
+    def __repr__(self):
+        return self._repr_args(list(map(repr, sorted(self.labels or ()))))
+
+    def has_label(self, label):
+        """ Return :const:`True` if this node has the label `label`,
+        :const:`False` otherwise.
+        """
+        return self.labels is not None and label in self.labels
+
+    def thaw(self):
+        """ Return a full :class:`.Node` object equivalent to this
+        frozen node.
+        """
+        node = Node.ref(self.graph, self.identity)
+        if self.labels is not None:
+            node._load_labels(self.labels)
+            node._load_properties(self._properties)
+        return node
+
+
+class FrozenRelationship(_FrozenEntity):
+    """ Compact, read-only representation of a relationship, as
+    hydrated from results in compact mode.
+
+    As for :class:`.FrozenNode`, frozen relationships hold only the
+    essential details of the relationship in a fixed set of slots.
+    The relationship type is available as a string through the
+    :attr:`.type` attribute, and the end nodes are
+    :class:`.FrozenNode` objects.
+
+    *New in version 2021.2.*
+    """
+
+    __slots__ = ("graph", "identity", "start_node", "type", "end_node", "_properties")
+
+    def __init__(self, graph, identity, start_node, r_type, end_node, properties=None):
+        self.graph = graph
+        self.identity = identity
+        self.start_node = start_node
+        self.type = r_type
+        self.end_node = end_node
+        self._properties = {} if properties is None else properties
+
+    def __repr__(self):
+        return self._repr_args([repr(self.start_node), repr(self.type), repr(self.end_node)])
+
+    @property
+    def nodes(self):
+        """ The start and end nodes of this relationship, as a tuple.
+        """
+        return self.start_node, self.end_node
+
+    def thaw(self):
+        """ Return a full :class:`.Relationship` object equivalent to
+        this frozen relationship, with thawed end nodes.
+        """
+        rel = Relationship.ref(self.graph, self.identity,
+                               self.start_node.thaw(), self.type, self.end_node.thaw())
+        rel._load_properties(self._properties)
+        return rel
+
+
 # TODO: find a better home for this class
 class UniquenessError(Exception):
     """ Raised when a condition assumed to be unique is determined
@@ -34,7 +34,8 @@ from time import sleep
 
 from py2neo.compat import (deprecated,
                            Sequence,
-                           Mapping)
+                           Mapping,
+                           string_types)
 from py2neo.cypher import Cursor, cypher_escape
 from py2neo.cypher.proc import ProcedureLibrary
 from py2neo.errors import (Neo4jError,
@@ -103,21 +104,43 @@ class GraphService(object):
 
     _graphs = None
 
+    #: If true, services with the same profile and settings will share
+    #: a single :class:`~py2neo.client.Connector`, held in the default
+    #: :class:`~py2neo.client.ConnectorRegistry`. Otherwise (the
+    #: default), each service will create its own connector.
+    #:
+    #: A shared connector is closed once no service uses it any longer.
+    #: It should not be closed directly, as that would also close it
+    #: for all the other services sharing it.
+    #:
+    #: *New in version 2021.2.*
+    share_connectors = False
+
     def __init__(self, profile=None, **settings):
         from py2neo import ServiceProfile
-        from py2neo.client import Connector
+        from py2neo.client import Connector, ConnectorRegistry
         connector_settings = {
             "user_agent": settings.pop("user_agent", None),
             "init_size": settings.pop("init_size", None),
             "max_size": settings.pop("max_size", None),
             "max_age": settings.pop("max_age", None),
             "routing_refresh_ttl": settings.pop("routing_refresh_ttl", None),
+            "fetch_size": settings.pop("fetch_size", None),
+            "acquire_timeout": settings.pop("acquire_timeout", None),
+            "maintenance_interval": settings.pop("maintenance_interval", None),
+            "min_idle": settings.pop("min_idle", None),
+            "max_idle_time": settings.pop("max_idle_time", None),
+            "load_balancing": settings.pop("load_balancing", None),
         }
         profile = ServiceProfile(profile, **settings)
         if connector_settings["init_size"] is None and not profile.routing:
             # Ensures credentials are checked on construction
             connector_settings["init_size"] = 1
-        self._connector = Connector(profile, **connector_settings)
+        if self.share_connectors:
+            self._connector = ConnectorRegistry.default().connector(self, profile,
+                                                                    **connector_settings)
+        else:
+            self._connector = Connector(profile, **connector_settings)
         self._graphs = {}
 
     def __repr__(self):
@@ -200,6 +223,20 @@ class GraphService(object):
         """
         return list(self)
 
+    def prefetch_routing_tables(self, graph_names=None):
+        """ Fetch routing tables for several graphs concurrently, to
+        avoid a delay on first use of each. This is useful for
+        services hosting many databases and has no effect if routing
+        is not enabled.
+
+        :param graph_names: names of graphs for which to fetch routing
+            tables; if omitted, tables are fetched for the default
+            graph and all graphs listed by :meth:`.keys`
+
+        *New in version 2021.2.*
+        """
+        self._connector.prefetch_routing_tables(graph_names)
+
     @property
     def kernel_version(self):
         """ The :class:`~packaging.version.Version` of Neo4j running.
@@ -268,12 +305,41 @@ class Graph(object):
     that can be passed to the constructor, the :class:`.Graph` class
     can accept several other settings:
 
-    ===================  ========================================================  ==============  =========================
-    Keyword              Description                                               Type            Default
-    ===================  ========================================================  ==============  =========================
-    ``user_agent``       User agent to send for all connections                    str             `(depends on URI scheme)`
-    ``max_connections``  The maximum number of simultaneous connections permitted  int             40
-    ===================  ========================================================  ==============  =========================
+    ========================  ==========================================================  ==============  =========================
+    Keyword                   Description                                                 Type            Default
+    ========================  ==========================================================  ==============  =========================
+    ``user_agent``            User agent to send for all connections                      str             `(depends on URI scheme)`
+    ``max_connections``       The maximum number of simultaneous connections permitted    int             40
+    ``fetch_size``            Number of records to pull per batch when streaming          int             `(pull all records)`
+    ``acquire_timeout``       Seconds to wait for a connection when the pool is full      float           60
+    ``maintenance_interval``  Seconds between background pool maintenance runs            float           `(no maintenance)`
+    ``min_idle``              Free connections to keep open in each pool                  int             0
+    ``max_idle_time``         Seconds after which idle connections are closed or checked  float           `(no limit)`
+    ``load_balancing``        Strategy for choosing between cluster readers               str             ``"least_connected"``
+    ========================  ==========================================================  ==============  =========================
+
+    When a ``fetch_size`` is set, query results are streamed over Bolt
+    4.0 and above: records are pulled from the server in batches of
+    that size as the :class:`~py2neo.cypher.Cursor` moves forward,
+    rather than all at once before the cursor is returned. The
+    connection used by a streamed query is held until the result has
+    been fully consumed or the cursor closed. Over HTTP, the response
+    body is read incrementally in the same way, so that only one
+    batch of records is held in memory at a time.
+
+    Setting a ``maintenance_interval`` starts a background thread that
+    keeps at least ``min_idle`` connections open in each pool, closes
+    connections that have expired or been idle for longer than
+    ``max_idle_time``, and checks the liveness of idle connections
+    that are kept. This moves connection setup and expiry away from
+    the path of each request.
+
+    For routed connections, the ``load_balancing`` setting selects how
+    read work is spread across cluster members. The default,
+    ``"least_connected"``, prefers the servers with fewest connections
+    in use. The alternative, ``"least_latency"``, also accounts for the
+    measured round-trip time of each server, so that reads drift away
+    from slow or overloaded members automatically.
 
     Once obtained, the `Graph` instance provides direct or indirect
     access to most of the functionality available within py2neo.
@@ -324,32 +390,62 @@ class Graph(object):
 
     # TRANSACTION MANAGEMENT #
 
-    def auto(self, readonly=False,
+    def auto(self, readonly=False, fetch_size=None, identity_map=None, compact=False,
              # after=None, metadata=None, timeout=None
              ):
         """ Create a new auto-commit :class:`~py2neo.Transaction`.
 
         :param readonly: if :py:const:`True`, will begin a readonly
             transaction, otherwise will begin as read-write
+        :param fetch_size: number of records to pull per batch when
+            streaming results, overriding the ``fetch_size`` setting
+            for this transaction only
+        :param identity_map: :class:`~py2neo.client.IdentityMap` used
+            to hydrate repeated occurrences of an entity within results
+            into a single object
+        :param compact: if :py:const:`True`, nodes and relationships
+            within results are hydrated into compact, read-only
+            :class:`~py2neo.data.FrozenNode` and
+            :class:`~py2neo.data.FrozenRelationship` objects
 
         *New in version 2020.0.*
+
+        *Changed in version 2021.2: added the 'fetch_size',
+        'identity_map' and 'compact' arguments.*
         """
         return Transaction(self, autocommit=True, readonly=readonly,
+                           fetch_size=fetch_size, identity_map=identity_map,
+                           compact=compact,
                            # after, metadata, timeout
                            )
 
-    def begin(self, readonly=False,
+    def begin(self, readonly=False, fetch_size=None, identity_map=None, compact=False,
               # after=None, metadata=None, timeout=None
               ):
         """ Begin a new :class:`~py2neo.Transaction`.
 
         :param readonly: if :py:const:`True`, will begin a readonly
             transaction, otherwise will begin as read-write
+        :param fetch_size: number of records to pull per batch when
+            streaming results, overriding the ``fetch_size`` setting
+            for this transaction only
+        :param identity_map: :class:`~py2neo.client.IdentityMap` used
+            to hydrate repeated occurrences of an entity within results
+            into a single object
+        :param compact: if :py:const:`True`, nodes and relationships
+            within results are hydrated into compact, read-only
+            :class:`~py2neo.data.FrozenNode` and
+            :class:`~py2neo.data.FrozenRelationship` objects
 
         *Changed in version 2021.1: the 'autocommit' argument has been
         removed. Use the 'auto' method instead.*
+
+        *Changed in version 2021.2: added the 'fetch_size',
+        'identity_map' and 'compact' arguments.*
         """
         return Transaction(self, autocommit=False, readonly=readonly,
+                           fetch_size=fetch_size, identity_map=identity_map,
+                           compact=compact,
                            # after, metadata, timeout
                            )
 
@@ -414,7 +510,7 @@ class Graph(object):
         :return: first value from the first record returned or
                  :py:const:`None`.
         """
-        return self.run(cypher, parameters, **kwparameters).evaluate()
+        return self.auto().evaluate(cypher, parameters, **kwparameters)
 
     def update(self, cypher, parameters=None, timeout=None):
         """ Execute a transactional unit of work that carries out
@@ -455,7 +551,12 @@ class Graph(object):
             else:
                 raise TypeError("Unrecognised parameter type")
         else:
-            self._update(lambda tx: tx.update(cypher, parameters), timeout=timeout)
+            # A single statement is run and committed together, which
+            # costs only one network round trip over Bolt 3.0+. As no
+            # result is returned, any records are discarded, not pulled.
+            self._update(lambda tx: tx.run_many([(cypher, parameters)],
+                                                commit=True, discard=True),
+                         timeout=timeout)
 
     def _update(self, f, timeout=None):
         from py2neo.timing import Timer
@@ -471,7 +572,8 @@ class Graph(object):
                 value = f(tx)
                 if isgenerator(value):
                     _ = list(value)     # exhaust the generator
-                self.commit(tx)
+                if not tx.closed:
+                    self.commit(tx)
             except (ConnectionUnavailable, ConnectionBroken, ConnectionLimit):
                 self.rollback(tx)
                 continue
@@ -904,12 +1006,16 @@ class Transaction(object):
     methods can be used to finish a transaction.
     """
 
-    def __init__(self, graph, autocommit=False, readonly=False,
+    def __init__(self, graph, autocommit=False, readonly=False, fetch_size=None,
+                 identity_map=None, compact=False,
                  # after=None, metadata=None, timeout=None
                  ):
         self._graph = graph
         self._autocommit = autocommit
         self._connector = self.graph.service.connector
+        self._fetch_size = fetch_size
+        self._identity_map = identity_map
+        self._compact = compact
         if autocommit:
             self._ref = None
         else:
@@ -941,6 +1047,33 @@ class Transaction(object):
         """
         return self._readonly
 
+    @property
+    def fetch_size(self):
+        """ The number of records pulled in each batch when streaming
+        results, or :const:`None` if results are pulled in full.
+        Unless overridden for this transaction, this is taken from
+        the ``fetch_size`` setting for the graph.
+        """
+        if self._fetch_size is None:
+            return self._connector.fetch_size
+        else:
+            return self._fetch_size
+
+    @property
+    def identity_map(self):
+        """ The :class:`~py2neo.client.IdentityMap` used to hydrate
+        entities within results, or :const:`None` if no identity map
+        is in use.
+        """
+        return self._identity_map
+
+    @property
+    def compact(self):
+        """ :py:const:`True` if entities within results are hydrated
+        into compact, read-only objects, :py:const:`False` otherwise.
+        """
+        return self._compact
+
     @property
     def closed(self):
         """ :py:const:`True` if this transaction is closed,
@@ -982,7 +1115,8 @@ class Transaction(object):
             raise TypeError("Cannot run query in closed transaction")
 
         try:
-            hydrant = Connection.default_hydrant(self._connector.profile, self.graph)
+            hydrant = Connection.default_hydrant(self._connector.profile, self.graph,
+                                                 self._identity_map, self._compact)
             parameters = dict(parameters or {}, **kwparameters)
             if self.ref:
                 result = self._connector.run(self.ref, cypher, parameters)
@@ -990,12 +1124,94 @@ class Transaction(object):
                 result = self._connector.auto_run(cypher, parameters,
                                                   graph_name=self.graph.name,
                                                   readonly=self.readonly)
-            self._connector.pull(result, -1)
-            return Cursor(result, hydrant)
+            fetch_size = self.fetch_size
+            if fetch_size and fetch_size > 0:
+                try:
+                    self._connector.pull(result, fetch_size)
+                except IndexError:
+                    # Flow control is not available for this
+                    # connection, so pull the entire result instead.
+                    self._connector.pull(result, -1)
+            else:
+                self._connector.pull(result, -1)
+            return Cursor(result, hydrant, connector=self._connector)
         finally:
             if not self.ref:
                 self._closed = True
 
+    def run_many(self, queries, commit=False, discard=False):
+        """ Send several Cypher queries to the server for execution,
+        and return a list of :py:class:`~.cypher.Cursor` objects for
+        navigating their results.
+
+        Over Bolt, the queries are pipelined: all are sent together
+        before any response is read, so the whole batch costs a single
+        network round trip. This is well suited to many small,
+        independent queries. All records are pulled for each query,
+        regardless of the ``fetch_size`` setting. If any query fails,
+        the error is raised and the transaction cannot continue.
+
+        If `commit` is true, the transaction is also committed once
+        the queries have been carried out. Over Bolt 3.0 and above,
+        the commit is pipelined along with the queries, so a short
+        transaction can be begun, run and committed in a single round
+        trip. The transaction is closed afterwards, as if it had been
+        passed to :meth:`.Graph.commit`. This also happens if the
+        commit fails because of a server error or disconnection, as
+        the transaction will already have been ended. After any other
+        error, the transaction is left open to be rolled back.
+
+        If `discard` is true, the records returned by each query are
+        discarded rather than pulled, so that only the summary of each
+        is available from its cursor. This is useful for queries that
+        are run only for their side effects.
+
+        This method is only available within explicit transactions.
+
+            >>> tx = graph.begin()
+            >>> cursors = tx.run_many([
+            ...     ("CREATE (a:Person {name: $name})", {"name": "Alice"}),
+            ...     ("CREATE (b:Person {name: $name})", {"name": "Bob"}),
+            ...     "MATCH (p:Person) RETURN count(p)",
+            ... ])
+            >>> graph.commit(tx)
+
+        :param queries: sequence of queries, each either a Cypher
+            string or a (cypher, parameters) tuple
+        :param commit: if true, commit the transaction after running
+            the queries
+        :param discard: if true, discard the records returned by the
+            queries
+        :returns: list of :py:class:`~.cypher.Cursor` objects
+
+        *New in version 2021.2.*
+        """
+        from py2neo.client import Connection
+
+        if self.closed:
+            raise TypeError("Cannot run query in closed transaction")
+        if not self.ref:
+            raise TypeError("Pipelined queries can only be run in an explicit transaction")
+        queries = [(query, {}) if isinstance(query, string_types) else
+                   (query[0], dict(query[1] or {})) for query in queries]
+        hydrant = Connection.default_hydrant(self._connector.profile, self.graph,
+                                             self._identity_map, self._compact)
+        try:
+            results = self._connector.run_many(self.ref, queries, commit=commit,
+                                               discard=discard)
+        except (ConnectionUnavailable, ConnectionBroken, Neo4jError):
+            # The server ends the transaction on failure or on
+            # disconnection, so there is nothing left to roll back.
+            if commit:
+                self._closed = True
+            raise
+        if commit:
+            self._bookmark = self.ref.bookmark
+            self._profile = results[-1].profile if results else None
+            self._time = self.ref.age
+            self._closed = True
+        return [Cursor(result, hydrant, connector=self._connector) for result in results]
+
     def evaluate(self, cypher, parameters=None, **kwparameters):
         """ Execute a single Cypher query and return the value from
         the first column of the first record.
@@ -1004,7 +1220,13 @@ class Transaction(object):
         :param parameters: dictionary of parameters
         :returns: single return value or :const:`None`
         """
-        return self.run(cypher, parameters, **kwparameters).evaluate(0)
+        cursor = self.run(cypher, parameters, **kwparameters)
+        try:
+            return cursor.evaluate(0)
+        finally:
+            # Any remaining records are discarded, so that the
+            # connection is released even if the result is streamed.
+            cursor.close()
 
     def update(self, cypher, parameters=None, **kwparameters):
         """ Execute a single Cypher statement and discard any result
@@ -34,8 +34,17 @@ from py2neo.compat import BaseRequestHandler
 
 class Wire(object):
     """ Buffered socket wrapper for reading and writing bytes.
+
+    Incoming data is received directly into a preallocated input
+    buffer, from which :meth:`.read` returns :class:`memoryview`
+    slices without copying. When the buffer fills, any unread bytes
+    are carried over into a fresh buffer rather than shifted in place,
+    so views returned by earlier reads always remain valid.
     """
 
+    #: Size of each input buffer allocated.
+    input_buffer_size = 65536
+
     __closed = False
 
     __broken = False
@@ -71,8 +80,10 @@ class Wire(object):
         self.__active_time = monotonic()
         self.__bytes_received = 0
         self.__bytes_sent = 0
-        self.__input = bytearray()
-        self.__input_len = 0
+        self.__input = bytearray(self.input_buffer_size)
+        self.__input_view = memoryview(self.__input)
+        self.__input_start = 0
+        self.__input_end = 0
         self.__output = bytearray()
         self.__on_broken = on_broken
 
@@ -110,34 +121,59 @@ class Wire(object):
 
     def read(self, n):
         """ Read bytes from the network.
+
+        :returns: :class:`memoryview` over the bytes read
         """
-        while self.__input_len < n:
-            required = n - self.__input_len
-            requested = max(required, 16384)
+        self.fill(n)
+        start = self.__input_start
+        self.__input_start = end = start + n
+        return self.__input_view[start:end]
+
+    def fill(self, n):
+        """ Receive data from the network until at least `n` bytes
+        of unread data are buffered. Any buffered data remains
+        available to :meth:`.peek` and :meth:`.read`.
+        """
+        while self.__input_end - self.__input_start < n:
+            if self.__input_start + n > len(self.__input):
+                self.__renew_input(n)
             try:
-                received = self.__socket.recv(requested)
+                received = self.__socket.recv_into(self.__input_view[self.__input_end:])
             except (IOError, OSError):
                 self.__mark_broken("Wire broken")
             else:
                 if received:
                     self.__active_time = monotonic()
-                    new_bytes_received = len(received)
-                    self.__input.extend(received)
-                    self.__input_len += new_bytes_received
-                    self.__bytes_received += new_bytes_received
+                    self.__input_end += received
+                    self.__bytes_received += received
                 else:
                     self.__mark_broken("Network read incomplete "
                                        "(received %d of %d bytes)" %
-                                       (self.__input_len, n))
-        data = self.__input[:n]
-        self.__input[:n] = []
-        self.__input_len -= n
-        return data
+                                       (self.__input_end - self.__input_start, n))
 
     def peek(self):
         """ Return any buffered unread data.
+
+        :returns: :class:`memoryview` over the unread bytes
         """
-        return self.__input
+        return self.__input_view[self.__input_start:self.__input_end]
+
+    def __renew_input(self, n):
+        # Allocate a new input buffer, large enough to hold at least
+        # n bytes, and carry over any unread data. The old buffer is
+        # left untouched, as views onto it may still be in use. Extra
+        # room is allowed for large reads, so that data arriving for
+        # a very large message is not repeatedly carried over.
+        unread = self.__input_view[self.__input_start:self.__input_end]
+        if n > self.input_buffer_size:
+            size = 2 * n
+        else:
+            size = self.input_buffer_size
+        self.__input = bytearray(size)
+        self.__input_view = memoryview(self.__input)
+        self.__input_end = len(unread)
+        self.__input_view[:self.__input_end] = unread
+        self.__input_start = 0
 
     def write(self, b):
         """ Write bytes to the output buffer.
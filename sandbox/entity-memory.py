@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Memory benchmark comparing full and compact (frozen) hydration of
+nodes and relationships. No server is required; RECORD messages are
+generated locally, hydrated in a single pass, and the memory retained
+by the resulting entities is measured with tracemalloc.
+
+Requires Python 3.
+"""
+
+
+from __future__ import print_function
+
+from gc import collect
+from sys import argv
+from tracemalloc import start, stop, take_snapshot
+
+from interchange.packstream import pack
+
+from py2neo.client.bolt import PackStreamHydrant, unpack_record
+
+
+class FakeGraph(object):
+
+    service = None
+    name = None
+
+    def pull(self, subgraph):
+        pass
+
+
+def node_record(identity):
+    data = bytearray([0xB1, 0x71, 0x91, 0xB3, 0x4E])
+    data.extend(pack(identity))
+    data.extend(pack([u"Person", u"Employee"]))
+    data.extend(pack({u"name": u"Person %d" % identity, u"age": identity % 100}))
+    return memoryview(bytes(data))
+
+
+def relationship_record(identity):
+    data = bytearray([0xB1, 0x71, 0x91, 0xB5, 0x52])
+    data.extend(pack(identity))
+    data.extend(pack(identity))
+    data.extend(pack(identity + 1))
+    data.extend(pack(u"KNOWS"))
+    data.extend(pack({u"since": 1999}))
+    return memoryview(bytes(data))
+
+
+def measure(messages, compact):
+    hydrant = PackStreamHydrant(FakeGraph(), compact=compact)
+    handlers = hydrant.structure_handlers
+    collect()
+    start()
+    before = take_snapshot()
+    entities = [unpack_record(message, handlers)[0] for message in messages]
+    collect()
+    after = take_snapshot()
+    stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size, entities
+
+
+def main():
+    try:
+        count = int(argv[1])
+    except IndexError:
+        count = 100000
+    print("Entities = {}".format(count))
+    for name, factory in [("node", node_record), ("relationship", relationship_record)]:
+        messages = [factory(i) for i in range(count)]
+        full, _ = measure(messages, compact=False)
+        compact, _ = measure(messages, compact=True)
+        print("Hydrating {} records... full {:.0f} bytes/entity, compact {:.0f} bytes/entity "
+              "({:.01f}x)".format(name, full / count, compact / count, full / compact))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Microbenchmark comparing two-pass hydration of HTTP results, in which
+JSON is first converted into PackStream structures and then hydrated,
+with the single-pass JSON hydrator. No server is required; REST format
+response bodies are generated locally and decoded from memory.
+"""
+
+
+from __future__ import print_function
+
+from json import dumps as json_dumps, loads as json_loads
+from sys import argv
+from timeit import Timer
+
+from py2neo.client.json import JSONHydrant
+
+
+def node(identity, labels, properties):
+    uri = "http://localhost:7474/db/data/node/%d" % identity
+    return {
+        "self": uri,
+        "labels": uri + "/labels",
+        "properties": uri + "/properties",
+        "metadata": {"id": identity, "labels": labels},
+        "data": properties,
+    }
+
+
+def relationship(identity, start, type_, end, properties):
+    uri = "http://localhost:7474/db/data/relationship/%d" % identity
+    return {
+        "self": uri,
+        "start": "http://localhost:7474/db/data/node/%d" % start,
+        "end": "http://localhost:7474/db/data/node/%d" % end,
+        "type": type_,
+        "properties": uri + "/properties",
+        "metadata": {"id": identity, "type": type_},
+        "data": properties,
+    }
+
+
+def body(rows, *values):
+    return json_dumps({
+        "results": [{"columns": ["v%d" % i for i in range(len(values))],
+                     "data": [{"rest": list(values)}] * rows}],
+        "errors": [],
+    })
+
+
+VALUES = {
+    "multi-type": (None, True, 0, 3.14, u"Abc", [1, 2, 3],
+                   {u"one": 1, u"two": 2, u"three": 3}),
+    "node": (node(12345, [u"Person"], {u"name": u"Alice", u"born": 1970}),),
+    "relationship": (relationship(678, 12345, u"KNOWS", 12346, {u"since": 1999}),),
+}
+
+
+def two_pass(data, hydrant):
+    content = json_loads(data, object_hook=JSONHydrant.json_to_packstream)
+    for record in content["results"][0]["data"]:
+        [hydrant.hydrate_object(value) for value in record["rest"]]
+
+
+def single_pass(data, hydrant):
+    content = json_loads(data)
+    for record in content["results"][0]["data"]:
+        hydrant.hydrate_list(record["rest"])
+
+
+def main():
+    try:
+        rows = int(argv[1])
+    except IndexError:
+        rows = 100000
+    print("Rows = {}".format(rows))
+    hydrant = JSONHydrant(None)
+    for name, values in VALUES.items():
+        data = body(rows, *values)
+        t0 = min(Timer(lambda: two_pass(data, hydrant)).repeat(repeat=3, number=1))
+        t1 = min(Timer(lambda: single_pass(data, hydrant)).repeat(repeat=3, number=1))
+        print("Decoding and hydrating {} records... two-pass {:.03f}s, single-pass {:.03f}s "
+              "({:.01f}x)".format(name, t0, t1, t0 / t1))
+
+
+if __name__ == "__main__":
+    main()
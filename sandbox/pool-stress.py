@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Multi-threaded stress benchmark for connection pool acquisition and
+release. No Neo4j server is required; connections are made to a local
+stub server that speaks just enough Bolt to accept a HELLO and
+acknowledge any subsequent request.
+
+Usage: pool-stress.py [THREADS [ITERATIONS [MAX_SIZE]]]
+"""
+
+
+from __future__ import print_function
+
+from sys import argv
+from threading import Thread
+
+from py2neo import ConnectionProfile
+from py2neo.client import ConnectionPool
+from py2neo.client.bolt import Bolt
+from py2neo.compat import TCPServer, ThreadingMixIn, perf_counter
+from py2neo.errors import ConnectionBroken
+from py2neo.wiring import WireRequestHandler
+
+
+class StubBoltServer(ThreadingMixIn, TCPServer):
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class StubBoltHandler(WireRequestHandler):
+
+    def handle(self):
+        bolt = Bolt.accept(self.wire)
+        while True:
+            try:
+                tag, fields = bolt.read_message()
+            except ConnectionBroken:
+                break
+            if tag == 0x02:  # GOODBYE
+                break
+            elif tag == 0x01:  # HELLO
+                bolt.write_message(0x70, [{"server": "Neo4j/4.3.0",
+                                           "connection_id": "bolt-stub"}])
+            else:
+                bolt.write_message(0x70, [{}])
+            bolt.send()
+
+
+def worker(pool, iterations, errors):
+    try:
+        for _ in range(iterations):
+            cx = pool.acquire()
+            cx.release()
+    except Exception as error:
+        errors.append(error)
+
+
+def main():
+    threads = int(argv[1]) if len(argv) > 1 else 100
+    iterations = int(argv[2]) if len(argv) > 2 else 1000
+    max_size = int(argv[3]) if len(argv) > 3 else 50
+    server = StubBoltServer(("127.0.0.1", 0), StubBoltHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    profile = ConnectionProfile("bolt://%s:%d" % (host, port))
+    pool = ConnectionPool.open(profile, max_size=max_size)
+    errors = []
+    workers = [Thread(target=worker, args=(pool, iterations, errors))
+               for _ in range(threads)]
+    t0 = perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    t1 = perf_counter()
+    total = threads * iterations
+    print("Threads = {}, iterations = {}, max_size = {}".format(threads, iterations, max_size))
+    print("Completed {} acquire/release cycles in {:.03f}s ({:.0f}/s)".format(
+        total, t1 - t0, total / (t1 - t0)))
+    print("Pool size = {}, in use = {}, errors = {}".format(pool.size, pool.in_use, len(errors)))
+    for error in errors[:5]:
+        print("  {!r}".format(error))
+    assert pool.in_use == 0, "Connections were not returned to the pool"
+    assert pool.size <= max_size, "Pool exceeded its maximum size"
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
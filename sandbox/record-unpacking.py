@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Microbenchmark comparing the specialised RECORD unpacker with the
+general-purpose PackStream unpacker, and comparing separate unpacking
+and hydration with a single fused pass. No server is required; RECORD
+messages are generated locally and unpacked from memory.
+"""
+
+
+from __future__ import print_function
+
+from sys import argv
+from timeit import Timer
+
+from interchange.packstream import pack, unpack
+
+from py2neo.client.bolt import PackStreamHydrant, unpack_record
+
+
+def node(identity, labels, properties):
+    return bytearray([0xB3, 0x4E]) + pack(identity) + pack(labels) + pack(properties)
+
+
+def record(*values):
+    data = bytearray([0xB1, 0x71, 0x90 + len(values)])
+    for value in values:
+        if isinstance(value, bytearray):
+            data.extend(value)
+        else:
+            data.extend(pack(value))
+    return memoryview(bytes(data))
+
+
+RECORDS = {
+    "narrow": record(0),
+    "triple string": record(u"aaaaaaaaa", u"bbbbbbbbb", u"ccccccccc"),
+    "multi-type": record(None, True, 0, 3.14, u"Abc", [1, 2, 3],
+                         {u"one": 1, u"two": 2, u"three": 3}),
+    "node": record(node(12345, [u"Person"], {u"name": u"Alice", u"born": 1970})),
+}
+
+
+def generic(messages):
+    for message in messages:
+        list(unpack(message, offset=2))
+
+
+def specialised(messages):
+    for message in messages:
+        unpack_record(message)
+
+
+def generic_hydrated(messages, hydrant):
+    for message in messages:
+        hydrant.hydrate_list(list(unpack(message, offset=2))[0])
+
+
+def fused(messages, hydrant):
+    for message in messages:
+        unpack_record(message, hydrant.structure_handlers)
+
+
+def main():
+    try:
+        rows = int(argv[1])
+    except IndexError:
+        rows = 1000000
+    print("Rows = {}".format(rows))
+    for name, message in RECORDS.items():
+        assert unpack_record(message) == list(unpack(message, offset=2))
+        messages = [message] * rows
+        t0 = min(Timer(lambda: generic(messages)).repeat(repeat=3, number=1))
+        t1 = min(Timer(lambda: specialised(messages)).repeat(repeat=3, number=1))
+        print("Unpacking {} records... generic {:.03f}s, specialised {:.03f}s "
+              "({:.01f}x)".format(name, t0, t1, t0 / t1))
+    hydrant = PackStreamHydrant(None)
+    messages = [RECORDS["node"]] * rows
+    t0 = min(Timer(lambda: generic_hydrated(messages, hydrant)).repeat(repeat=3, number=1))
+    t1 = min(Timer(lambda: fused(messages, hydrant)).repeat(repeat=3, number=1))
+    print("Unpacking and hydrating node records... separate {:.03f}s, fused {:.03f}s "
+          "({:.01f}x)".format(t0, t1, t0 / t1))
+
+
+if __name__ == "__main__":
+    main()
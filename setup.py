@@ -18,9 +18,11 @@
 
 
 from os import getenv, path
+from sys import version_info
 from warnings import warn
 
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 
 from py2neo.meta import VERSION_FILE, get_metadata, parse_version_string
 
@@ -28,11 +30,28 @@ from py2neo.meta import VERSION_FILE, get_metadata, parse_version_string
 README_FILE = path.join(path.dirname(__file__), "README.rst")
 
 
+#: Modules that use syntax unavailable before Python 3.5, each as a
+#: 2-tuple of (package, module). These are left out of builds under
+#: earlier versions, so that they are not byte-compiled on install.
+PY35_MODULES = [
+    ("py2neo.aio", "core"),
+]
+
+
 def get_readme():
     with open(README_FILE) as f:
         return f.read()
 
 
+class BuildPy(build_py):
+
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if version_info < (3, 5):
+            modules = [(p, m, f) for p, m, f in modules if (p, m) not in PY35_MODULES]
+        return modules
+
+
 class Release(object):
 
     def __init__(self):
@@ -88,6 +107,9 @@ with Release():
     setup(**dict(get_metadata(), **{
         "long_description": get_readme(),
         "long_description_content_type": "text/x-rst",
+        "cmdclass": {
+            "build_py": BuildPy,
+        },
         "entry_points": {
             "console_scripts": [
             ],
@@ -0,0 +1,559 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from struct import pack as struct_pack
+
+from interchange.packstream import pack, unpack, Structure
+from interchange.time import Date
+from pytest import fixture, raises
+
+from py2neo import ConnectionProfile
+from py2neo.client import Bookmark
+from py2neo.client.bolt import Bolt4x0, BoltMessageReader, PackStreamHydrant, unpack_record
+from py2neo.cypher import Cursor
+from py2neo.data import Node, Relationship, Path, FrozenNode, FrozenRelationship
+from py2neo.errors import ConnectionBroken, Neo4jError
+from py2neo.wiring import Wire
+
+
+class ScriptedSocket(object):
+    """ Fake socket that plays back a fixed script of server responses
+    and collects everything sent by the client.
+    """
+
+    def __init__(self, in_data=b"", max_recv=None):
+        self._in_buffer = bytearray(in_data)
+        self._max_recv = max_recv
+        self.sent = bytearray()
+        self.sends = 0
+
+    def settimeout(self, value):
+        pass
+
+    def getsockname(self):
+        return "127.0.0.1", 50000
+
+    def recv(self, n_bytes, flags=None):
+        if self._max_recv:
+            n_bytes = min(n_bytes, self._max_recv)
+        value = bytes(self._in_buffer[:n_bytes])
+        self._in_buffer[:n_bytes] = []
+        return value
+
+    def recv_into(self, buffer, n_bytes=0, flags=None):
+        value = self.recv(n_bytes or len(buffer), flags)
+        buffer[:len(value)] = value
+        return len(value)
+
+    def send(self, b, flags=None):
+        self.sent.extend(b)
+        self.sends += 1
+        return len(b)
+
+    def close(self):
+        pass
+
+
+def message(tag, *fields):
+    """ Encode a single message as chunked Bolt data.
+    """
+    data = bytearray([0xB0 + len(fields), tag]) + pack(*fields)
+    return struct_pack(">H", len(data)) + bytes(data) + b"\x00\x00"
+
+
+def success(**metadata):
+    return message(0x70, metadata)
+
+
+def record(*values):
+    return message(0x71, list(values))
+
+
+def structure(tag, *fields):
+    """ Encode a structure, with fields given as pre-encoded bytes.
+    """
+    return bytes(bytearray([0xB0 + len(fields), tag])) + b"".join(fields)
+
+
+def graph_record(*encoded_values):
+    """ Encode a RECORD message, with values given as pre-encoded bytes.
+    """
+    data = bytearray([0xB1, 0x71, 0x90 + len(encoded_values)]) + b"".join(encoded_values)
+    return struct_pack(">H", len(data)) + bytes(data) + b"\x00\x00"
+
+
+def sent_messages(data):
+    """ Decode all messages sent by the client.
+    """
+    data = bytes(data)
+    messages = []
+    chunks = []
+    p = 0
+    while p < len(data):
+        size = data[p] << 8 | data[p + 1]
+        p += 2
+        if size == 0:
+            if chunks:
+                body = b"".join(chunks)
+                messages.append((body[1], list(unpack(body, offset=2))))
+                chunks = []
+        else:
+            chunks.append(data[p:p + size])
+            p += size
+    return messages
+
+
+def test_reader_unpacks_all_buffered_messages():
+    s = ScriptedSocket(success(fields=["n"]) + record(1) + record(2) + success())
+    reader = BoltMessageReader(Wire(s))
+    assert reader.read_message() == (0x70, [{"fields": ["n"]}])
+    assert reader.peek_message() == 0x71
+    tag, fields = reader.read_message()
+    assert tag == 0x71 and unpack_record(fields[0]) == [[1]]
+    tag, fields = reader.read_message()
+    assert tag == 0x71 and unpack_record(fields[0]) == [[2]]
+    assert reader.read_message() == (0x70, [{}])
+    assert reader.peek_message() is None
+
+
+def test_reader_skips_keep_alive_messages():
+    s = ScriptedSocket(b"\x00\x00" + b"\x00\x00" + success())
+    reader = BoltMessageReader(Wire(s))
+    assert reader.read_message() == (0x70, [{}])
+
+
+def test_reader_joins_chunks_split_across_reads():
+    data = bytearray([0xB1, 0x71]) + pack([u"hello, world"])
+    chunked = (struct_pack(">H", 5) + bytes(data[:5]) +
+               struct_pack(">H", len(data) - 5) + bytes(data[5:]) +
+               b"\x00\x00")
+    s = ScriptedSocket(chunked + record(2), max_recv=3)
+    reader = BoltMessageReader(Wire(s))
+    tag, fields = reader.read_message()
+    assert tag == 0x71 and unpack_record(fields[0]) == [[u"hello, world"]]
+    tag, fields = reader.read_message()
+    assert tag == 0x71 and unpack_record(fields[0]) == [[2]]
+
+
+def test_unpack_record_matches_generic_unpacker():
+    values = [None, True, False, 0, -1, -17, 127, 128, -129, 32768, -32769,
+              2 ** 31, -2 ** 40, 3.14, u"", u"a" * 15, u"\u00e9" * 300, b"\x00\x01",
+              list(range(20)), list(range(300)), {u"one": 1, u"two": [2]},
+              dict((u"%d" % i, i) for i in range(20))]
+    data = bytearray([0xB1, 0x71, 0xD4, len(values) + 2])
+    for value in values:
+        data.extend(pack(value))
+    data.extend(bytearray([0xB3, 0x4E]) + pack(1) + pack([u"Person"]) + pack({u"name": u"Alice"}))
+    data.extend(bytearray([0xB1, 0x44]) + pack(18000))  # date
+    data = memoryview(bytes(data))
+    assert unpack_record(data) == list(unpack(data, offset=2))
+
+
+def test_unpack_record_handles_large_structures():
+    fields = [pack(i) for i in range(20)]
+    struct_8 = bytearray([0xDC, 20, 0x4E]) + b"".join(fields)
+    struct_16 = bytearray([0xDD, 0, 20, 0x7A]) + b"".join(fields)
+    data = bytearray([0xB1, 0x71, 0x94]) + struct_8 + struct_16
+    data.extend(bytearray([0xB1, 0x44]) + pack(18000))  # date
+    data.extend(bytearray([0xB1, 0x7A]) + struct_8)  # unknown tag, nested
+    values = unpack_record(memoryview(bytes(data)))[0]
+    assert values[0] == Structure(0x4E, *range(20))
+    assert values[1] == Structure(0x7A, *range(20))
+    assert values[2] == Date(2019, 4, 14)
+    assert values[3] == Structure(0x7A, Structure(0x4E, *range(20)))
+    handled = unpack_record(data, {0x4E: lambda *f: sum(f)})[0]
+    assert handled[0] == sum(range(20))
+
+
+@fixture
+def scripted_bolt():
+    def bolt(*responses):
+        s = ScriptedSocket(b"".join(responses))
+        released = []
+        cx = Bolt4x0(Wire(s), ConnectionProfile(), on_release=released.append)
+        return cx, s, released
+    return bolt
+
+
+def test_streamed_auto_run_pulls_in_batches(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), record(2), success(has_more=True),
+        record(3), record(4), success(has_more=True),
+        record(5), success(),
+    )
+    result = cx.auto_run("UNWIND range(1, 5) AS n RETURN n")
+    cx.pull(result, 2)
+    assert result.fields() == ["n"]
+    values = []
+    while True:
+        value = result.fetch()
+        if value is None:
+            break
+        values.append(value)
+    assert values == [[1], [2], [3], [4], [5]]
+    pulls = [fields[0] for tag, fields in sent_messages(s.sent) if tag == 0x3F]
+    assert pulls == [{"n": 2, "qid": -1}] * 3
+    assert result.complete()
+    assert released == [cx]
+
+
+def test_streamed_result_is_not_released_until_consumed(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), record(2), success(has_more=True),
+    )
+    result = cx.auto_run("UNWIND range(1, 5) AS n RETURN n")
+    cx.pull(result, 2)
+    assert result.fetch() == [1]
+    assert result.fetch() == [2]
+    assert not result.complete()
+    assert released == []
+
+
+def test_discarding_streamed_result_releases_connection(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), record(2), success(has_more=True),
+        success(),
+    )
+    result = cx.auto_run("UNWIND range(1, 5) AS n RETURN n")
+    cx.pull(result, 2)
+    result.discard()
+    assert result.complete()
+    assert released == [cx]
+
+
+def test_commit_discards_open_results(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=["n"], qid=0),
+        record(1), record(2), success(has_more=True),
+        success(),
+        success(bookmark="bm:1"),
+    )
+    tx = cx.begin(None)
+    result = cx.run(tx, "UNWIND range(1, 5) AS n RETURN n")
+    cx.pull(result, 2)
+    cx.commit(tx)
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x11, 0x10, 0x3F, 0x2F, 0x12]
+    assert result.complete()
+    assert released == [cx]
+
+
+def test_next_batch_is_requested_before_buffer_is_empty(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), record(2), success(has_more=True),
+        record(3), record(4), success(),
+    )
+    result = cx.auto_run("UNWIND range(1, 4) AS n RETURN n")
+    cx.pull(result, 2)
+    assert result.fetch() == [1]
+    pulls = [fields[0] for tag, fields in sent_messages(s.sent) if tag == 0x3F]
+    assert pulls == [{"n": 2, "qid": -1}] * 2
+    assert not result.last().done()
+    assert result.fetch() == [2]
+    assert result.fetch() == [3]
+    assert result.fetch() == [4]
+    assert result.fetch() is None
+    assert result.complete()
+    assert released == [cx]
+
+
+def test_discard_waits_for_outstanding_pull(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), record(2), success(has_more=True),
+        record(3), success(),
+    )
+    result = cx.auto_run("UNWIND range(1, 3) AS n RETURN n")
+    cx.pull(result, 2)
+    assert result.fetch() == [1]
+    result.discard()
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x10, 0x3F, 0x3F]
+    assert result.complete()
+    assert released == [cx]
+
+
+def test_cursor_records_are_hydrated_while_unpacking(scripted_bolt):
+
+    class FakeGraph(object):
+
+        service = None
+        name = None
+
+        def pull(self, subgraph):
+            pass
+
+    class SinglePassHydrant(PackStreamHydrant):
+
+        def hydrate_list(self, obj):
+            raise AssertionError("Records should not need a second pass")
+
+    alice = structure(0x4E, pack(1), pack([u"Person"]), pack({u"name": u"Alice"}))
+    bob = structure(0x4E, pack(2), pack([u"Person"]), pack({u"name": u"Bob"}))
+    knows = structure(0x52, pack(9), pack(1), pack(2), pack(u"KNOWS"), pack({}))
+    path = structure(0x50, b"\x92" + alice + bob,
+                     b"\x91" + structure(0x72, pack(9), pack(u"KNOWS"), pack({})),
+                     pack([1, 1]))
+    cx, s, released = scripted_bolt(
+        success(fields=["a", "r", "p"]),
+        graph_record(alice, knows, path),
+        success(),
+    )
+    result = cx.auto_run("MATCH p=(a)-[r]->(b) RETURN a, r, p")
+    cx.pull(result)
+    cursor = Cursor(result, SinglePassHydrant(FakeGraph()))
+    a, r, p = next(cursor)
+    assert isinstance(a, Node)
+    assert a.identity == 1 and set(a.labels) == {u"Person"} and a[u"name"] == u"Alice"
+    assert isinstance(r, Relationship)
+    assert r.identity == 9 and type(r).__name__ == "KNOWS"
+    assert r.start_node.identity == 1 and r.end_node.identity == 2
+    assert isinstance(p, Path)
+    assert [node.identity for node in p.nodes] == [1, 2]
+    assert [rel.identity for rel in p.relationships] == [9]
+
+
+def test_compact_hydration_gives_frozen_entities(scripted_bolt):
+    alice = structure(0x4E, pack(1), pack([u"Person"]), pack({u"name": u"Alice"}))
+    knows = structure(0x52, pack(9), pack(1), pack(2), pack(u"KNOWS"), pack({}))
+    cx, s, released = scripted_bolt(
+        success(fields=["a", "r"]),
+        graph_record(alice, knows),
+        success(),
+    )
+    result = cx.auto_run("MATCH (a)-[r]->(b) RETURN a, r")
+    cx.pull(result)
+    cursor = Cursor(result, PackStreamHydrant(None, compact=True))
+    a, r = next(cursor)
+    assert isinstance(a, FrozenNode)
+    assert a.identity == 1 and a.labels == {u"Person"} and a[u"name"] == u"Alice"
+    assert isinstance(r, FrozenRelationship)
+    assert r.identity == 9 and r.type == u"KNOWS"
+    assert r.start_node.identity == 1 and r.end_node.identity == 2
+
+
+def test_clean_connection_is_not_reset(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), success(),
+    )
+    result = cx.auto_run("RETURN 1 AS n")
+    cx.pull(result)
+    assert cx.clean
+    assert cx.reset() is False
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x10, 0x3F]
+
+
+def test_connection_is_reset_after_failure(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        message(0x7F, {"code": "Neo.ClientError.Statement.SyntaxError", "message": "X"}),
+        message(0x7E),
+        success(),
+    )
+    result = cx.auto_run("X")
+    with raises(Neo4jError):
+        cx.pull(result)
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x10, 0x3F, 0x0F]
+    assert cx.clean
+
+
+def test_round_trip_latency_is_measured_for_synchronous_requests(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(fields=["n"]),
+        record(1), success(),
+    )
+    assert cx.take_latency() is None
+    result = cx.auto_run("RETURN 1 AS n")
+    cx.pull(result)
+    latency = cx.take_latency()
+    assert latency is not None and latency >= 0
+    assert cx.take_latency() is None
+
+
+def test_run_many_pipelines_queries_in_a_single_send(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=["n"]), record(1), success(),
+        success(fields=["n"]), record(2), success(),
+        success(fields=["n"]), record(3), success(),
+    )
+    tx = cx.begin(None)
+    sends = s.sends
+    results = cx.run_many(tx, [("RETURN $n AS n", {"n": n}) for n in (1, 2, 3)])
+    assert s.sends == sends + 1
+    assert [result.take() for result in results] == [[1], [2], [3]]
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x11, 0x10, 0x3F, 0x10, 0x3F, 0x10, 0x3F]
+
+
+def test_run_many_raises_failure_from_failed_query(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=["n"]), record(1), success(),
+        message(0x7F, {"code": "Neo.ClientError.Statement.SyntaxError", "message": "X"}),
+        message(0x7E),
+        message(0x7E), message(0x7E),
+        success(),
+    )
+    tx = cx.begin(None)
+    with raises(Neo4jError) as e:
+        cx.run_many(tx, [("RETURN 1 AS n", {}), ("X", {}), ("RETURN 3 AS n", {})])
+    assert e.value.title == "SyntaxError"
+    assert cx.clean
+
+
+def test_begin_is_sent_with_first_query(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=["n"]), record(1), success(),
+    )
+    tx = cx.begin(None)
+    assert s.sends == 0
+    result = cx.run(tx, "RETURN 1 AS n")
+    cx.pull(result)
+    assert s.sends == 1
+    assert result.take() == [1]
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x11, 0x10, 0x3F]
+
+
+def test_begin_failure_is_raised_by_first_query(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        message(0x7F, {"code": "Neo.ClientError.Database.DatabaseNotFound", "message": "X"}),
+        message(0x7E), message(0x7E),
+        success(),
+    )
+    tx = cx.begin("nowhere")
+    result = cx.run(tx, "RETURN 1 AS n")
+    with raises(Neo4jError) as e:
+        cx.pull(result)
+    assert e.value.title == "DatabaseNotFound"
+    assert cx in released
+
+
+def test_begin_failure_is_raised_as_is_by_commit_of_empty_transaction(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        message(0x7F, {"code": "Neo.ClientError.Database.DatabaseNotFound", "message": "X"}),
+        message(0x7E),
+        success(),
+    )
+    tx = cx.begin("nowhere")
+    with raises(Neo4jError) as e:
+        cx.commit(tx)
+    assert e.value.title == "DatabaseNotFound"
+    assert tx.broken
+    assert cx in released
+    assert cx.clean
+
+
+def test_begin_failure_is_raised_as_is_by_rollback_of_empty_transaction(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        message(0x7F, {"code": "Neo.ClientError.Security.Forbidden", "message": "X"}),
+        message(0x7E),
+        success(),
+    )
+    tx = cx.begin(None)
+    with raises(Neo4jError) as e:
+        cx.rollback(tx)
+    assert e.value.title == "Forbidden"
+    assert cx in released
+
+
+def test_begin_failure_is_raised_as_is_by_run_many_with_commit(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        message(0x7F, {"code": "Neo.ClientError.Database.DatabaseNotFound", "message": "X"}),
+        message(0x7E),
+        success(),
+    )
+    tx = cx.begin("nowhere")
+    with raises(Neo4jError) as e:
+        cx.run_many(tx, [], commit=True)
+    assert e.value.title == "DatabaseNotFound"
+    assert cx in released
+
+
+def test_run_many_with_commit_costs_one_round_trip(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=[]), success(),
+        success(bookmark="bm:1"),
+    )
+    tx = cx.begin(None)
+    cx.run_many(tx, [("CREATE ()", {})], commit=True)
+    assert s.sends == 1
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x11, 0x10, 0x3F, 0x12]
+    assert tx.bookmark == Bookmark("bm:1")
+    assert released == [cx]
+    assert cx.clean
+
+
+def test_run_many_can_discard_records(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=["n"]), success(stats={"nodes-created": 1}),
+        success(bookmark="bm:1"),
+    )
+    tx = cx.begin(None)
+    result, = cx.run_many(tx, [("CREATE (a) RETURN a", {})], commit=True, discard=True)
+    assert s.sends == 1
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x11, 0x10, 0x2F, 0x12]
+    assert result.take() is None
+    assert result.summary()["stats"] == {"nodes-created": 1}
+    assert released == [cx]
+
+
+def test_transaction_can_be_rolled_back_after_run_many_fails_to_queue(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=["n"]), record(1), success(),
+        success(),
+    )
+    tx = cx.begin(None)
+    with raises(TypeError):
+        cx.run_many(tx, [("RETURN 1 AS n", {}), ("RETURN $x", {"x": object()})], commit=True)
+    assert s.sends == 0
+    cx.rollback(tx)
+    tags = [tag for tag, fields in sent_messages(s.sent)]
+    assert tags == [0x11, 0x10, 0x3F, 0x13]
+    assert released == [cx]
+    assert cx.clean
+
+
+def test_run_many_commit_failure_breaks_transaction(scripted_bolt):
+    cx, s, released = scripted_bolt(
+        success(),
+        success(fields=[]), success(),
+        message(0x7F, {"code": "Neo.ClientError.Schema.ConstraintValidationFailed",
+                       "message": "X"}),
+        success(),
+    )
+    tx = cx.begin(None)
+    with raises(ConnectionBroken):
+        cx.run_many(tx, [("CREATE ()", {})], commit=True)
+    assert tx.broken
+    assert cx in released
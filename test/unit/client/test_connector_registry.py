@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from gc import collect
+
+from py2neo.client import ConnectorRegistry
+
+
+# Routing profiles do not open any connections on construction.
+URI = "neo4j://localhost:7687"
+
+
+class User(object):
+    pass
+
+
+def test_equivalent_users_share_connector():
+    registry = ConnectorRegistry()
+    a, b = User(), User()
+    assert registry.connector(a, URI, max_size=5) is registry.connector(b, URI, max_size=5)
+    assert len(registry) == 1
+
+
+def test_different_settings_give_different_connectors():
+    registry = ConnectorRegistry()
+    a, b = User(), User()
+    assert registry.connector(a, URI, max_size=5) is not registry.connector(b, URI, max_size=6)
+    assert len(registry) == 2
+
+
+def test_connector_is_kept_for_reuse_after_last_user_has_gone():
+    registry = ConnectorRegistry()
+    user = User()
+    connector = registry.connector(user, URI)
+    del user
+    collect()
+    assert not connector.closed
+    assert registry.connector(User(), URI) is connector
+
+
+def test_least_recently_used_unused_connectors_are_closed():
+    registry = ConnectorRegistry()
+    registry.max_unused = 1
+    a, b = User(), User()
+    connector_a = registry.connector(a, URI, max_size=1)
+    connector_b = registry.connector(b, URI, max_size=2)
+    del a
+    collect()
+    del b
+    collect()
+    assert connector_a.closed
+    assert not connector_b.closed
+    assert len(registry) == 1
+
+
+def test_closed_connector_is_replaced():
+    registry = ConnectorRegistry()
+    a, b = User(), User()
+    connector = registry.connector(a, URI)
+    connector.close()
+    assert registry.connector(b, URI) is not connector
+
+
+def test_parent_connectors_are_not_used_or_closed_after_fork():
+    registry = ConnectorRegistry()
+    a, b = User(), User()
+    connector = registry.connector(a, URI)
+    registry._pid = -1  # simulate a fork
+    assert registry.connector(b, URI) is not connector
+    assert not connector.closed
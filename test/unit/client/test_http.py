@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from json import dumps as json_dumps, loads as json_loads
+from threading import Thread
+
+from pytest import fixture, raises
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from py2neo import ConnectionProfile
+from py2neo.client.http import HTTP, HTTPPoolRegistry, HTTPResponseStream
+from py2neo.errors import Neo4jError
+
+
+class StubHTTPHandler(BaseHTTPRequestHandler):
+    """ Handler that speaks just enough of the Neo4j HTTP API for a
+    connection to be opened and simple queries to be run. Every
+    query returns its "n" parameter as a single record.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path))
+        if self.path == "/":
+            self.reply({"neo4j_version": "4.3.0", "neo4j_edition": "community"})
+        else:
+            self.reply({})
+
+    def do_POST(self):
+        body = json_loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(("POST", self.path, len(body["statements"])))
+        results = [{"columns": ["n"], "data": [{"rest": [n]} for n in self.values(s["parameters"])],
+                    "stats": {"nodes_created": 0}}
+                   for s in body["statements"]]
+        errors = [{"code": "Neo.ClientError.Statement.ArithmeticError", "message": "/ by zero"}
+                  for s in body["statements"] if s["parameters"].get("fail")]
+        if self.path == "/db/data/transaction":
+            self.reply({"results": results, "errors": errors}, status=201,
+                       location="http://localhost/db/data/transaction/7")
+        else:
+            self.reply({"results": results, "errors": errors})
+
+    @classmethod
+    def values(cls, parameters):
+        if "rows" in parameters:
+            return range(parameters["rows"])
+        else:
+            return [parameters["n"]]
+
+    def do_DELETE(self):
+        self.server.requests.append(("DELETE", self.path))
+        self.reply({"results": [], "errors": []})
+
+    def reply(self, content, status=200, location=None):
+        data = json_dumps(content).encode("utf-8")
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@fixture
+def server():
+    server = HTTPServer(("127.0.0.1", 0), StubHTTPHandler)
+    server.requests = []
+    thread = Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def profile_for(server, **settings):
+    host, port = server.server_address
+    return ConnectionProfile("http://%s:%d" % (host, port), **settings)
+
+
+def test_registry_shares_pool_between_users_of_same_server():
+    registry = HTTPPoolRegistry()
+    a = registry.acquire(ConnectionProfile("http://localhost:7474"))
+    b = registry.acquire(ConnectionProfile("http://localhost:7474", user="bob"))
+    c = registry.acquire(ConnectionProfile("http://localhost:7475"))
+    assert a is b
+    assert a is not c
+    assert len(registry) == 2
+
+
+def test_registry_closes_pool_after_last_user():
+    registry = HTTPPoolRegistry()
+    profile = ConnectionProfile("http://localhost:7474")
+    a = registry.acquire(profile)
+    registry.acquire(profile)
+    registry.release(a)
+    assert a.http_pool.pool is not None
+    registry.release(a)
+    assert a.http_pool.pool is None
+    assert len(registry) == 0
+    assert registry.acquire(profile) is not a
+
+
+def test_registry_grows_pool_to_hold_connection_for_every_user():
+    registry = HTTPPoolRegistry()
+    registry.initial_size = 2
+    profile = ConnectionProfile("http://localhost:7474")
+    a = registry.acquire(profile)
+    registry.acquire(profile)
+    first_pool = a.http_pool
+    assert first_pool.pool.maxsize == 2
+    registry.acquire(profile)
+    assert a.size == 4
+    assert a.http_pool is not first_pool
+    assert a.http_pool.pool.maxsize == 4
+    assert first_pool.pool is None
+
+
+def test_registry_forgets_parent_pools_after_fork():
+    registry = HTTPPoolRegistry()
+    profile = ConnectionProfile("http://localhost:7474")
+    a = registry.acquire(profile)
+    registry._pid = -1  # simulate a fork
+    assert registry.acquire(profile) is not a
+    assert a.http_pool.pool is not None
+
+
+def test_server_discovery_is_only_carried_out_once(server):
+    a = HTTP.open(profile_for(server))
+    b = HTTP.open(profile_for(server))
+    assert a.server_agent == b.server_agent == "Neo4j/4.3.0"
+    assert server.requests == [("GET", "/"), ("GET", "/db/data/")]
+    c = HTTP.open(profile_for(server, user="bob"))
+    assert server.requests[2:] == [("GET", "/db/data/")]
+    for cx in (a, b, c):
+        cx.close()
+
+
+def test_connections_share_keep_alive_sockets(server):
+    a = HTTP.open(profile_for(server))
+    b = HTTP.open(profile_for(server))
+    assert a.http_pool is b.http_pool
+    for cx in (a, b, a, b):
+        result = cx.auto_run("RETURN $n", {"n": 1})
+        assert result.fetch() == [1]
+    assert a.http_pool.num_connections == 1
+    a.close()
+    b.close()
+
+
+def test_run_many_begins_transaction_in_same_request(server):
+    cx = HTTP.open(profile_for(server))
+    del server.requests[:]
+    tx = cx.begin(None)
+    assert not tx.begun
+    results = cx.run_many(tx, [("RETURN $n", {"n": n}) for n in (1, 2, 3)])
+    assert [result.take() for result in results] == [[1], [2], [3]]
+    assert server.requests == [("POST", "/db/data/transaction", 3)]
+    assert tx.begun and tx.txid == "7"
+    cx.run(tx, "RETURN $n", {"n": 4})
+    cx.commit(tx)
+    assert server.requests[1:] == [("POST", "/db/data/transaction/7", 1),
+                                   ("POST", "/db/data/transaction/7/commit", 0)]
+    cx.close()
+
+
+def test_run_many_with_commit_uses_single_request(server):
+    cx = HTTP.open(profile_for(server))
+    del server.requests[:]
+    tx = cx.begin(None)
+    results = cx.run_many(tx, [("RETURN $n", {"n": 1}), ("RETURN $n", {"n": 2})], commit=True)
+    assert [result.take() for result in results] == [[1], [2]]
+    assert server.requests == [("POST", "/db/data/transaction/commit", 2)]
+    assert tx.bookmark is not None
+    cx.close()
+
+
+def test_run_many_with_commit_in_open_transaction(server):
+    cx = HTTP.open(profile_for(server))
+    tx = cx.begin(None)
+    cx.run(tx, "RETURN $n", {"n": 1})
+    del server.requests[:]
+    cx.run_many(tx, [("RETURN $n", {"n": 2})], commit=True)
+    assert server.requests == [("POST", "/db/data/transaction/7/commit", 1)]
+    cx.close()
+
+
+def test_run_many_can_discard_records(server):
+    cx = HTTP.open(profile_for(server))
+    del server.requests[:]
+    tx = cx.begin(None)
+    result, = cx.run_many(tx, [("RETURN $n", {"n": 1})], commit=True, discard=True)
+    assert server.requests == [("POST", "/db/data/transaction/commit", 1)]
+    assert result.take() is None
+    assert result.summary() == {"stats": {"nodes_created": 0}}
+    cx.close()
+
+
+def test_ending_transaction_without_statements_sends_nothing(server):
+    cx = HTTP.open(profile_for(server))
+    del server.requests[:]
+    cx.commit(cx.begin(None))
+    cx.rollback(cx.begin(None))
+    assert server.requests == []
+    cx.close()
+
+
+@fixture
+def small_chunks():
+    chunk_size = HTTPResponseStream.chunk_size
+    HTTPResponseStream.chunk_size = 64
+    yield
+    HTTPResponseStream.chunk_size = chunk_size
+
+
+def test_records_are_streamed_as_they_are_pulled(server, small_chunks):
+    cx = HTTP.open(profile_for(server))
+    tx = cx.begin(None)
+    result = cx.run(tx, "UNWIND range(0, $rows - 1) AS n RETURN n", {"rows": 1000})
+    assert result.fields() == ["n"]
+    cx.pull(result, 10)
+    assert result.peek(20) == [[n] for n in range(10)]
+    assert not result.offline
+    assert result.summary() == {}
+    assert [result.fetch() for _ in range(25)] == [[n] for n in range(25)]
+    assert len(result._buffer) == 5
+    records = []
+    while True:
+        record = result.fetch()
+        if record is None:
+            break
+        records.append(record)
+    assert records == [[n] for n in range(25, 1000)]
+    assert result.offline
+    assert result.summary() == {"stats": {"nodes_created": 0}}
+    cx.close()
+
+
+def test_streamed_records_are_buffered_before_next_request(server, small_chunks):
+    cx = HTTP.open(profile_for(server))
+    tx = cx.begin(None)
+    first = cx.run(tx, "UNWIND range(0, $rows - 1) AS n RETURN n", {"rows": 100})
+    cx.pull(first, 1)
+    second = cx.run(tx, "RETURN $n", {"n": 1})
+    assert first.offline
+    assert len(first._buffer) == 100
+    cx.pull(second)
+    assert second.take() == [1]
+    cx.commit(tx)
+    cx.close()
+
+
+def test_discarding_streamed_result(server, small_chunks):
+    cx = HTTP.open(profile_for(server))
+    result = cx.auto_run("UNWIND range(0, $rows - 1) AS n RETURN n", {"rows": 100})
+    cx.pull(result, 1)
+    cx.discard(result)
+    assert result.offline
+    assert result.take() == [0]
+    assert result.fetch() is None
+    cx.close()
+
+
+def test_failure_after_records_is_raised_when_stream_ends(server, small_chunks):
+    cx = HTTP.open(profile_for(server))
+    tx = cx.begin(None)
+    result = cx.run(tx, "UNWIND range(0, $rows - 1) AS n RETURN 1 / (9 - n)",
+                    {"rows": 20, "fail": True})
+    cx.pull(result, 5)
+    assert not tx.broken
+    with raises(Neo4jError):
+        cx.pull(result)
+    assert tx.broken
+    cx.close()
+
+
+def test_connection_is_held_until_streamed_result_is_consumed(server, small_chunks):
+    released = []
+    cx = HTTP.open(profile_for(server), on_release=released.append)
+    del released[:]
+    result = cx.auto_run("UNWIND range(0, $rows - 1) AS n RETURN n", {"rows": 100})
+    result.fetch_size = 10
+    assert [result.fetch() for _ in range(50)] == [[n] for n in range(50)]
+    assert released == []
+    while result.fetch() is not None:
+        pass
+    assert released == [cx]
+    cx.close()
+
+
+def test_connection_is_released_when_streamed_result_is_discarded(server, small_chunks):
+    released = []
+    cx = HTTP.open(profile_for(server), on_release=released.append)
+    tx = cx.begin(None)
+    result = cx.run(tx, "UNWIND range(0, $rows - 1) AS n RETURN n", {"rows": 100})
+    del released[:]
+    result.discard()
+    assert released == [cx]
+    cx.close()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from interchange.packstream import Structure
+
+from py2neo.client import IdentityMap
+from py2neo.client.bolt import PackStreamHydrant, unbound_relationship
+from py2neo.data import Node, Relationship, FrozenNode, Path
+
+
+class FakeGraph(object):
+
+    service = None
+    name = None
+
+    def pull(self, subgraph):
+        raise AssertionError("Entities should not need to be pulled")
+
+
+def test_same_node_identity_gives_same_object():
+    graph = FakeGraph()
+    identity_map = IdentityMap()
+    a = identity_map.node(graph, 1)
+    b = identity_map.node(graph, 1)
+    assert isinstance(a, Node)
+    assert a is b
+    assert len(identity_map) == 1
+
+
+def test_nodes_and_relationships_are_held_separately():
+    graph = FakeGraph()
+    identity_map = IdentityMap()
+    node = identity_map.node(graph, 1)
+    node.clear_labels()
+    node.clear()
+    rel = identity_map.relationship(graph, 1, node, "LOOPS", node)
+    assert isinstance(rel, Relationship)
+    assert identity_map.node(graph, 1) is node
+    assert identity_map.relationship(graph, 1, node, "LOOPS", node) is rel
+    assert len(identity_map) == 2
+
+
+def test_least_recently_used_entity_is_evicted():
+    graph = FakeGraph()
+    identity_map = IdentityMap(max_size=2)
+    a = identity_map.node(graph, 1)
+    b = identity_map.node(graph, 2)
+    assert identity_map.node(graph, 1) is a
+    c = identity_map.node(graph, 3)
+    assert len(identity_map) == 2
+    assert identity_map.node(graph, 1) is a
+    assert identity_map.node(graph, 3) is c
+    assert identity_map.node(graph, 2) is not b
+
+
+def test_frozen_end_node_is_replaced_when_loaded():
+    graph = FakeGraph()
+    identity_map = IdentityMap()
+    ref = identity_map.frozen_node(graph, 1)
+    assert isinstance(ref, FrozenNode) and ref.labels is None
+    node = identity_map.frozen_node(graph, 1, [u"Person"], {u"name": u"Alice"})
+    assert node is not ref
+    assert identity_map.frozen_node(graph, 1) is node
+    assert len(identity_map) == 1
+
+
+def test_clear():
+    identity_map = IdentityMap()
+    identity_map.node(FakeGraph(), 1)
+    identity_map.clear()
+    assert len(identity_map) == 0
+
+
+def test_hydrant_reuses_nodes_for_relationship_ends():
+    graph = FakeGraph()
+    hydrant = PackStreamHydrant(graph, IdentityMap())
+    values = hydrant.hydrate_list([
+        Structure(0x4E, 1, ["Person"], {"name": "Alice"}),
+        Structure(0x4E, 2, ["Person"], {"name": "Bob"}),
+        Structure(0x52, 9, 1, 2, "KNOWS", {}),
+        Structure(0x4E, 1, ["Person"], {"name": "Alice"}),
+    ])
+    alice, bob, knows, alice_again = values
+    assert alice_again is alice
+    assert knows.start_node is alice
+    assert knows.end_node is bob
+
+
+def test_hydrant_reuses_entities_within_paths():
+    graph = FakeGraph()
+    hydrant = PackStreamHydrant(graph, IdentityMap())
+    values = hydrant.hydrate_list([
+        Structure(0x4E, 1, ["Person"], {"name": "Alice"}),
+        Structure(0x50,
+                  [Structure(0x4E, 1, ["Person"], {"name": "Alice"}),
+                   Structure(0x4E, 2, ["Person"], {"name": "Bob"})],
+                  [Structure(0x72, 9, "KNOWS", {})],
+                  [1, 1]),
+        Structure(0x52, 9, 1, 2, "KNOWS", {}),
+    ])
+    alice, path, knows = values
+    assert path.start_node is alice
+    assert path.relationships[0] is knows
+
+
+def test_path_relationships_without_properties_are_left_stale():
+
+    class PullingGraph(FakeGraph):
+
+        def pull(self, subgraph):
+            for node in subgraph.nodes:
+                node._load_labels(["Person"])
+                node._load_properties({})
+
+    graph = PullingGraph()
+    u_rel = unbound_relationship(9, "KNOWS", None)
+    for identity_map in (None, IdentityMap()):
+        nodes = [Node.ref(graph, 1), Node.ref(graph, 2)]
+        path = Path.hydrate(graph, nodes, [u_rel], [1, 1], identity_map)
+        knows, = path.relationships
+        assert knows.identity == 9
+        assert type(knows).__name__ == "KNOWS"
+        assert "properties" in knows._stale
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from json import dumps as json_dumps, loads as json_loads
+
+from pytest import raises
+
+import py2neo.client.json
+from py2neo.client import IdentityMap
+from py2neo.client.json import JSONHydrant, JSONReader
+from py2neo.data import Node, Relationship, FrozenNode, FrozenRelationship
+
+
+def read_document(chunks):
+    reader = JSONReader(chunks)
+    document = {}
+    for _ in reader.elements("{", "}"):
+        key = reader.value()
+        reader.expect(":")
+        if key == "data":
+            document[key] = [reader.value() for _ in reader.elements("[", "]")]
+        else:
+            document[key] = reader.value()
+    assert reader.peek() == ""
+    return document
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_reader_across_every_chunk_boundary():
+    data = u'{"data": [[1, "\u00e9t\u00e9"], {"x": [2.5, null]}, []], "count": 12345}'.encode("utf-8")
+    for size in range(1, len(data) + 1):
+        assert read_document(chunked(data, size)) == {
+            "data": [[1, u"\u00e9t\u00e9"], {"x": [2.5, None]}, []],
+            "count": 12345,
+        }
+
+
+def test_reader_with_empty_containers():
+    assert read_document([b'{ "data" : [ ] }']) == {"data": []}
+    assert read_document([b"{}"]) == {}
+
+
+def test_reader_applies_object_hook():
+    reader = JSONReader([b'{"a": {"b": 1}}'], object_hook=lambda d: sorted(d))
+    assert reader.value() == ["a"]
+
+
+def test_reader_fails_on_truncated_document():
+    with raises(ValueError):
+        read_document([b'{"data": [[1], [2'])
+
+
+def test_reader_fails_on_unexpected_character():
+    with raises(ValueError):
+        read_document([b'{"data": [[1] [2]]}'])
+
+
+NODE = {
+    "self": "http://localhost:7474/db/data/node/1",
+    "labels": "http://localhost:7474/db/data/node/1/labels",
+    "metadata": {"id": 1, "labels": ["Person"]},
+    "data": {"name": "Alice", "born": 1970},
+}
+
+RELATIONSHIP = {
+    "self": "http://localhost:7474/db/data/relationship/7",
+    "start": "http://localhost:7474/db/data/node/1",
+    "end": "http://localhost:7474/db/data/node/2",
+    "type": "KNOWS",
+    "metadata": {"id": 7, "type": "KNOWS"},
+    "data": {"since": 1999},
+}
+
+
+def test_hydrating_node():
+    node, = JSONHydrant(None).hydrate_list([dict(NODE)])
+    assert node.identity == 1
+    assert set(node.labels) == {"Person"}
+    assert dict(node) == {"name": "Alice", "born": 1970}
+
+
+def test_hydrating_relationship():
+    rel, = JSONHydrant(None).hydrate_list([dict(RELATIONSHIP)])
+    assert rel.identity == 7
+    assert type(rel).__name__ == "KNOWS"
+    assert rel.start_node.identity == 1
+    assert rel.end_node.identity == 2
+    assert dict(rel) == {"since": 1999}
+
+
+def test_hydrating_compact_entities():
+    node, rel = JSONHydrant(None, compact=True).hydrate_list([dict(NODE), dict(RELATIONSHIP)])
+    assert isinstance(node, FrozenNode)
+    assert node.identity == 1
+    assert node["name"] == "Alice"
+    assert isinstance(rel, FrozenRelationship)
+    assert rel.type == "KNOWS"
+    assert rel.end_node.identity == 2
+
+
+def test_hydrating_single_node_path():
+    path, = JSONHydrant(None).hydrate_list([{
+        "nodes": ["http://localhost:7474/db/data/node/1"],
+        "relationships": [],
+        "directions": [],
+        "length": 0,
+    }])
+    assert [node.identity for node in path.nodes] == [1]
+    assert len(path) == 0
+
+
+def test_hydrating_multi_hop_path(monkeypatch):
+
+    class FakeGraph(object):
+
+        service = None
+        name = None
+
+        def pull(self, subgraph):
+            for node in subgraph.nodes:
+                node._load_labels(["Person"])
+                node._load_properties({})
+
+    class FakeRelationshipMatcher(object):
+
+        def __init__(self, graph):
+            self.graph = graph
+
+        def get(self, identities):
+            relationships = []
+            for identity, start, type_, end in [(7, 1, "KNOWS", 2), (8, 3, "LIKES", 2)]:
+                rel = Relationship.ref(self.graph, identity, Node.ref(self.graph, start),
+                                       type_, Node.ref(self.graph, end))
+                rel._load_properties({"weight": identity})
+                relationships.append(rel)
+            return [rel for rel in relationships if rel.identity in identities]
+
+    monkeypatch.setattr(py2neo.client.json, "RelationshipMatcher", FakeRelationshipMatcher)
+    for identity_map in (None, IdentityMap()):
+        path, = JSONHydrant(FakeGraph(), identity_map).hydrate_list([{
+            "nodes": ["http://localhost:7474/db/data/node/%d" % i for i in (1, 2, 3)],
+            "relationships": ["http://localhost:7474/db/data/relationship/%d" % i for i in (7, 8)],
+            "directions": ["->", "<-"],
+            "length": 2,
+        }])
+        assert [node.identity for node in path.nodes] == [1, 2, 3]
+        knows, likes = path.relationships
+        assert type(knows).__name__ == "KNOWS"
+        assert (knows.start_node.identity, knows.end_node.identity) == (1, 2)
+        assert dict(knows) == {"weight": 7}
+        assert type(likes).__name__ == "LIKES"
+        assert (likes.start_node.identity, likes.end_node.identity) == (3, 2)
+        assert dict(likes) == {"weight": 8}
+
+
+def test_hydrating_nested_collections():
+    values = JSONHydrant(None).hydrate_list([
+        None, 1, u"x", [1, [2, dict(NODE)]], {"a": {"b": [dict(RELATIONSHIP)]}, "c": 3},
+    ])
+    assert values[:3] == [None, 1, u"x"]
+    assert values[3][1][1].identity == 1
+    assert values[4]["a"]["b"][0].identity == 7
+    assert values[4]["c"] == 3
+
+
+def test_single_pass_matches_packstream_conversion():
+    data = json_dumps([dict(NODE), dict(RELATIONSHIP), {"n": [dict(NODE)]}, [1, 2.5]])
+    hydrant = JSONHydrant(None, identity_map=IdentityMap())
+    single = hydrant.hydrate_list(json_loads(data))
+    legacy = [hydrant.hydrate_object(value)
+              for value in json_loads(data, object_hook=JSONHydrant.json_to_packstream)]
+    assert single == legacy
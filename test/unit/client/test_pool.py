@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+from threading import Thread
+from time import sleep
+
+from pytest import mark, raises
+
+from py2neo import ConnectionProfile, ServiceProfile
+from py2neo.client import (ConnectionPool, Connector,
+                           LeastConnectedLoadBalancer, LeastLatencyLoadBalancer)
+from py2neo.errors import ConnectionBroken, ConnectionLimit
+
+
+class FakeConnection(object):
+
+    server_agent = "Neo4j/4.0.0"
+
+    def __init__(self):
+        self.tag = None
+        self.broken = False
+        self.closed = False
+        self.age = 0
+        self.resets = 0
+        self.latency = None
+
+    def supports_multi(self):
+        return True
+
+    def reset(self, force=False):
+        if force:
+            self.resets += 1
+        return force
+
+    def take_latency(self):
+        latency, self.latency = self.latency, None
+        return latency
+
+    def close(self):
+        self.closed = True
+
+
+class FakePool(ConnectionPool):
+
+    def __init__(self, max_size, acquire_timeout=None):
+        super(FakePool, self).__init__(ConnectionProfile(), max_size=max_size,
+                                       acquire_timeout=acquire_timeout)
+        self.opened = []
+
+    def _connect(self):
+        cx = FakeConnection()
+        self.opened.append(cx)
+        return cx
+
+
+def acquire_in_thread(pool, acquired, **kwargs):
+    def run():
+        acquired.append(pool.acquire(**kwargs))
+    thread = Thread(target=run)
+    thread.start()
+    return thread
+
+
+def wait_for_waiters(pool, n):
+    while pool.waiting < n:
+        sleep(0.001)
+
+
+def test_acquire_from_full_pool_without_waiting():
+    pool = FakePool(max_size=1)
+    pool.acquire()
+    with raises(ConnectionLimit):
+        pool.acquire(timeout=0)
+
+
+def test_acquire_from_full_pool_times_out():
+    pool = FakePool(max_size=1, acquire_timeout=0.05)
+    pool.acquire()
+    with raises(ConnectionLimit):
+        pool.acquire()
+    assert pool.waiting == 0
+
+
+def test_released_connection_is_handed_to_waiter():
+    pool = FakePool(max_size=1)
+    cx = pool.acquire()
+    acquired = []
+    thread = acquire_in_thread(pool, acquired)
+    wait_for_waiters(pool, 1)
+    pool.release(cx)
+    thread.join()
+    assert acquired == [cx]
+    assert pool.in_use == 1
+    assert pool.size == 1
+
+
+def test_waiters_are_served_in_order():
+    pool = FakePool(max_size=1)
+    cx = pool.acquire()
+    order = []
+    threads = []
+    for i in range(3):
+        acquired = []
+        threads.append((i, acquire_in_thread(pool, acquired), acquired))
+        wait_for_waiters(pool, i + 1)
+    for i, thread, acquired in threads:
+        pool.release(cx)
+        thread.join()
+        order.append(i)
+        cx = acquired[0]
+    assert order == [0, 1, 2]
+    assert pool.opened == [cx]
+
+
+def test_waiter_opens_new_connection_when_released_connection_is_closed():
+    pool = FakePool(max_size=1)
+    cx = pool.acquire()
+    acquired = []
+    thread = acquire_in_thread(pool, acquired)
+    wait_for_waiters(pool, 1)
+    cx.broken = True
+    pool.release(cx)
+    thread.join()
+    assert len(acquired) == 1
+    assert acquired[0] is not cx
+    assert len(pool.opened) == 2
+
+
+def test_setting_zero_size_wakes_waiters():
+    pool = FakePool(max_size=1)
+    pool.acquire()
+    errors = []
+
+    def run():
+        try:
+            pool.acquire()
+        except ConnectionLimit as error:
+            errors.append(error)
+
+    thread = Thread(target=run)
+    thread.start()
+    wait_for_waiters(pool, 1)
+    pool.max_size = 0
+    thread.join()
+    assert len(errors) == 1
+
+
+def test_concurrent_acquire_and_release():
+    pool = FakePool(max_size=4)
+    sizes = []
+
+    def run():
+        for _ in range(200):
+            cx = pool.acquire()
+            sizes.append(pool.size)
+            pool.release(cx)
+
+    threads = [Thread(target=run) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sizes) == 16 * 200
+    assert max(sizes) <= 4
+    assert pool.in_use == 0
+    assert pool.size == len(pool.opened) <= 4
+
+
+def test_release_of_foreign_connection_is_ignored():
+    pool = FakePool(max_size=1)
+    pool.release(FakeConnection())
+    assert pool.size == 0
+
+
+def test_maintenance_opens_min_idle_connections():
+    pool = FakePool(max_size=4)
+    pool.maintain(min_idle=2)
+    assert pool.size == 2
+    assert pool.in_use == 0
+    cx = pool.acquire()
+    assert cx in pool.opened
+    assert len(pool.opened) == 2
+
+
+def test_maintenance_does_not_exceed_max_size():
+    pool = FakePool(max_size=2)
+    pool.maintain(min_idle=5)
+    assert pool.size == 2
+
+
+def test_maintenance_closes_expired_connections():
+    pool = FakePool(max_size=4)
+    pool.maintain(min_idle=1)
+    cx = pool.opened[0]
+    cx.age = pool.max_age + 1
+    pool.maintain(min_idle=1)
+    assert cx.closed
+    assert pool.size == 1
+    assert pool.opened[1] is not cx
+
+
+def test_maintenance_reaps_and_checks_idle_connections():
+    pool = FakePool(max_size=4)
+    a, b, c = pool.acquire(), pool.acquire(), pool.acquire()
+    for cx in (a, b, c):
+        pool.release(cx)
+    sleep(0.01)
+    pool.maintain(min_idle=1, max_idle_time=0)
+    assert sum(cx.closed for cx in (a, b, c)) == 2
+    kept = [cx for cx in (a, b, c) if not cx.closed]
+    assert len(kept) == 1 and kept[0].resets == 1
+    assert pool.size == 1
+
+
+def test_metrics_count_resets_avoided():
+    pool = FakePool(max_size=1)
+    cx = pool.acquire()
+    pool.release(cx)
+    cx = pool.acquire()
+    pool.release(cx, force_reset=True)
+    assert pool.metrics == {"resets": 1, "resets_avoided": 1}
+
+
+def test_pool_discards_parent_connections_after_fork():
+    pool = FakePool(max_size=2)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(b)
+    pool._pid = -1  # simulate a fork
+    cx = pool.acquire()
+    assert cx not in (a, b)
+    assert pool.size == 1
+    pool.release(a)
+    assert pool.size == 1
+    assert not a.closed and not b.closed
+    assert a.resets == b.resets == 0
+
+
+@mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork")
+def test_pool_is_rebuilt_in_forked_child():
+    pool = FakePool(max_size=1)
+    parent_cx = pool.acquire()
+    pid = os.fork()
+    if pid == 0:
+        # Even though the parent holds the only connection, the child
+        # should be able to open its own without waiting.
+        try:
+            cx = pool.acquire(timeout=0)
+            ok = cx is not parent_cx and pool.size == 1 and not parent_cx.closed
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+    assert pool.size == 1 and pool.in_use == 1
+
+
+def test_connector_keeps_routing_table_after_fork():
+    connector = Connector(ServiceProfile("neo4j://localhost:7687"))
+    rt = connector._router.get_routing_table(None)
+    rt.set_updating()
+    connector._pid = -1  # simulate a fork
+    connector._check_fork()
+    assert connector._router.get_routing_table(None) is rt
+    assert not rt.is_updating()
+    connector.close()
+
+
+def test_pool_latency_is_moving_average():
+    pool = FakePool(max_size=1)
+    assert pool.latency is None
+    for latency in (1.0, 2.0):
+        cx = pool.acquire()
+        cx.latency = latency
+        pool.release(cx)
+    assert pool.latency == 1.0 + pool.latency_smoothing
+
+
+class FakeBalancedPool(object):
+
+    def __init__(self, name, latency=None, in_use=0, age=3600):
+        self.name = name
+        self.latency = latency
+        self.in_use = in_use
+        self.waiting = 0
+        self.age = age
+
+    def __repr__(self):
+        return self.name
+
+
+def test_least_connected_load_balancer_prefers_fewest_in_use():
+    a, b, c = FakeBalancedPool("a", in_use=3), FakeBalancedPool("b", in_use=1), \
+        FakeBalancedPool("c", in_use=2)
+    assert LeastConnectedLoadBalancer().order([a, b, c]) == [b, c, a]
+
+
+def test_least_latency_load_balancer_avoids_slow_pool():
+    fast, slow = FakeBalancedPool("fast", latency=0.01), FakeBalancedPool("slow", latency=0.5)
+    balancer = LeastLatencyLoadBalancer()
+    for _ in range(20):
+        assert balancer.order([slow, fast]) == [fast, slow]
+
+
+def test_least_latency_load_balancer_avoids_overloaded_pool():
+    busy = FakeBalancedPool("busy", latency=0.01, in_use=10)
+    idle = FakeBalancedPool("idle", latency=0.02)
+    assert LeastLatencyLoadBalancer().order([busy, idle]) == [idle, busy]
+
+
+def test_least_latency_load_balancer_spreads_choice_between_equal_pools():
+    pools = [FakeBalancedPool(name, latency=0.01) for name in "abcd"]
+    balancer = LeastLatencyLoadBalancer()
+    firsts = set(repr(balancer.order(pools)[0]) for _ in range(200))
+    assert len(firsts) > 1
+
+
+def test_connector_load_balancing_strategy_by_name():
+    profile = ServiceProfile("neo4j://localhost:7687")
+    connector = Connector(profile, load_balancing="least_latency")
+    assert isinstance(connector.load_balancer, LeastLatencyLoadBalancer)
+    connector.close()
+    with raises(ValueError):
+        Connector(profile, load_balancing="fastest")
+
+
+def test_connector_prunes_when_streamed_result_fails():
+
+    class BrokenResult(object):
+
+        profile = ConnectionProfile("bolt://localhost:7687")
+
+        def fetch(self):
+            raise ConnectionBroken("Transaction broken by disconnection during pull")
+
+        def discard(self):
+            raise ConnectionBroken("Transaction broken by disconnection during discard")
+
+    connector = Connector(ServiceProfile("bolt://localhost:7687"))
+    pruned = []
+    connector.prune = pruned.append
+    result = BrokenResult()
+    with raises(ConnectionBroken):
+        connector.fetch(result)
+    with raises(ConnectionBroken):
+        connector.discard(result)
+    assert pruned == [result.profile, result.profile]
+    connector.close()
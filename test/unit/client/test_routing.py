@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+from threading import Event, Thread
+from time import sleep
+
+from pytest import raises
+
+from py2neo import ConnectionProfile, ServiceProfile
+from py2neo.client import Connector, ConnectionPool, Router
+from py2neo.errors import ConnectionUnavailable, ServiceUnavailable
+
+
+ROUTER = ConnectionProfile("bolt://localhost:7687")
+READER = ConnectionProfile("bolt://reader:7687")
+WRITER = ConnectionProfile("bolt://writer:7687")
+
+
+class RecordingConnector(Connector):
+
+    def __init__(self):
+        super(RecordingConnector, self).__init__(ServiceProfile("neo4j://localhost:7687"))
+        self.fetched = []
+        self.release = Event()
+        self.done = Event()
+
+    def _fetch_routing_table(self, graph_name):
+        self.fetched.append(graph_name)
+        self.release.wait(1)
+        self._router.update(graph_name, [ROUTER], [READER], [WRITER], 300)
+        self.done.set()
+
+
+class UnavailablePool(object):
+
+    def __init__(self):
+        self.attempts = 0
+
+    def acquire(self, *args, **kwargs):
+        self.attempts += 1
+        raise ConnectionUnavailable("Unavailable")
+
+
+def test_expired_routing_table_is_refreshed_synchronously():
+    connector = RecordingConnector()
+    connector.release.set()
+    ro_profiles, rw_profiles = connector._get_profiles(None, readonly=True)
+    assert connector.fetched == [None]
+    assert ro_profiles == [READER] and rw_profiles == [WRITER]
+
+
+def test_routing_table_is_refreshed_in_background_ahead_of_expiry():
+    connector = RecordingConnector()
+    connector.release.set()
+    connector._get_profiles(None)
+    connector.done.clear()
+    connector.release.clear()
+    rt = connector._router.get_routing_table(None)
+    rt._refresh_time = 0  # due, but not expired
+    # The current entries are returned while the refresh is held up
+    assert connector._get_profiles(None) == ([READER], [WRITER])
+    assert connector._get_profiles(None) == ([READER], [WRITER])
+    connector.release.set()
+    assert connector.done.wait(1)
+    assert connector.fetched == [None, None]
+    assert rt.refresh_time > 0
+    assert not rt.is_updating()
+
+
+def test_broken_profile_can_be_removed_while_tables_are_updated():
+    router = Router()
+    errors = []
+
+    def update():
+        for n in range(2000):
+            router.update("graph%d" % n, [ROUTER], [READER], [WRITER], 300)
+
+    def set_broken():
+        try:
+            while updater.is_alive():
+                router.set_broken(READER)
+        except RuntimeError as error:
+            errors.append(error)
+
+    updater = Thread(target=update)
+    breaker = Thread(target=set_broken)
+    updater.start()
+    breaker.start()
+    updater.join()
+    breaker.join()
+    assert errors == []
+
+
+def test_known_routers_are_asked_only_once():
+    connector = Connector(ServiceProfile("neo4j://localhost:7687"))
+    pool = connector._pools[ROUTER] = UnavailablePool()
+    connector._router.update(None, [ROUTER], [READER], [WRITER], 0)
+    with raises(ServiceUnavailable):
+        connector.refresh_routing_table(None)
+    assert pool.attempts == 1
+
+
+class PrefetchingConnector(Connector):
+
+    def __init__(self):
+        super(PrefetchingConnector, self).__init__(ServiceProfile("neo4j://localhost:7687"))
+        self.fetched = []
+        self.lookups = 0
+
+    def graph_names(self):
+        return ["neo4j", "system"]
+
+    def _fetch_default_graph_name(self):
+        self.lookups += 1
+        return "neo4j"
+
+    def _fetch_routing_table(self, graph_name):
+        self.fetched.append(graph_name)
+        if graph_name == "broken":
+            raise ServiceUnavailable("Cannot connect to any known routers")
+        self._router.update(graph_name, [ROUTER], [READER], [WRITER], 300)
+        return self._router.get_routing_table(graph_name)
+
+
+def test_prefetch_routing_tables_for_named_graphs():
+    connector = PrefetchingConnector()
+    tables = connector.prefetch_routing_tables(["a", "b", "broken", "a"])
+    assert sorted(connector.fetched) == ["a", "b", "broken"]
+    assert sorted(tables) == ["a", "b"]
+    # Fresh tables are not fetched again
+    connector.prefetch_routing_tables(["a", "b", "c"])
+    assert sorted(connector.fetched) == ["a", "b", "broken", "c"]
+
+
+def test_prefetch_routing_tables_for_all_graphs():
+    connector = PrefetchingConnector()
+    tables = connector.prefetch_routing_tables()
+    assert set(tables) == {None, "neo4j", "system"}
+
+
+def test_prefetch_workers_share_pools_for_common_servers(monkeypatch):
+    opened = []
+    open_pool = ConnectionPool.open.__func__
+
+    def slow_open(cls, profile, **settings):
+        sleep(0.01)
+        pool = open_pool(cls, profile, **settings)
+        opened.append(pool)
+        return pool
+
+    monkeypatch.setattr(ConnectionPool, "open", classmethod(slow_open))
+
+    class PoolAddingConnector(PrefetchingConnector):
+
+        def _fetch_routing_table(self, graph_name):
+            self._add_pools(READER, WRITER)
+            return super(PoolAddingConnector, self)._fetch_routing_table(graph_name)
+
+    connector = PoolAddingConnector()
+    connector.prefetch_routing_tables(["a", "b", "c", "d"], max_workers=4)
+    assert sorted(pool.profile.host for pool in opened) == ["localhost", "reader", "writer"]
+    assert set(connector._pools.values()) == set(opened)
+
+
+def test_default_graph_name_is_cached():
+    connector = PrefetchingConnector()
+    assert connector.default_graph_name() == "neo4j"
+    assert connector.default_graph_name() == "neo4j"
+    assert connector.lookups == 1
+    assert connector.default_graph_name(refresh=True) == "neo4j"
+    assert connector.lookups == 2
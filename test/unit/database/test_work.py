@@ -19,7 +19,8 @@
 
 from pytest import raises
 
-from py2neo import Transaction
+from py2neo import ConnectionProfile, Transaction
+from py2neo.errors import ClientError
 
 
 class FakeTransaction(object):
@@ -98,3 +99,117 @@ def test_should_fail_on_tx_separate_object():
     tx = Transaction(FakeGraph())
     with raises(TypeError):
         tx.separate(object())
+
+
+def test_should_fail_on_run_many_in_autocommit_tx():
+    tx = Transaction(FakeGraph(), autocommit=True)
+    with raises(TypeError):
+        tx.run_many(["RETURN 1"])
+
+
+class StreamedResult(object):
+
+    def __init__(self, records):
+        self.records = list(records)
+        self.discarded = False
+
+    def fields(self):
+        return ["n"]
+
+    def hydrate_with(self, hydrant):
+        return False
+
+    def fetch(self):
+        try:
+            return self.records.pop(0)
+        except IndexError:
+            return None
+
+    def discard(self):
+        self.records = []
+        self.discarded = True
+
+
+class StreamingConnector(object):
+
+    profile = ConnectionProfile("bolt://localhost:7687")
+    fetch_size = 1
+
+    def __init__(self):
+        self.results = []
+        self.fetched = 0
+
+    def auto_run(self, cypher, parameters=None, graph_name=None, readonly=False):
+        result = StreamedResult([[1], [2], [3]])
+        self.results.append(result)
+        return result
+
+    def pull(self, result, n=-1):
+        pass
+
+    def fetch(self, result):
+        self.fetched += 1
+        return result.fetch()
+
+    def discard(self, result):
+        result.discard()
+
+
+class StreamingService(object):
+
+    def __init__(self):
+        self.connector = StreamingConnector()
+
+
+class StreamingGraph(object):
+
+    name = None
+
+    def __init__(self):
+        self.service = StreamingService()
+
+
+def test_evaluate_discards_remainder_of_streamed_result():
+    graph = StreamingGraph()
+    tx = Transaction(graph, autocommit=True)
+    assert tx.evaluate("UNWIND [1, 2, 3] AS n RETURN n") == 1
+    connector = graph.service.connector
+    assert connector.fetched == 1
+    result, = connector.results
+    assert result.discarded
+
+
+class FailingConnector(object):
+
+    profile = ConnectionProfile("bolt://localhost:7687")
+
+    def __init__(self, error):
+        self.error = error
+
+    def begin(self, graph_name, readonly=False):
+        return FakeTransaction(graph_name, readonly=readonly)
+
+    def run_many(self, tx, queries, commit=False, discard=False):
+        raise self.error
+
+
+class FailingGraph(StreamingGraph):
+
+    def __init__(self, error):
+        super(FailingGraph, self).__init__()
+        self.service.connector = FailingConnector(error)
+
+
+def test_run_many_closes_transaction_ended_by_failed_commit():
+    error = ClientError("Constraint violated", "Neo.ClientError.Schema.ConstraintValidationFailed")
+    tx = Transaction(FailingGraph(error))
+    with raises(ClientError):
+        tx.run_many(["CREATE ()"], commit=True)
+    assert tx.closed
+
+
+def test_run_many_leaves_transaction_open_for_rollback_after_other_error():
+    tx = Transaction(FailingGraph(TypeError("Values of this type are not supported")))
+    with raises(TypeError):
+        tx.run_many(["CREATE ()"], commit=True)
+    assert not tx.closed
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from struct import pack as struct_pack
+
+from interchange.packstream import pack, unpack
+from pytest import fixture, raises
+
+from py2neo.aio import AsyncGraph, AsyncWire
+from py2neo.client import Bookmark
+from py2neo.client.bolt import BoltMessageReader
+from py2neo.errors import ClientError, ConnectionLimit
+
+
+class StubBoltServer(object):
+    """ Asyncio server that speaks just enough Bolt 4.3 to run the
+    query "RETURN n", which returns the numbers from 1 up to the
+    parameter "count". The query "FAIL" fails with a syntax error.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.server = None
+        self.handlers = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await asyncio.gather(*self.handlers)
+
+    def handle(self, reader, writer):
+        self.handlers.append(asyncio.ensure_future(self.serve(reader, writer)))
+
+    async def serve(self, reader, writer):
+        await reader.readexactly(20)
+        writer.write(b"\x00\x00\x03\x04")
+        data = b""
+        records = []
+        failed = False
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            data += chunk
+            messages, used, _ = BoltMessageReader._split_messages(memoryview(data))
+            data = data[used:]
+            for message in messages:
+                tag = message[1]
+                fields = list(unpack(message, offset=2))
+                self.requests.append(tag)
+                if tag == 0x02:  # GOODBYE
+                    writer.close()
+                    return
+                elif tag == 0x0F:  # RESET
+                    failed = False
+                    self.reply(writer, 0x70, {})
+                elif failed:
+                    self.reply(writer, 0x7E)
+                elif tag == 0x01:  # HELLO
+                    self.reply(writer, 0x70, {"server": "Neo4j/4.3.0",
+                                              "connection_id": "bolt-stub"})
+                elif tag == 0x10 and fields[0] == "FAIL":  # RUN
+                    failed = True
+                    self.reply(writer, 0x7F, {"code": "Neo.ClientError.Statement.SyntaxError",
+                                              "message": "Invalid input"})
+                elif tag == 0x10:  # RUN
+                    records = list(range(1, fields[1].get("count", 0) + 1))
+                    self.reply(writer, 0x70, {"fields": ["n"]})
+                elif tag == 0x3F:  # PULL
+                    n = fields[0]["n"]
+                    if n == -1:
+                        n = len(records)
+                    for value in records[:n]:
+                        self.reply(writer, 0x71, [value])
+                    records = records[n:]
+                    self.reply(writer, 0x70, {"has_more": True} if records else {})
+                elif tag == 0x2F:  # DISCARD
+                    records = []
+                    self.reply(writer, 0x70, {})
+                elif tag == 0x12:  # COMMIT
+                    self.reply(writer, 0x70, {"bookmark": "bm:1"})
+                else:
+                    self.reply(writer, 0x70, {})
+            await writer.drain()
+        writer.close()
+
+    @staticmethod
+    def reply(writer, tag, *fields):
+        message = bytearray([0xB0 + len(fields), tag])
+        for field in fields:
+            message.extend(pack(field))
+        writer.write(struct_pack(">H", len(message)) + message + b"\x00\x00")
+
+
+@fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def run_with_graph(loop, test, **settings):
+    server = StubBoltServer()
+
+    async def main():
+        port = await server.start()
+        graph = AsyncGraph("bolt://127.0.0.1:%d" % port, **settings)
+        try:
+            await test(graph, server)
+        finally:
+            await graph.close()
+            await server.stop()
+
+    loop.run_until_complete(main())
+    return server
+
+
+def test_wire_buffers_large_input_received_in_pieces(loop):
+    data = bytes(bytearray(range(256))) * 1024
+
+    async def test():
+        reader = asyncio.StreamReader()
+        for i in range(0, len(data), 1000):
+            reader.feed_data(data[i:i + 1000])
+        reader.feed_eof()
+        wire = AsyncWire(reader, None)
+        await wire.fill(10)
+        head = wire.read(10)
+        await wire.fill(len(data) - 10)
+        # Views already returned must survive the buffer being renewed
+        assert head.tobytes() == data[:10]
+        assert wire.peek().tobytes() == data[10:]
+        assert wire.read(len(data) - 10).tobytes() == data[10:]
+
+    loop.run_until_complete(test())
+
+
+def test_run_and_iterate(loop):
+    async def test(graph, server):
+        cursor = await graph.run("RETURN n", count=3)
+        values = []
+        async for record in cursor:
+            values.append(record["n"])
+        assert values == [1, 2, 3]
+        assert graph.pool.in_use == 0
+        assert graph.pool.size == 1
+
+    run_with_graph(loop, test)
+
+
+def test_evaluate(loop):
+    async def test(graph, server):
+        assert await graph.evaluate("RETURN n", count=2) == 1
+
+    run_with_graph(loop, test)
+
+
+def test_results_are_streamed_in_batches(loop):
+    async def test(graph, server):
+        cursor = await graph.run("RETURN n", count=5)
+        assert graph.pool.in_use == 1
+        assert await cursor.data() == [{"n": n} for n in range(1, 6)]
+        assert server.requests.count(0x3F) == 3
+        assert graph.pool.in_use == 0
+
+    run_with_graph(loop, test, fetch_size=2)
+
+
+def test_closing_streamed_cursor_discards_remaining_records(loop):
+    async def test(graph, server):
+        cursor = await graph.run("RETURN n", count=5)
+        await cursor.close()
+        assert 0x2F in server.requests
+        assert graph.pool.in_use == 0
+        assert await graph.evaluate("RETURN n", count=1) == 1
+
+    run_with_graph(loop, test, fetch_size=2)
+
+
+def test_transaction_commit(loop):
+    async def test(graph, server):
+        async with graph.begin() as tx:
+            assert await tx.evaluate("RETURN n", count=1) == 1
+            assert await tx.evaluate("RETURN n", count=2) == 1
+            assert graph.pool.in_use == 1
+        assert tx.closed
+        assert tx.bookmark == Bookmark("bm:1")
+        assert graph.pool.in_use == 0
+        assert server.requests[1:] == [0x11, 0x10, 0x3F, 0x10, 0x3F, 0x12]
+
+    run_with_graph(loop, test)
+
+
+def test_transaction_rolled_back_on_error(loop):
+    async def test(graph, server):
+        with raises(RuntimeError):
+            async with graph.begin() as tx:
+                await tx.run("RETURN n", count=1)
+                raise RuntimeError()
+        assert tx.closed
+        assert server.requests[-1] == 0x13
+        assert graph.pool.in_use == 0
+
+    run_with_graph(loop, test)
+
+
+def test_failure_resets_and_releases_connection(loop):
+    async def test(graph, server):
+        with raises(ClientError):
+            await graph.run("FAIL")
+        assert 0x0F in server.requests
+        assert graph.pool.in_use == 0
+        assert await graph.evaluate("RETURN n", count=1) == 1
+        assert graph.pool.size == 1
+
+    run_with_graph(loop, test)
+
+
+def test_failure_in_transaction_closes_transaction(loop):
+    async def test(graph, server):
+        tx = graph.begin()
+        with raises(ClientError):
+            await tx.run("FAIL")
+        assert tx.closed
+        assert graph.pool.in_use == 0
+
+    run_with_graph(loop, test)
+
+
+def test_concurrent_queries_share_limited_pool(loop):
+    async def test(graph, server):
+        results = await asyncio.gather(*[graph.evaluate("RETURN n", count=1)
+                                         for _ in range(10)])
+        assert results == [1] * 10
+        assert graph.pool.size == 2
+
+    run_with_graph(loop, test, max_size=2)
+
+
+def test_acquire_from_full_pool_times_out(loop):
+    async def test(graph, server):
+        cx = await graph.pool.acquire()
+        with raises(ConnectionLimit):
+            await graph.pool.acquire(timeout=0.01)
+        assert graph.pool.waiting == 0
+        waiter = asyncio.ensure_future(graph.pool.acquire())
+        await asyncio.sleep(0)
+        await graph.pool.release(cx)
+        assert await waiter is cx
+
+    run_with_graph(loop, test, max_size=1)
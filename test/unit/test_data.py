@@ -23,7 +23,8 @@ from unittest import TestCase
 from _pytest.python_api import raises
 
 from py2neo.cypher import Record
-from py2neo.data import Subgraph, Walkable, Node, Relationship, Path, walk
+from py2neo.data import Subgraph, Walkable, Node, Relationship, Path, walk, \
+    FrozenNode, FrozenRelationship
 from py2neo.integration import Table
 
 
@@ -586,6 +587,103 @@ class NodeTestCase(TestCase):
         node.update_labels({"Person", "Employee"})
         assert set(node.labels) == {"Person", "Employee"}
 
+    def test_uuid_is_stable(self):
+        node = Node("Person", name="Alice")
+        assert node.__uuid__ == node.__uuid__
+        assert node.__uuid__ != Node("Person", name="Alice").__uuid__
+
+    def test_load_labels_and_properties(self):
+        node = Node.ref(None, 1)
+        node._load_labels(["Person", "Employee"])
+        node._load_properties({"name": "Alice", "age": 33})
+        assert set(node.labels) == {"Person", "Employee"}
+        assert dict(node) == {"name": "Alice", "age": 33}
+        node["age"] = None
+        assert dict(node) == {"name": "Alice"}
+
+
+class FrozenEntityTestCase(TestCase):
+
+    def test_frozen_node_properties(self):
+        node = FrozenNode(None, 1, ["Person"], {"name": "Alice"})
+        assert node["name"] == "Alice"
+        assert node["age"] is None
+        assert "name" in node
+        assert dict(node) == {"name": "Alice"}
+        assert len(node) == 1
+        assert node.has_label("Person")
+        assert not node.has_label("Employee")
+        assert repr(node) == "FrozenNode('Person', name='Alice')"
+
+    def test_frozen_node_is_slotted(self):
+        node = FrozenNode(None, 1, ["Person"], {})
+        with raises((AttributeError, TypeError)):
+            node.colour = "red"
+        with raises(TypeError):
+            node["name"] = "Alice"
+
+    def test_label_sets_are_shared(self):
+        a = FrozenNode(None, 1, ["Person"])
+        b = FrozenNode(None, 2, ["Person"])
+        assert a.labels is b.labels
+
+    def test_label_sets_are_shared_regardless_of_order(self):
+        a = FrozenNode(None, 1, ["Person", "Employee"])
+        b = FrozenNode(None, 2, ["Employee", "Person"])
+        assert a.labels is b.labels
+
+    def test_interned_label_sets_are_limited(self):
+        from py2neo import data
+        interned = dict(data._interned_label_sets)
+        try:
+            data._interned_label_sets.clear()
+            for i in range(data._max_interned_label_sets + 10):
+                FrozenNode(None, i, ["Label%d" % i])
+            assert len(data._interned_label_sets) == data._max_interned_label_sets
+            node = FrozenNode(None, 1, ["Label%d" % (data._max_interned_label_sets + 5)])
+            assert node.labels == {"Label%d" % (data._max_interned_label_sets + 5)}
+        finally:
+            data._interned_label_sets.clear()
+            data._interned_label_sets.update(interned)
+
+    def test_node_zero_hashes_by_identity(self):
+
+        class FakeGraph(object):
+            service = None
+            name = None
+
+        graph = FakeGraph()
+        a = FrozenNode(graph, 0, ["Person"], {"name": "Alice"})
+        b = FrozenNode(graph, 0, ["Person"], {"name": "Alicia"})
+        assert a == b
+        assert hash(a) == hash(b)
+        assert len({a, b}) == 1
+
+    def test_unloaded_end_node(self):
+        node = FrozenNode(None, 1)
+        assert node.labels is None
+        assert not node.has_label("Person")
+        assert dict(node) == {}
+
+    def test_frozen_relationship(self):
+        a = FrozenNode(None, 1, ["Person"], {"name": "Alice"})
+        b = FrozenNode(None, 2, ["Person"], {"name": "Bob"})
+        r = FrozenRelationship(None, 9, a, "KNOWS", b, {"since": 1999})
+        assert r.type == "KNOWS"
+        assert r.nodes == (a, b)
+        assert r["since"] == 1999
+
+    def test_thaw(self):
+        a = FrozenNode(None, 1, ["Person"], {"name": "Alice"})
+        b = FrozenNode(None, 2, ["Person"], {"name": "Bob"})
+        r = FrozenRelationship(None, 9, a, "KNOWS", b, {"since": 1999}).thaw()
+        assert isinstance(r, Relationship)
+        assert type(r).__name__ == "KNOWS"
+        assert r.identity == 9 and dict(r) == {"since": 1999}
+        assert isinstance(r.start_node, Node)
+        assert set(r.start_node.labels) == {"Person"}
+        assert dict(r.end_node) == {"name": "Bob"}
+
 
 class RelationshipTestCase(TestCase):
 
@@ -15,3 +15,24 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+
+from py2neo import GraphService
+
+
+# Routing profiles do not open any connections on construction.
+URI = "neo4j://localhost:7687"
+
+
+def test_services_do_not_share_connectors_by_default():
+    a, b = GraphService(URI), GraphService(URI)
+    assert a.connector is not b.connector
+    a.connector.close()
+    assert not b.connector.closed
+    b.connector.close()
+
+
+def test_services_can_opt_in_to_sharing_connectors(monkeypatch):
+    monkeypatch.setattr(GraphService, "share_connectors", True)
+    a, b = GraphService(URI, max_size=7), GraphService(URI, max_size=7)
+    assert a.connector is b.connector
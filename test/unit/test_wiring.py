@@ -47,6 +47,11 @@ class FakeSocket(object):
         value, self._in_buffer = self._in_buffer[:n_bytes], self._in_buffer[n_bytes:]
         return value
 
+    def recv_into(self, buffer, n_bytes=0, flags=None):
+        value = self.recv(n_bytes or len(buffer), flags)
+        buffer[:len(value)] = value
+        return len(value)
+
     def send(self, b, flags=None):
         if self._closed:
             raise OSError("Socket closed")
@@ -116,6 +121,12 @@ class MockSocket(object):
         else:
             raise NotImplementedError
 
+    def recv_into(self, buffer, nbytes=0, flags=None):
+        if self.fail_on_recv:
+            raise OSError("Connection broken")
+        else:
+            raise NotImplementedError
+
 
 @fixture
 def mock_socket(monkeypatch):
@@ -176,6 +187,37 @@ def test_byte_reader_read_when_not_enough_available(fake_reader):
         _ = reader.read(12)
 
 
+def test_byte_reader_read_returns_view(fake_reader):
+    reader = fake_reader([b"hello, world"])
+    data = reader.read(5)
+    assert isinstance(data, memoryview)
+    assert reader.peek() == b", world"
+
+
+def test_byte_reader_earlier_reads_survive_buffer_renewal():
+
+    class SmallBufferWire(Wire):
+        input_buffer_size = 8
+
+    reader = SmallBufferWire(FakeSocket([b"hello, ", b"world", b"!"]))
+    first = reader.read(5)
+    second = reader.read(7)
+    third = reader.read(1)
+    assert first == b"hello"
+    assert second == b", world"
+    assert third == b"!"
+
+
+def test_byte_reader_read_larger_than_buffer():
+
+    class SmallBufferWire(Wire):
+        input_buffer_size = 4
+
+    reader = SmallBufferWire(FakeSocket([b"hello, ", b"world"]))
+    data = reader.read(12)
+    assert data == b"hello, world"
+
+
 def test_byte_writer_write_once(fake_writer):
     into = []
     writer = fake_writer(into)